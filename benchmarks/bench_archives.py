@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark exports read straight from zip and tar archives.
+
+Packs a synthetic source tree as .zip, .tar and .tar.gz, then compares
+extracting each archive to a temporary directory and exporting it (the old
+workflow) with exporting the archive directly.
+
+Usage:
+    python benchmarks/bench_archives.py --files 5000 --repeat 3
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from super_pocket.project import to_file
+
+BODY = "def handler_{i}(request):\n    return {{'status': 200, 'id': {i}}}\n" * 20
+FORMATS = {"zip": "zip", "tar": "tar", "tar.gz": "gztar"}
+
+
+def build_tree(root: Path, files: int, per_dir: int = 100) -> None:
+    """Create ``files`` Python files under ``root``."""
+    for i in range(files):
+        directory = root / f"pkg_{i // per_dir}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"module_{i}.py").write_text(BODY.format(i=i), encoding="utf-8")
+
+
+def time_extracted(archive: str, output: Path) -> float:
+    """Extract the archive, export the directory and clean up."""
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.unpack_archive(archive, tmp)
+        to_file.create_codebase_markdown(str(Path(tmp) / "project"), str(output), to_file.export_options(""), progress=False)
+    return time.perf_counter() - start
+
+
+def time_direct(archive: str, output: Path) -> float:
+    """Export the archive without extracting it."""
+    start = time.perf_counter()
+    to_file.create_codebase_markdown(archive, str(output), to_file.export_options(""), progress=False)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=5_000, help="Number of files to generate.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration (best is kept).")
+    args = parser.parse_args()
+
+    to_file.console.quiet = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_tree(Path(tmp) / "project", args.files)
+        output = Path(tmp) / "export.md"
+        for label, archive_format in FORMATS.items():
+            archive = shutil.make_archive(str(Path(tmp) / "drop"), archive_format, tmp, "project")
+            extracted = min(time_extracted(archive, output) for _ in range(args.repeat))
+            direct = min(time_direct(archive, output) for _ in range(args.repeat))
+            print(f"{label:<7} extract+export {extracted:.2f}s  direct {direct:.2f}s  ({extracted / direct:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
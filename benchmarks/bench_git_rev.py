@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark exports of a git revision read from the object database.
+
+Commits a synthetic tree of source files, then compares reading every blob
+with one ``git show <rev>:<path>`` per file against a whole ``--rev``
+export, which lists the tree once and reads the blobs through a single
+``git cat-file --batch`` process. A working-tree export of the same files
+is timed as the baseline.
+
+Usage:
+    python benchmarks/bench_git_rev.py --files 2000 --repeat 3
+"""
+
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from super_pocket.project import to_file
+
+BODY = "def handler_{i}(request):\n    return {{'status': 200, 'id': {i}}}\n" * 20
+GIT = ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com"]
+
+
+def build_repo(root: Path, files: int, per_dir: int = 100) -> list[str]:
+    """Commit ``files`` Python files; return their paths."""
+    paths = []
+    for i in range(files):
+        path = f"pkg_{i // per_dir}/module_{i}.py"
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(BODY.format(i=i), encoding="utf-8")
+        paths.append(path)
+    subprocess.run([*GIT, "init", "-q"], cwd=root, check=True)
+    subprocess.run([*GIT, "add", "."], cwd=root, check=True)
+    subprocess.run([*GIT, "commit", "-q", "-m", "bench"], cwd=root, check=True)
+    return paths
+
+
+def time_git_show(root: Path, paths: list[str]) -> float:
+    """Read every file with its own ``git show`` process."""
+    start = time.perf_counter()
+    for path in paths:
+        subprocess.run(["git", "show", f"HEAD:{path}"], cwd=root, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def time_export(root: Path, output: Path, rev: str | None) -> float:
+    """Run one export and return its wall time in seconds."""
+    start = time.perf_counter()
+    to_file.create_codebase_markdown(str(root), str(output), to_file.export_options(".git"), rev=rev, progress=False)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=2_000, help="Number of files to commit.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration (best is kept).")
+    args = parser.parse_args()
+
+    to_file.console.quiet = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "project"
+        root.mkdir()
+        paths = build_repo(root, args.files)
+        output = Path(tmp) / "export.md"
+
+        show = time_git_show(root, paths)
+        worktree = min(time_export(root, output, None) for _ in range(args.repeat))
+        rev = min(time_export(root, output, "HEAD") for _ in range(args.repeat))
+
+        print(f"git show per file: {show:.2f}s  ({args.files / show:.0f} files/s)")
+        print(f"export --rev HEAD: {rev:.2f}s  ({args.files / rev:.0f} files/s)")
+        print(f"export work tree:  {worktree:.2f}s  ({args.files / worktree:.0f} files/s)")
+
+
+if __name__ == "__main__":
+    main()
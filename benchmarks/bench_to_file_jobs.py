@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark sequential vs. threaded file reading in the project exporter.
+
+Generates a synthetic tree (50,000 files by default) and times
+``create_codebase_markdown`` with ``jobs=1`` and with the requested number
+of reader threads. The speedup is largest on cold caches and network
+storage; pass ``--drop-caches`` (Linux, root only) to flush the page cache
+before every run.
+
+Usage:
+    python benchmarks/bench_to_file_jobs.py --files 50000 --jobs 8
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from super_pocket.project import to_file
+
+
+def build_tree(root: Path, files: int, per_dir: int = 100) -> None:
+    """Create ``files`` small Python files spread over nested directories."""
+    body = "def function_{i}():\n    return {i}\n" * 20
+    for i in range(files):
+        directory = root / f"pkg_{i // (per_dir * per_dir)}" / f"mod_{(i // per_dir) % per_dir}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"file_{i}.py").write_text(body.format(i=i), encoding="utf-8")
+
+
+def drop_caches() -> None:
+    """Flush the Linux page cache so that reads hit the disk."""
+    subprocess.run(["sync"], check=True)
+    Path("/proc/sys/vm/drop_caches").write_text("3\n")
+
+
+def time_export(project: Path, output: Path, jobs: int, cold: bool) -> float:
+    """Run one export and return its wall time in seconds."""
+    if cold:
+        drop_caches()
+    start = time.perf_counter()
+    to_file.create_codebase_markdown(str(project), str(output), to_file.export_options("", jobs=jobs))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=50_000, help="Number of files to generate.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 4, help="Reader threads for the parallel run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration (best is kept).")
+    parser.add_argument("--drop-caches", action="store_true", help="Flush the page cache before each run.")
+    args = parser.parse_args()
+
+    to_file.console.quiet = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp) / "project"
+        build_tree(project, args.files)
+        output = Path(tmp) / "export.md"
+
+        results = {}
+        for jobs in (1, args.jobs):
+            results[jobs] = min(
+                time_export(project, output, jobs, args.drop_caches)
+                for _ in range(args.repeat)
+            )
+            print(f"jobs={jobs:<3} {results[jobs]:.2f}s  ({args.files / results[jobs]:,.0f} files/s)")
+
+        print(f"speedup: {results[1] / results[args.jobs]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
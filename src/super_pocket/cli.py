@@ -15,7 +15,9 @@ from pathlib import Path
 from super_pocket import __version__
 from super_pocket.web.job_search import main as job_search
 from super_pocket.markdown.renderer import markd
-from super_pocket.project.to_file import create_codebase_markdown
+from super_pocket.project.to_file import create_codebase_markdown, export_options
+from super_pocket.project.export.stats import TOP_FILES
+from super_pocket.project.export.writers import WRITERS
 from super_pocket.iconify.cli import iconify_cli
 # from super_pocket.project.readme import run_readme_wizard  # Module moved
 from super_pocket.documents.cli import (
@@ -113,19 +115,239 @@ def project_group():
 @click.option(
     '-p', '--path',
     default='.',
-    help='Root directory of the project to scan.'
+    help='Root directory of the project to scan, or a zip or tar archive.'
 )
 @click.option(
     '-o', '--output',
     default=None,
-    help='Output Markdown file name.'
+    help="Output Markdown file name ('-' for stdout; .gz, .xz and .zip are compressed)."
 )
 @click.option(
     '-e', '--exclude',
     default=".AGENTS,Agents,AGENTS.md,.claude,.cursor,WORKFLOWS.md,RULES.md,env,.env,venv,.venv,.gitignore,.git,.vscode,.idea,lib,bin,site-packages,node_modules,__pycache__,.DS_Store",
-    help='Comma-separated list of files/directories to exclude.'
+    help='Comma-separated gitignore-style patterns to exclude.'
+)
+@click.option(
+    '-j', '--jobs',
+    default=1,
+    type=click.IntRange(min=1),
+    help='Number of threads reading files in parallel.'
 )
-def project_to_file(path: str, output: str, exclude: str):
+@click.option(
+    '--incremental',
+    is_flag=True,
+    default=False,
+    help='Only re-read files changed since the last export, using a sidecar cache.'
+)
+@click.option(
+    '--cache-file',
+    default=None,
+    help="Sidecar cache path (default: '<output>.cache.json')."
+)
+@click.option(
+    '--no-gitignore',
+    is_flag=True,
+    default=False,
+    help='Do not honor .gitignore and .pocketignore files.'
+)
+@click.option(
+    '--max-tokens',
+    default=None,
+    type=click.IntRange(min=1),
+    help='Split the export into shards of about this many tokens.'
+)
+@click.option(
+    '--max-bytes',
+    default=None,
+    type=click.IntRange(min=1),
+    help='Split the export into shards of at most this many bytes.'
+)
+@click.option(
+    '--dedup',
+    is_flag=True,
+    default=False,
+    help='Write identical files once and reference the first copy.'
+)
+@click.option(
+    '--since',
+    default=None,
+    metavar='REF',
+    help='Only export files changed since this git ref.'
+)
+@click.option(
+    '--staged',
+    is_flag=True,
+    default=False,
+    help='Only export files with staged changes.'
+)
+@click.option(
+    '--mark-changes',
+    is_flag=True,
+    default=False,
+    help='Mark changed files with their git status in the tree.'
+)
+@click.option(
+    '--rev',
+    default=None,
+    metavar='REF',
+    help='Export the project as of this git ref, read from git objects.'
+)
+@click.option(
+    '--max-file-bytes',
+    default=None,
+    type=click.IntRange(min=1),
+    help='Keep only the head and tail of files larger than this.'
+)
+@click.option(
+    '--max-file-lines',
+    default=None,
+    type=click.IntRange(min=1),
+    help='Keep only the head and tail of files longer than this.'
+)
+@click.option(
+    '--watch',
+    is_flag=True,
+    default=False,
+    help='Keep the output up to date as files change (Ctrl+C to stop).'
+)
+@click.option(
+    '--offset-index',
+    is_flag=True,
+    default=False,
+    help="Write '<output>.index.jsonl' with the byte range of every file."
+)
+@click.option(
+    '--skeleton',
+    is_flag=True,
+    default=False,
+    help='Reduce Python files to imports, signatures and docstrings.'
+)
+@click.option(
+    '--keep-full',
+    default="",
+    help='Comma-separated patterns of Python files kept in full with --skeleton.'
+)
+@click.option(
+    '--minify',
+    is_flag=True,
+    default=False,
+    help='Strip comments, trailing whitespace and blank lines (strings are kept).'
+)
+@click.option(
+    '--redact',
+    is_flag=True,
+    default=False,
+    help='Replace secrets (keys, tokens, private keys) with [REDACTED:<kind>] markers.'
+)
+@click.option(
+    '--include-ext',
+    default="",
+    help='Comma-separated extensions to export (e.g. py,md); others are skipped.'
+)
+@click.option(
+    '--max-size',
+    default=None,
+    help='Skip files larger than this (e.g. 500k, 2M).'
+)
+@click.option(
+    '--newer-than',
+    default=None,
+    help='Skip files modified before this age or date (e.g. 7d, 2024-05-01).'
+)
+@click.option(
+    '--older-than',
+    default=None,
+    help='Skip files modified after this age or date.'
+)
+@click.option(
+    '-r', '--root', 'roots',
+    multiple=True,
+    help='Export this project (path or quoted glob) to its own file; repeatable. Roots sharing a parent are scanned in one pass of it.'
+)
+@click.option(
+    '--output-dir',
+    default=".",
+    help='Directory receiving the exports of --root.'
+)
+@click.option(
+    '--processes',
+    default=None,
+    type=click.IntRange(min=1),
+    help='Processes exporting --root projects in parallel (default: one per CPU).'
+)
+@click.option(
+    '--fit-tokens',
+    default=None,
+    type=click.IntRange(min=1),
+    help='Keep the most central files fitting about this many tokens.'
+)
+@click.option(
+    '--fit-bytes',
+    default=None,
+    type=click.IntRange(min=1),
+    help='Keep the most central files fitting this many bytes.'
+)
+@click.option(
+    '--stats',
+    is_flag=True,
+    default=False,
+    help='Report phase timings, throughput, skipped files and the largest files.'
+)
+@click.option(
+    '--stats-top',
+    default=TOP_FILES,
+    type=click.IntRange(min=0),
+    help='Number of largest files listed by --stats.'
+)
+@click.option(
+    '--no-progress',
+    is_flag=True,
+    default=False,
+    help='Never show the progress bar (it is hidden anyway when not on a terminal).'
+)
+@click.option(
+    '-f', '--format', 'output_format',
+    default=None,
+    type=click.Choice(["markdown", *WRITERS]),
+    help='Output format (default: from the output extension, else markdown).'
+)
+def project_to_file(
+    path: str,
+    output: str,
+    exclude: str,
+    jobs: int,
+    incremental: bool,
+    cache_file: str,
+    no_gitignore: bool,
+    max_tokens: int,
+    max_bytes: int,
+    dedup: bool,
+    since: str,
+    staged: bool,
+    mark_changes: bool,
+    rev: str,
+    max_file_bytes: int,
+    max_file_lines: int,
+    watch: bool,
+    offset_index: bool,
+    skeleton: bool,
+    keep_full: str,
+    minify: bool,
+    redact: bool,
+    include_ext: str,
+    max_size: str,
+    newer_than: str,
+    older_than: str,
+    roots: tuple[str, ...],
+    output_dir: str,
+    processes: int,
+    fit_tokens: int,
+    fit_bytes: int,
+    stats: bool,
+    stats_top: int,
+    no_progress: bool,
+    output_format: str
+):
     """
     Export entire project to a single Markdown file.
 
@@ -134,17 +356,120 @@ def project_to_file(path: str, output: str, exclude: str):
     highlighting. Useful for documentation, code reviews, or AI analysis.
 
     Args:
-        path: Root directory of the project to scan (default: current directory).
-        output: Name of the output Markdown file (default: <project_name>-1-file.md).
-        exclude: Comma-separated list of files/directories to exclude from export.
+        path: Root directory of the project to scan, or a zip or tar archive
+            exported without extraction (default: current directory).
+        output: Name of the output Markdown file (default: <project_name>-1-file.md),
+            '-' for stdout, or a .gz/.xz/.zip name for compressed output.
+        exclude: Comma-separated gitignore-style patterns to exclude from export.
+        jobs: Number of threads reading files in parallel.
+        incremental: Reuse blocks of unchanged files from the sidecar cache.
+        cache_file: Location of the sidecar cache.
+        no_gitignore: Ignore the project's .gitignore and .pocketignore files.
+        max_tokens: Approximate token budget of each shard.
+        max_bytes: Byte budget of each shard.
+        dedup: Export identical files once and reference the first copy.
+        since: Only export files changed since this git ref.
+        staged: Only export files with staged changes.
+        mark_changes: Show the git status of changed files in the tree.
+        rev: Export the project as of this git ref without touching the
+            working tree.
+        max_file_bytes: Truncate larger files to their head and tail.
+        max_file_lines: Truncate longer files to their head and tail.
+        watch: Keep the output up to date as files change.
+        offset_index: Write a sidecar index of each file's byte range.
+        skeleton: Reduce Python files to their imports, signatures and docstrings.
+        keep_full: Patterns of Python files kept in full in skeleton mode.
+        minify: Strip comments and blank lines from Python, JS/TS, CSS and SQL.
+        redact: Replace secrets with markers and report what was replaced.
+        include_ext: Only export files with these extensions.
+        max_size: Skip files larger than this size.
+        newer_than: Skip files modified before this age or date.
+        older_than: Skip files modified after this age or date.
+        roots: Export these projects (paths or globs) each to its own file
+            instead of --path; siblings are scanned in one pass of their parent.
+        output_dir: Directory receiving the exports of --root.
+        processes: Number of processes exporting --root projects.
+        fit_tokens: Keep the files most central to the import graph that fit
+            about this many tokens; the tree marks the omitted ones.
+        fit_bytes: Same, with a budget in bytes.
+        stats: Report phase timings, throughput, skipped files and the largest files.
+        stats_top: Number of largest files listed by --stats.
+        no_progress: Never show the progress bar.
+        output_format: markdown, jsonl (one record per file) or sqlite
+            (database with a full-text index).
 
     Examples:
         pocket project to-file
         pocket project to-file -p ./my-project -o export.md
+        pocket project to-file -p app-1.0.tar.gz
         pocket project to-file -e "node_modules,dist,build"
+        pocket project to-file -j 8
+        pocket project to-file --incremental
+        pocket project to-file -e "node_modules,build/**/*.map"
+        pocket project to-file --max-tokens 100000
+        pocket project to-file -o - | llm-tool
+        pocket project to-file -o export.md.gz
+        pocket project to-file --dedup
+        pocket project to-file --since main --mark-changes
+        pocket project to-file --rev v1.2.0 -o release.md
+        pocket project to-file --max-file-bytes 200000 --max-file-lines 2000
+        pocket project to-file --watch -o live.md
+        pocket project to-file -o export.jsonl
+        pocket project to-file -f sqlite -o export.sqlite
+        pocket project to-file --skeleton --keep-full "src/core/**"
+        pocket project to-file --minify
+        pocket project to-file --redact
+        pocket project to-file --include-ext py,md --newer-than 7d --max-size 200k
+        pocket project to-file -r "packages/*" -r tools --output-dir exports
+        pocket project to-file --stats --stats-top 5 --no-progress
+        pocket project to-file --fit-tokens 100000 --skeleton
     """
 
-    create_codebase_markdown(path, output, exclude)
+    try:
+        options = export_options(
+            exclude,
+            jobs=jobs,
+            use_gitignore=not no_gitignore,
+            dedup=dedup,
+            max_file_bytes=max_file_bytes,
+            max_file_lines=max_file_lines,
+            skeleton=skeleton,
+            keep_full=keep_full,
+            minify=minify,
+            redact=redact,
+            include_ext=include_ext,
+            max_size=max_size,
+            newer_than=newer_than,
+            older_than=older_than
+        )
+    except ValueError as e:
+        console.print(f"[red]❌ {e}[/]", style="bold")
+        return
+
+    create_codebase_markdown(
+        path,
+        output,
+        options,
+        incremental=incremental,
+        cache_file=cache_file,
+        max_tokens=max_tokens,
+        max_bytes=max_bytes,
+        since=since,
+        staged=staged,
+        mark_changes=mark_changes,
+        watch=watch,
+        output_format=output_format,
+        offset_index=offset_index,
+        roots=roots,
+        output_dir=output_dir,
+        processes=processes,
+        stats=stats,
+        stats_top=stats_top,
+        progress=not no_progress,
+        fit_tokens=fit_tokens,
+        fit_bytes=fit_bytes,
+        rev=rev
+    )
 
 add_help_argument(project_to_file)
 
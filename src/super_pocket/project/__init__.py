@@ -2,6 +2,17 @@
 Project management and export tools.
 """
 
+from .export import ExportOptions, ProjectIndex, scan_project
+from .stream import ExportRecord, export_to, iter_markdown, iter_records
 from .to_file import create_codebase_markdown
 
-__all__ = ["create_codebase_markdown"]
+__all__ = [
+    "create_codebase_markdown",
+    "ExportOptions",
+    "ExportRecord",
+    "export_to",
+    "iter_markdown",
+    "iter_records",
+    "ProjectIndex",
+    "scan_project",
+]
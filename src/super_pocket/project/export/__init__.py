@@ -0,0 +1,28 @@
+"""
+Project export engine.
+
+Building blocks shared by the project-to-file exporters: a single-pass
+project scanner producing an in-memory file index, the gitignore-style
+matcher and stat-only filters deciding what it skips, the helpers that
+render that index, the options shared by every export, and the registry of
+structured output writers.
+"""
+
+from .filters import FileFilter
+from .ignore import IgnoreMatcher
+from .options import ExportOptions
+from .scanner import DirectoryNode, FileRecord, ProjectIndex, scan_project
+from .writers import ExportEntry, ExportWriter, register_writer
+
+__all__ = [
+    "DirectoryNode",
+    "ExportEntry",
+    "ExportOptions",
+    "ExportWriter",
+    "FileFilter",
+    "FileRecord",
+    "IgnoreMatcher",
+    "ProjectIndex",
+    "register_writer",
+    "scan_project",
+]
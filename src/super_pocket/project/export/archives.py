@@ -0,0 +1,326 @@
+"""
+Exports of zip and tar archives, read without extraction.
+
+A source drop can be exported straight from its archive: the members are
+listed once and indexed like the files of a directory (see
+``scanner.index_listing``), and each file is read from the archive when the
+exporter reaches it. Nothing is extracted next to the archive, and the
+tree and the contents are exactly those of the extracted directory.
+
+Drops usually hold a single top-level directory (``app-1.0/...``); it is
+then the project itself, as if that directory had been extracted and
+exported. Otherwise the project is named after the archive.
+
+Zip members are opened directly, and plain tar members are read at their
+offset in the archive. Compressed tarballs cannot be read at an offset: a
+first streaming pass only lists them (keeping the small ignore files), and
+once the project is indexed, ``ProjectArchive.load`` decompresses the
+archive once more, skipping to the selected members and copying them into
+a single anonymous spool (in memory up to ``SPOOL_BYTES``). Excluded
+members are never copied, and nothing is extracted into a directory. Symbolic links are left out, like in ``--rev``
+exports.
+"""
+from __future__ import annotations
+
+import abc
+import bz2
+import gzip
+import io
+import lzma
+import os
+import posixpath
+import stat
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from collections.abc import Iterable
+from typing import BinaryIO
+
+from .ignore import IGNORE_FILES
+from .reader import CHUNK_SIZE
+from .scanner import FileRecord
+
+# Archive extensions, longest first so '.tar.gz' wins over '.gz'
+ARCHIVE_SUFFIXES = (".tar.bz2", ".tar.gz", ".tar.xz", ".tbz2", ".tgz", ".txz", ".tar", ".zip")
+# Magic numbers of the compressions a tarball can use, with their readers
+DECOMPRESSORS = {b"\x1f\x8b": gzip.open, b"BZh": bz2.open, b"\xfd7zXZ\x00": lzma.open}
+# Decompressed tarball bytes kept in memory before spilling to a temporary file
+SPOOL_BYTES = 64 * 1024 * 1024
+
+
+class ArchiveError(RuntimeError):
+    """Raised when an archive cannot be read."""
+
+
+def is_archive(path: str) -> bool:
+    """Tell whether a project path is a zip or tar archive rather than a directory."""
+    return os.path.isfile(path) and path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def archive_stem(filename: str) -> str:
+    """
+    Strip the archive extension from a file name.
+
+    Example:
+        >>> archive_stem('app-1.0.tar.gz')
+        'app-1.0'
+    """
+    for suffix in ARCHIVE_SUFFIXES:
+        if filename.lower().endswith(suffix):
+            return filename[:-len(suffix)]
+    return filename
+
+
+class _MemberReader(io.RawIOBase):
+    """Seekable window on the bytes of one member inside a shared file."""
+
+    def __init__(self, data: BinaryIO, lock: threading.Lock, offset: int, size: int):
+        self._data = data
+        self._lock = lock
+        self._offset = offset
+        self._size = size
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: self._size}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        count = min(len(buffer), self._size - self._position)
+        if count <= 0:
+            return 0
+        with self._lock:
+            self._data.seek(self._offset + self._position)
+            data = self._data.read(count)
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+class ProjectArchive(abc.ABC):
+    """
+    An archive read as a project directory.
+
+    Attributes:
+        path: Absolute path of the archive.
+        name: Name of the project: the single top-level directory, or the
+              archive name without its extension.
+        files: Every regular file, relative to the project; their ``path``
+               is the member name.
+        directories: Relative paths of the listed directories, so that
+                     empty ones are shown like on disk.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self.name = archive_stem(os.path.basename(self.path))
+        self._files: dict[str, FileRecord] = {}
+        self.directories: list[str] = []
+
+    @property
+    def files(self) -> list[FileRecord]:
+        """The regular files of the project."""
+        return list(self._files.values())
+
+    def _add(self, member: str, is_dir: bool, size: int = 0, mtime_ns: int = 0) -> None:
+        """List a member; later members replace earlier ones, as on extraction."""
+        parts = [part for part in member.split('/') if part not in ('', '.')]
+        if not parts or '..' in parts:
+            return
+        relative_path = os.sep.join(parts)
+        if is_dir:
+            self.directories.append(relative_path)
+        else:
+            self._files[relative_path] = FileRecord(
+                name=parts[-1],
+                relative_path=relative_path,
+                path=member,
+                size=size,
+                mtime_ns=mtime_ns,
+                source=self,
+            )
+
+    def _strip_top_directory(self) -> None:
+        """Make a single top-level directory the project root."""
+        tops = {path.split(os.sep)[0] for path in (*self._files, *self.directories)}
+        if len(tops) != 1 or any(os.sep not in path for path in self._files):
+            return
+        top = tops.pop()
+        prefix = len(top) + len(os.sep)
+        for record in self._files.values():
+            record.relative_path = record.relative_path[prefix:]
+        self._files = {record.relative_path: record for record in self._files.values()}
+        self.directories = [path[prefix:] for path in self.directories if path != top]
+        self.name = top
+
+    def load(self, records: Iterable[FileRecord]) -> None:
+        """
+        Prepare the files selected for export to be read.
+
+        Archives read at random need nothing; compressed tarballs copy these
+        members, and only these, out of the archive.
+
+        Raises:
+            ArchiveError: If the archive cannot be read.
+        """
+
+    @abc.abstractmethod
+    def open(self, record: FileRecord) -> BinaryIO:
+        """Open a member for binary reading."""
+
+    def close(self) -> None:
+        """Release the archive."""
+
+    def __enter__(self) -> ProjectArchive:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ZipProject(ProjectArchive):
+    """A zip archive; members are decompressed as they are read."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._zip = zipfile.ZipFile(self.path)
+        self._infos: dict[str, zipfile.ZipInfo] = {}
+        for info in self._zip.infolist():
+            if stat.S_ISLNK(info.external_attr >> 16):
+                continue
+            mtime_ns = int(time.mktime(info.date_time + (0, 0, -1))) * 1_000_000_000
+            self._infos[info.filename] = info
+            self._add(info.filename, info.is_dir(), info.file_size, mtime_ns)
+        self._strip_top_directory()
+
+    def open(self, record: FileRecord) -> BinaryIO:
+        return self._zip.open(self._infos[record.path])
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+class TarProject(ProjectArchive):
+    """A tar archive, plain or compressed with gzip, bzip2 or xz."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        # Member name -> offset and size of its bytes in the tar stream (for
+        # compressed tarballs, the decompressed one)
+        self._spans: dict[str, tuple[int, int]] = {}
+        # Compressed tarballs: stream offset -> offset of the bytes copied to the spool
+        self._copied: dict[int, int] = {}
+        with open(self.path, 'rb') as raw:
+            magic = raw.read(6)
+        self._decompress = next(
+            (opener for prefix, opener in DECOMPRESSORS.items() if magic.startswith(prefix)), None
+        )
+        if self._decompress is not None:
+            self._data = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+            try:
+                with tarfile.open(self.path, 'r|*') as tar:
+                    for member in tar:
+                        self._list(member, tar)
+            except BaseException:
+                self._data.close()
+                raise
+        else:
+            self._data = open(self.path, 'rb')
+            try:
+                with tarfile.open(fileobj=self._data, mode='r:') as tar:
+                    for member in tar:
+                        self._list(member)
+            except BaseException:
+                self._data.close()
+                raise
+        self._strip_top_directory()
+
+    def _list(self, member: tarfile.TarInfo, stream: tarfile.TarFile | None = None) -> None:
+        """List a member; when streaming, copy ignore files, which the listing is filtered with."""
+        if member.isdir():
+            self._add(member.name, True)
+            return
+        if member.islnk():
+            span = self._spans.get(member.linkname)
+            if span is None:
+                return
+        elif not member.isreg() or member.issparse():
+            return
+        else:
+            span = (member.offset_data, member.size)
+            if stream is not None and posixpath.basename(member.name) in IGNORE_FILES:
+                self._copy(span, stream.extractfile(member))
+        self._spans[member.name] = span
+        self._add(member.name, False, span[1], int(member.mtime * 1_000_000_000))
+
+    def _copy(self, span: tuple[int, int], source: BinaryIO) -> None:
+        """Append ``span[1]`` bytes read from ``source`` to the spool."""
+        self._copied[span[0]] = self._data.seek(0, os.SEEK_END)
+        remaining = span[1]
+        while remaining and (data := source.read(min(CHUNK_SIZE, remaining))):
+            self._data.write(data)
+            remaining -= len(data)
+
+    def load(self, records: Iterable[FileRecord]) -> None:
+        if self._decompress is None:
+            return
+        with self._load_lock:
+            wanted = {self._spans[record.path] for record in records if record.source is self}
+            wanted = sorted(span for span in wanted if span[0] not in self._copied)
+            if not wanted:
+                return
+            try:
+                # Decompress once more, skipping straight over the members left out
+                with self._lock, self._decompress(self.path, 'rb') as stream:
+                    for span in wanted:
+                        stream.seek(span[0])
+                        self._copy(span, stream)
+            except (OSError, EOFError) as e:
+                raise ArchiveError(str(e) or type(e).__name__) from e
+
+    def open(self, record: FileRecord) -> BinaryIO:
+        """Open a member for binary reading; unloaded members are all loaded first."""
+        offset, size = self._spans[record.path]
+        if self._decompress is not None:
+            if offset not in self._copied:
+                self.load(self.files)
+            offset = self._copied[offset]
+        return io.BufferedReader(_MemberReader(self._data, self._lock, offset, size), CHUNK_SIZE)
+
+    def close(self) -> None:
+        self._data.close()
+
+
+def open_archive(path: str) -> ProjectArchive:
+    """
+    List the members of a zip or tar archive.
+
+    Args:
+        path: Path of the archive.
+
+    Returns:
+        ProjectArchive: The listed archive; close it once the export is written.
+
+    Raises:
+        ArchiveError: If the file is not a readable zip or tar archive.
+    """
+    try:
+        if path.lower().endswith(".zip"):
+            return ZipProject(path)
+        return TarProject(path)
+    except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError) as e:
+        raise ArchiveError(str(e) or type(e).__name__) from e
@@ -0,0 +1,173 @@
+"""
+Persistent per-file cache for incremental exports.
+
+The cache is a JSON sidecar stored next to the export. For every relative
+path it records the mtime, size and content hash seen on the last run along
+with the Markdown block that was rendered for the file. On the next run,
+files whose stat data is unchanged are spliced in from the cache without
+being opened.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+
+from .scanner import FileRecord
+
+# Bump when the cache layout changes; older caches are then discarded
+CACHE_VERSION = 1
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """Cached state of one exported file."""
+    mtime_ns: int
+    size: int
+    sha256: str | None
+    block: str | None = None
+    skipped: str | None = None
+
+
+def default_cache_path(output_file: str) -> str:
+    """
+    Return the sidecar cache path used for an export file.
+
+    Args:
+        output_file: Path of the exported document.
+
+    Returns:
+        str: ``<output_file>.cache.json``.
+    """
+    return f"{output_file}.cache.json"
+
+
+class ExportCache:
+    """
+    Per-file cache of rendered export blocks.
+
+    Entries are only kept for files seen during the current run, so deleted
+    files drop out of the cache the next time it is saved.
+    """
+
+    def __init__(self, path: str, signature: str = "", entries: dict[str, CacheEntry] | None = None):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Location of the JSON sidecar.
+            signature: Description of the options that shape rendered blocks.
+                       A cache written with a different signature is ignored.
+            entries: Previously stored entries, keyed by relative path.
+        """
+        self.path = path
+        self.signature = signature
+        self._previous = entries or {}
+        self._current: dict[str, CacheEntry] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: str, signature: str = "") -> ExportCache:
+        """
+        Load a cache from disk.
+
+        Missing, unreadable or incompatible caches yield an empty cache
+        instead of an error, so an incremental export always succeeds.
+
+        Args:
+            path: Location of the JSON sidecar.
+            signature: Expected rendering signature.
+
+        Returns:
+            ExportCache: The loaded (possibly empty) cache.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                data = json.load(handle)
+            if data.get("version") != CACHE_VERSION or data.get("signature") != signature:
+                return cls(path, signature)
+            entries = {
+                relative_path: CacheEntry(**entry)
+                for relative_path, entry in data.get("files", {}).items()
+            }
+        except (OSError, ValueError, TypeError, AttributeError):
+            return cls(path, signature)
+
+        return cls(path, signature, entries)
+
+    def lookup(self, record: FileRecord) -> CacheEntry | None:
+        """
+        Return the cached entry for a file if its stat data is unchanged.
+
+        A hit is carried over to the cache written at the end of the run.
+
+        Args:
+            record: The indexed file.
+
+        Returns:
+            CacheEntry | None: The fresh entry, or None if the file must be read.
+        """
+        entry = self._previous.get(record.relative_path)
+        if entry is None or entry.mtime_ns != record.mtime_ns or entry.size != record.size:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._current[record.relative_path] = entry
+        return entry
+
+    def previous_block(self, relative_path: str, sha256: str | None) -> str | None:
+        """
+        Return the previously rendered block if the content hash still matches.
+
+        This covers files that were touched without being modified.
+        """
+        entry = self._previous.get(relative_path)
+        if entry is not None and sha256 is not None and entry.sha256 == sha256:
+            return entry.block
+        return None
+
+    def store(
+        self,
+        record: FileRecord,
+        sha256: str | None,
+        block: str | None = None,
+        skipped: str | None = None
+    ) -> None:
+        """
+        Record the state of a freshly read file.
+
+        Args:
+            record: The indexed file.
+            sha256: Hash of the file's raw bytes.
+            block: Rendered Markdown block, if the file was exported.
+            skipped: Reason the file was skipped, if it was not exported.
+        """
+        self._current[record.relative_path] = CacheEntry(
+            mtime_ns=record.mtime_ns,
+            size=record.size,
+            sha256=sha256,
+            block=block,
+            skipped=skipped,
+        )
+
+    def save(self) -> None:
+        """Atomically write the entries of the current run to disk."""
+        payload = {
+            "version": CACHE_VERSION,
+            "signature": self.signature,
+            "files": {path: asdict(entry) for path, entry in self._current.items()},
+        }
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".pocket-cache-", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(payload, handle, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
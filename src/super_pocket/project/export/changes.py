@@ -0,0 +1,83 @@
+"""
+Git change detection for partial exports.
+
+Review tools usually only need the files changed relative to a base ref.
+The local repository is asked once for the changed paths (``git diff
+--name-status``), and only those files of the scan index are exported; the
+tree header still shows the whole project and can mark each changed file
+with its status letter.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+
+
+class GitChangesError(RuntimeError):
+    """Raised when the changed files cannot be obtained from git."""
+
+
+def _parse_name_status(output: str) -> dict[str, str]:
+    """
+    Parse the NUL-separated output of ``git diff --name-status -z``.
+
+    Renamed and copied files are reported under their new path.
+    """
+    fields = output.split('\0')
+    changes: dict[str, str] = {}
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i][0]
+        if status in 'RC':
+            path = fields[i + 2]
+            i += 3
+        else:
+            path = fields[i + 1]
+            i += 2
+        changes[path.replace('/', os.sep)] = status
+    return changes
+
+
+def changed_files(root: str, since: str | None = None, staged: bool = False) -> dict[str, str]:
+    """
+    List the files of a project that changed according to git.
+
+    Args:
+        root: Project directory, inside a git work tree. Only changes below it
+              are reported.
+        since: Base ref (branch, tag or commit). The working tree, or the
+               index with ``staged``, is compared against it.
+        staged: Compare the index instead of the working tree; without
+                ``since``, this lists the changes staged for the next commit.
+
+    Returns:
+        dict[str, str]: Changed paths relative to ``root`` mapped to their
+        status letter (``A``, ``M``, ``D``, ``R``, ...).
+
+    Raises:
+        GitChangesError: If git is missing, ``root`` is not in a repository
+                         or the ref is unknown.
+    """
+    command = ["git", "diff", "--name-status", "-z", "--relative"]
+    if staged:
+        command.append("--cached")
+    if since:
+        command.extend([since, "--"])
+
+    try:
+        completed = subprocess.run(
+            command,
+            cwd=root,
+            check=True,
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='surrogateescape'
+        )
+    except FileNotFoundError as e:
+        raise GitChangesError("git is not installed") from e
+    except subprocess.CalledProcessError as e:
+        message = (e.stderr or "").strip().splitlines()
+        raise GitChangesError(message[0] if message else str(e)) from e
+
+    return _parse_name_status(completed.stdout)
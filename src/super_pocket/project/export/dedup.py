@@ -0,0 +1,80 @@
+"""
+Content-hash deduplication of exported files.
+
+Vendored copies and generated files often appear several times in a tree.
+With deduplication enabled, the first file with a given content is exported
+in full and later identical files are written as a short reference to it.
+
+Only files whose size matches another indexed file can be duplicates, so
+the scan index is used to select candidates and every other file is
+exported without being hashed.
+"""
+from __future__ import annotations
+
+import hashlib
+from collections import Counter
+
+from .reader import CHUNK_SIZE
+from .scanner import FileRecord, ProjectIndex, open_record
+
+
+def hash_file(record: FileRecord, chunk_size: int = CHUNK_SIZE) -> str:
+    """
+    Compute the SHA-256 of a file by streaming it.
+
+    Args:
+        record: The indexed file.
+        chunk_size: Number of bytes read at a time.
+
+    Returns:
+        str: Hex digest of the raw bytes, comparable with ``reader.hash_bytes``.
+    """
+    digest = hashlib.sha256()
+    with open_record(record) as handle:
+        while data := handle.read(chunk_size):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+class Deduplicator:
+    """Remembers the first file seen for each content hash."""
+
+    def __init__(self, index: ProjectIndex):
+        """
+        Initialize the deduplicator from the scan index.
+
+        Args:
+            index: The scanned project; its stat sizes select the candidates.
+        """
+        sizes = Counter(record.size for record in index.iter_files())
+        self.candidate_sizes = {size for size, count in sizes.items() if count > 1 and size > 0}
+        self.first_paths: dict[str, str] = {}
+
+    def is_candidate(self, record: FileRecord) -> bool:
+        """Tell whether a file shares its size with another file."""
+        return record.size in self.candidate_sizes
+
+    def original_of(self, record: FileRecord, digest: str | None) -> str | None:
+        """
+        Return the path of an earlier exported file with the same content.
+
+        Args:
+            record: The file about to be written.
+            digest: SHA-256 of its raw bytes.
+
+        Returns:
+            str | None: Relative path of the first identical file, if any.
+        """
+        if digest is None or not self.is_candidate(record):
+            return None
+        return self.first_paths.get(digest)
+
+    def remember(self, record: FileRecord, digest: str | None) -> None:
+        """
+        Register a file that was exported in full.
+
+        Only exported files are remembered, so a reference never points to
+        a file that was skipped.
+        """
+        if digest is not None and self.is_candidate(record):
+            self.first_paths.setdefault(digest, record.relative_path)
@@ -0,0 +1,825 @@
+"""
+Rendering and writing of project exports.
+
+The writers turn a scanned ``ProjectIndex`` into a Markdown document (a
+title, the file tree and one fenced block per file), into numbered shards
+that each fit a byte budget, or into one structured record per file
+through a registered ``ExportWriter``. Contents are read, transformed
+(redaction, skeletons, minification) and rendered as ``ExportOptions`` say.
+
+They are shared by the command-line exporter (``super_pocket.project.to_file``),
+which adds scanning modes, caching and progress reporting around them, and
+by the streaming library API (``super_pocket.project.stream``). Files that
+are skipped are reported on ``console`` unless the options are quiet.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import math
+import os
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Mapping
+from typing import IO
+
+from rich.console import Console
+
+from .cache import ExportCache
+from .dedup import Deduplicator, hash_file
+from .minify import iter_minified
+from .offsets import OffsetIndexWriter, TrackingWriter
+from .options import ExportOptions
+from .outputs import open_output
+from .reader import (
+    BinaryContentError,
+    FileContent,
+    iter_contents,
+    iter_record_chunks,
+    read_record,
+    sniff_record,
+)
+from .redact import default_redactor, iter_redacted
+from .scanner import FileRecord, ProjectIndex
+from .shards import Shard, plan_shards, shard_path
+from .skeleton import iter_skeletons
+from .sniff import UTF8_GROWTH
+from .stats import timed
+from .summary import ExportSummary
+from .writers import ExportEntry, ExportWriter, open_writer
+
+# Receives the warnings of exports that are not quiet, and the command
+# line's progress messages
+console = Console()
+
+# Language mapping for syntax highlighting in Markdown code blocks
+LANG_MAP = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.html': 'html',
+    '.css': 'css',
+    '.scss': 'scss',
+    '.json': 'json',
+    '.xml': 'xml',
+    '.yml': 'yaml',
+    '.yaml': 'yaml',
+    '.md': 'markdown',
+    '.sh': 'bash',
+    '.java': 'java',
+    '.c': 'c',
+    '.cpp': 'cpp',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.php': 'php',
+    '.rb': 'ruby',
+    '.sql': 'sql',
+    '.dockerfile': 'dockerfile',
+    'Dockerfile': 'dockerfile',
+}
+
+# Identifies how file blocks are rendered; cached blocks from another layout are discarded
+BLOCK_SIGNATURE = "markdown-v2"
+
+
+def get_language_identifier(filename: str) -> str:
+    """
+    Determine the language identifier for a Markdown code block based on file extension.
+
+    This function maps file extensions to their corresponding language identifiers
+    for proper syntax highlighting in Markdown code blocks. Special files like
+    'Dockerfile' are handled separately.
+
+    Args:
+        filename: The name of the file (can be basename or full path).
+
+    Returns:
+        str: Language identifier for syntax highlighting (e.g., 'python', 'javascript').
+             Returns 'plaintext' if the extension is not recognized.
+
+    Example:
+        >>> get_language_identifier('script.py')
+        'python'
+        >>> get_language_identifier('Dockerfile')
+        'dockerfile'
+    """
+    # Handle special cases like 'Dockerfile' without extension
+    if os.path.basename(filename) in LANG_MAP:
+        return LANG_MAP[os.path.basename(filename)]
+
+    # Handle standard extensions
+    _, ext = os.path.splitext(filename)
+    return LANG_MAP.get(ext.lower(), 'plaintext')
+
+
+# Closes the fenced code block opened by render_block_header
+BLOCK_FOOTER = "\n```\n\n"
+
+
+def render_encoding_comment(encoding: str | None) -> str:
+    """Render the comment recording the source encoding of a file not stored as UTF-8."""
+    if encoding is None or encoding == 'utf-8':
+        return ""
+    return f"<!-- encoding: {encoding} -->\n"
+
+
+def render_block_header(relative_path: str, continued: bool = False, encoding: str | None = None) -> str:
+    """
+    Render the separator, path header and opening fence written before a file.
+
+    Args:
+        relative_path: Path of the file relative to the project root.
+        continued: Mark the block as the continuation of a file split
+                   across shards.
+        encoding: Codec the file was decoded with; anything but UTF-8 is
+                  recorded in an HTML comment above the fence.
+
+    Returns:
+        str: The Markdown preceding the file content.
+    """
+    lang = get_language_identifier(relative_path)
+    label = " (continued)" if continued else ""
+    return f"---\n\n**`{relative_path}`**{label}:\n{render_encoding_comment(encoding)}```{lang}\n"
+
+
+def render_file_block(relative_path: str, text: str, encoding: str | None = None) -> str:
+    """
+    Render the Markdown block written for one file.
+
+    Args:
+        relative_path: Path of the file relative to the project root.
+        text: Decoded file content.
+        encoding: Codec the file was decoded with (see ``render_block_header``).
+
+    Returns:
+        str: Separator, path header and fenced code block.
+    """
+    return f"{render_block_header(relative_path, encoding=encoding)}{text}{BLOCK_FOOTER}"
+
+
+def render_reference_block(relative_path: str, original: str) -> str:
+    """
+    Render the short block written for a duplicate of an exported file.
+
+    Args:
+        relative_path: Path of the duplicate.
+        original: Path of the first file with the same content.
+
+    Returns:
+        str: Separator and a one-line reference to ``original``.
+    """
+    return f"---\n\n**`{relative_path}`**: identical to `{original}`\n\n"
+
+
+def _warn_binary(relative_path: str, quiet: bool = False) -> None:
+    if quiet:
+        return
+    console.print(f"[red]|| Warning: Cannot read file [/red]'{relative_path}'[red] (probably binary). Skipping.[/]", style="bold")
+
+
+def _warn_error(relative_path: str, error, quiet: bool = False) -> None:
+    if quiet:
+        return
+    console.print(f"[red]❌ Error reading file [/red]'{relative_path}'[red]: {error}[/]", style="bold")
+
+
+def _count_redactions(summary: ExportSummary, relative_path: str, counts, quiet: bool = False) -> None:
+    """Account for the secrets replaced in a file and report them."""
+    if not counts:
+        return
+    summary.add_redacted(relative_path, counts)
+    if quiet:
+        return
+    detectors = ", ".join(f"{name} {count}" for name, count in sorted(counts.items()))
+    console.print(f"[yellow]|| Redacted {sum(counts.values())} secret(s) in [/yellow]'{relative_path}' ({detectors})", style="bold")
+
+
+def _record_chunks(record: FileRecord, redactions=None):
+    """Iterate over a file's text, redacted into ``redactions`` (a Counter) if given."""
+    chunks = iter_record_chunks(record)
+    if redactions is not None:
+        chunks = default_redactor().redact_chunks(chunks, redactions)
+    return chunks
+
+
+def _stream_file_block(md_file, record, digest=None, redactions=None, encoding=None) -> str | None:
+    """
+    Stream a large file into the output without loading it whole.
+
+    If the content stops decoding part-way through, the partial block is
+    truncated away when the output is seekable; otherwise the block is
+    closed as is. ``digest``, a hashlib object, is fed the written content.
+    With ``redactions`` (a Counter), secrets are redacted as they stream and
+    counted per detector. ``encoding``, the sniffed codec, is recorded in
+    the block header.
+
+    Returns:
+        str | None: None on success, 'binary' if the file was skipped, or the
+                    error message if it could not be read.
+    """
+    chunks = _record_chunks(record, redactions)
+    try:
+        first = next(chunks, "")
+    except BinaryContentError:
+        return "binary"
+    except OSError as e:
+        return str(e)
+
+    start = md_file.tell() if md_file.seekable() else None
+    md_file.write(render_block_header(record.relative_path, encoding=encoding))
+    md_file.write(first)
+    if digest is not None:
+        digest.update(first.encode('utf-8'))
+    try:
+        for chunk in chunks:
+            md_file.write(chunk)
+            if digest is not None:
+                digest.update(chunk.encode('utf-8'))
+    except (BinaryContentError, OSError) as e:
+        if start is None:
+            md_file.write(BLOCK_FOOTER)
+        else:
+            md_file.seek(start)
+            md_file.truncate()
+        return "binary" if isinstance(e, BinaryContentError) else str(e)
+
+    md_file.write(BLOCK_FOOTER)
+    return None
+
+
+def _content_start(block: str, relative_path: str) -> int:
+    """Index of the file content in a rendered block, after its opening fence."""
+    fence = block.index("\n```", len(f"---\n\n**`{relative_path}`**"))
+    return block.index("\n", fence + 1) + 1
+
+
+def _is_python(record: FileRecord) -> bool:
+    return get_language_identifier(record.name) == 'python'
+
+
+def _transformed(
+    contents: Iterable[FileContent],
+    expected: int,
+    options: ExportOptions
+) -> Iterable[FileContent]:
+    """
+    Chain the optional content stages after the reader.
+
+    Redaction comes first, so secrets are counted in the original text and
+    cannot survive in what the other stages keep. ``expected`` is the number
+    of Python files among ``contents``; it decides whether skeletons are
+    built on a process pool.
+    """
+    if options.redact:
+        contents = iter_redacted(contents)
+    if options.skeleton is not None:
+        contents = iter_skeletons(contents, options.skeleton, expected)
+    if options.minify:
+        contents = iter_minified(contents, get_language_identifier)
+    return contents
+
+
+def _count_transforms(summary: ExportSummary, result: FileContent, quiet: bool = True) -> None:
+    """Account for the encoding, redaction, truncation, skeleton and minification of a written file."""
+    summary.add_encoding(result.encoding)
+    _count_redactions(summary, result.record.relative_path, result.redactions, quiet)
+    if result.omitted:
+        summary.add_truncated(result.omitted)
+    if result.skeleton:
+        summary.add_skeleton(result.record.size - len(result.text.encode('utf-8')) - result.minified)
+    if result.minified:
+        summary.add_minified(result.minified)
+
+
+def write_file_contents(
+    md_file,
+    records: Iterable[FileRecord],
+    options: ExportOptions,
+    cache: ExportCache | None = None,
+    dedup: Deduplicator | None = None,
+    on_block: Callable[[FileRecord], None] | None = None,
+    offsets: OffsetIndexWriter | None = None
+) -> ExportSummary:
+    """
+    Write the block of every given file, in order.
+
+    Files whose stat data matches the cache are spliced in without being
+    opened; all others are read (possibly in parallel) and rendered as
+    ``options`` say (redaction, truncation, skeleton, minification). Large
+    files are streamed (and redacted) in chunks and are not kept in the cache. With ``dedup``, files
+    identical to one already written become references.
+    ``on_block`` is called before anything is written for each file, and
+    the content range of each block is appended to ``offsets`` (which needs
+    ``md_file`` to be a ``TrackingWriter``).
+
+    Returns:
+        ExportSummary: What was written and what was skipped.
+    """
+    summary = ExportSummary()
+    records = list(records)
+    cached = {}
+    if cache is not None:
+        for record in records:
+            entry = cache.lookup(record)
+            if entry is not None:
+                cached[record.relative_path] = entry
+
+    stale = (record for record in records if record.relative_path not in cached)
+    with_digest = cache is not None or dedup is not None
+    contents = iter_contents(stale, jobs=options.jobs, with_digest=with_digest, limits=options.limits)
+    expected = sum(1 for record in records if record.relative_path not in cached and _is_python(record))
+    contents = timed(_transformed(contents, expected, options), summary)
+
+    def write_reference(record: FileRecord, original: str, size: int) -> None:
+        reference = render_reference_block(record.relative_path, original)
+        md_file.write(reference)
+        summary.add_duplicate(size - len(reference.encode('utf-8')))
+        if offsets is not None:
+            offsets.alias(record.relative_path, original)
+
+    def write_block(record: FileRecord, block: str, digest: str | None) -> None:
+        original = dedup.original_of(record, digest) if dedup is not None else None
+        if original is not None:
+            write_reference(record, original, len(block.encode('utf-8')))
+            return
+        if offsets is not None:
+            data = block.encode('utf-8')
+            header = len(block[:_content_start(block, record.relative_path)].encode('utf-8'))
+            offsets.add(record.relative_path, md_file.tell() + header, data[header:len(data) - len(BLOCK_FOOTER)])
+        md_file.write(block)
+        summary.files_written += 1
+        if dedup is not None:
+            dedup.remember(record, digest)
+
+    for record in records:
+        relative_path = record.relative_path
+        if on_block is not None:
+            on_block(record)
+
+        entry = cached.get(relative_path)
+        if entry is not None:
+            if entry.block is not None:
+                write_block(record, entry.block, entry.sha256)
+            else:
+                _warn_binary(relative_path, options.quiet)
+                summary.add_binary(record.size)
+            continue
+
+        result = next(contents)
+
+        if result.streamed:
+            digest = None
+            if dedup is not None and dedup.is_candidate(record):
+                try:
+                    digest = hash_file(record)
+                except OSError as e:
+                    _warn_error(relative_path, e, options.quiet)
+                    summary.errors += 1
+                    continue
+                original = dedup.original_of(record, digest)
+                if original is not None:
+                    write_reference(record, original, record.size)
+                    continue
+
+            content_hash = hashlib.sha256() if offsets is not None else None
+            start = md_file.tell() if offsets is not None else 0
+            redactions = Counter() if options.redact else None
+            failure = _stream_file_block(md_file, record, content_hash, redactions, result.encoding)
+            if failure is None:
+                _count_transforms(summary, result, options.quiet)
+                _count_redactions(summary, relative_path, redactions, options.quiet)
+                if offsets is not None:
+                    header = render_block_header(relative_path, encoding=result.encoding)
+                    offset = start + len(header.encode('utf-8'))
+                    length = md_file.tell() - len(BLOCK_FOOTER) - offset
+                    offsets.add(relative_path, offset, length=length, sha256=content_hash.hexdigest())
+                summary.files_written += 1
+                if dedup is not None:
+                    dedup.remember(record, digest)
+            elif failure == "binary":
+                _warn_binary(relative_path, options.quiet)
+                summary.add_binary(record.size)
+            else:
+                _warn_error(relative_path, failure, options.quiet)
+                summary.errors += 1
+            continue
+
+        if result.binary:
+            _warn_binary(relative_path, options.quiet)
+            summary.add_binary(record.size)
+            if cache is not None:
+                cache.store(record, result.digest, skipped="binary")
+            continue
+        if result.error is not None:
+            _warn_error(relative_path, result.error, options.quiet)
+            summary.errors += 1
+            continue
+
+        _count_transforms(summary, result, options.quiet)
+
+        block = None
+        if cache is not None:
+            block = cache.previous_block(relative_path, result.digest)
+        if block is None:
+            block = render_file_block(relative_path, result.text, result.encoding)
+
+        write_block(record, block, result.digest)
+        if cache is not None:
+            cache.store(record, result.digest, block=block)
+
+    return summary
+
+
+def write_records(
+    writer: ExportWriter,
+    records: Iterable[FileRecord],
+    options: ExportOptions,
+    on_block: Callable[[FileRecord], None] | None = None
+) -> ExportSummary:
+    """
+    Write one structured record per file through a registered writer.
+
+    Binary files and files that cannot be read are skipped like in the
+    Markdown export; large files are streamed to the writer in chunks.
+    Contents are rendered as ``options`` say, like Markdown blocks.
+    ``on_block`` is called for each file before it is written.
+
+    Returns:
+        ExportSummary: What was written and what was skipped.
+    """
+    summary = ExportSummary()
+    records = list(records)
+    contents = iter_contents(records, jobs=options.jobs, with_digest=True, limits=options.limits)
+    expected = sum(1 for record in records if _is_python(record))
+    contents = timed(_transformed(contents, expected, options), summary)
+    for result in contents:
+        record = result.record
+        if on_block is not None:
+            on_block(record)
+        if result.binary:
+            _warn_binary(record.relative_path, options.quiet)
+            summary.add_binary(record.size)
+            continue
+        if result.error is not None:
+            _warn_error(record.relative_path, result.error, options.quiet)
+            summary.errors += 1
+            continue
+
+        entry = ExportEntry(
+            path=record.relative_path.replace(os.sep, '/'),
+            language=get_language_identifier(record.name),
+            size=record.size,
+            sha256=result.digest,
+            truncated=bool(result.omitted),
+            encoding=result.encoding or "utf-8"
+        )
+        redactions = Counter() if options.redact and result.streamed else None
+        try:
+            if result.streamed:
+                entry.sha256 = hash_file(record)
+                writer.write_file(entry, _record_chunks(record, redactions))
+            else:
+                writer.write_file(entry, [result.text])
+        except BinaryContentError:
+            _warn_binary(record.relative_path, options.quiet)
+            summary.add_binary(record.size)
+            continue
+        except OSError as e:
+            _warn_error(record.relative_path, e, options.quiet)
+            summary.errors += 1
+            continue
+
+        summary.files_written += 1
+        _count_transforms(summary, result, options.quiet)
+        _count_redactions(summary, record.relative_path, redactions, options.quiet)
+    return summary
+
+
+def write_header(
+    md_file,
+    title: str,
+    index: ProjectIndex,
+    marks: Mapping[str, str] | None = None
+) -> None:
+    """Write the title and the file tree of ``index``."""
+    md_file.write(f"# {title}\n\n")
+    md_file.write("```bash\n")
+    md_file.write(f"{index.name}/\n")
+    for line in index.iter_tree_lines(marks):
+        md_file.write(f"{line}\n")
+    md_file.write("```\n\n")
+
+
+def header_size(title: str, index: ProjectIndex, marks: Mapping[str, str] | None = None) -> int:
+    """Bytes taken by the title and tree that ``write_header`` writes."""
+    buffer = io.StringIO()
+    write_header(buffer, title, index, marks)
+    return len(buffer.getvalue().encode('utf-8'))
+
+
+def write_document(
+    md_file,
+    title: str,
+    index: ProjectIndex,
+    options: ExportOptions,
+    cache: ExportCache | None = None,
+    dedup: Deduplicator | None = None,
+    tree: ProjectIndex | None = None,
+    marks: Mapping[str, str] | None = None,
+    offsets: OffsetIndexWriter | None = None,
+    on_block: Callable[[FileRecord], None] | None = None
+) -> ExportSummary:
+    """
+    Write a title, a tree and the blocks of the files of ``index``.
+
+    The tree shows ``tree`` when given (e.g. the whole project while only
+    changed files are exported), otherwise ``index`` itself; ``marks``
+    labels files in it. With ``offsets``, the content range of every file
+    is recorded in the sidecar index as the document is written.
+    ``on_block`` is called for each file before its block is written.
+    """
+    if offsets is not None:
+        md_file = TrackingWriter(md_file)
+    write_header(md_file, title, tree or index, marks)
+    return write_file_contents(
+        md_file, index.iter_files(), options, cache, dedup, on_block=on_block, offsets=offsets
+    )
+
+
+def write_index(
+    output: str | IO,
+    index: ProjectIndex,
+    options: ExportOptions,
+    output_format: str = "markdown"
+) -> ExportSummary:
+    """
+    Write a scanned project in one go, without reporting progress.
+
+    Args:
+        output: Output path or writable file-like object.
+        index: The files to export.
+        options: Rendering options.
+        output_format: 'markdown' or a registered structured format.
+
+    Returns:
+        ExportSummary: What was written and what was skipped.
+    """
+    if output_format != "markdown":
+        with open_writer(output_format, output, index.name) as writer:
+            return write_records(writer, index.iter_files(), options)
+
+    dedup = Deduplicator(index) if options.dedup else None
+    with open_output(output) as md_file:
+        return write_document(md_file, index.name, index, options, dedup=dedup)
+
+
+def _shard_title(project_name: str, number: int) -> str:
+    """Title written at the top of a shard."""
+    return f"{project_name} (shard {number})"
+
+
+def block_overhead(record: FileRecord) -> int:
+    """Bytes a file block adds around the file content."""
+    return len(render_block_header(record.relative_path).encode('utf-8')) + len(BLOCK_FOOTER)
+
+
+def _next_encoded(chunks) -> tuple[bytes, str | None]:
+    """Pull the next streamed chunk as UTF-8 bytes, capturing read failures."""
+    try:
+        return next(chunks, "").encode('utf-8'), None
+    except BinaryContentError:
+        return b"", "binary"
+    except OSError as e:
+        return b"", str(e)
+
+
+def _fit(pending: bytes, remaining: int, force: bool) -> str:
+    """
+    Take the longest prefix of ``pending`` fitting ``remaining`` bytes.
+
+    The cut is made after the last line break when there is one, otherwise on
+    a character boundary. With ``force``, at least one character is returned
+    so that an empty shard always makes progress.
+    """
+    cut = pending[:remaining]
+    newline = cut.rfind(b"\n")
+    if newline >= 0:
+        cut = cut[:newline + 1]
+    piece = cut.decode('utf-8', errors='ignore')
+    if not piece and force:
+        piece = pending[:4].decode('utf-8', errors='ignore')[:1]
+    return piece
+
+
+def _write_split_file(
+    record: FileRecord,
+    index: ProjectIndex,
+    output_file: str,
+    first_number: int,
+    budget: int,
+    marks: Mapping[str, str] | None = None,
+    text: str | None = None,
+    redactions=None,
+    encoding: str | None = None
+) -> tuple[list[str], str | None]:
+    """
+    Write a file that exceeds the shard budget across consecutive shards.
+
+    The content (``text`` if already read, e.g. a truncated excerpt) is
+    streamed and cut on the last line break that fits each shard (or on a
+    character boundary for very long lines). With ``redactions`` (a
+    Counter), streamed content is redacted and counted per detector.
+    ``encoding`` is recorded in the header of every piece.
+
+    Returns:
+        tuple[list[str], str | None]: Paths of the shards written, and None
+        on success, 'binary' if the file was skipped, or the error message.
+    """
+    chunks = iter([text]) if text is not None else _record_chunks(record, redactions)
+    pending, failure = _next_encoded(chunks)
+    if failure is not None:
+        return [], failure
+
+    subset = index.subset([record])
+    tree = "".join(f"{line}\n" for line in subset.iter_tree_lines(marks))
+    written: list[str] = []
+    number = first_number
+
+    while True:
+        header = (
+            f"# {_shard_title(index.name, number)}\n\n```bash\n{index.name}/\n{tree}```\n\n"
+            f"{render_block_header(record.relative_path, number > first_number, encoding)}"
+        )
+        capacity = max(budget - len(header.encode('utf-8')) - len(BLOCK_FOOTER), 1)
+        remaining = capacity
+
+        path = shard_path(output_file, number)
+        with open_output(path) as md_file:
+            md_file.write(header)
+            while remaining > 0:
+                if not pending:
+                    pending, failure = _next_encoded(chunks)
+                    if not pending:
+                        break
+                if len(pending) <= remaining:
+                    md_file.write(pending.decode('utf-8'))
+                    remaining -= len(pending)
+                    pending = b""
+                    continue
+
+                piece = _fit(pending, remaining, force=remaining == capacity)
+                md_file.write(piece)
+                pending = pending[len(piece.encode('utf-8')):]
+                break
+            md_file.write(BLOCK_FOOTER)
+        written.append(path)
+
+        if not pending and failure is None:
+            pending, failure = _next_encoded(chunks)
+        if not pending:
+            return written, failure
+        number += 1
+
+
+def write_shards(
+    output_file: str,
+    index: ProjectIndex,
+    budget: int,
+    options: ExportOptions,
+    cache: ExportCache | None = None,
+    dedup: Deduplicator | None = None,
+    marks: Mapping[str, str] | None = None,
+    on_block: Callable[[FileRecord], None] | None = None
+) -> ExportSummary:
+    """
+    Write the export as numbered shards that each fit ``budget`` bytes.
+
+    Every shard starts with its own title and the tree of the files it holds.
+    Duplicates may refer to a file exported in an earlier shard.
+    ``on_block`` is called for each file before it is written.
+
+    Shards are planned from ``content_bounds`` and rendered in memory; one
+    that still ends up over the budget is split in two and rendered again
+    (a single file is split across shards), so no shard is ever written
+    larger than ``budget``.
+    """
+    title_size = len(
+        f"# {_shard_title(index.name, 999999)}\n\n```bash\n{index.name}/\n```\n\n".encode('utf-8')
+    )
+
+    def overhead(record: FileRecord) -> int:
+        mark = marks.get(record.relative_path) if marks else None
+        return block_overhead(record) + (len(mark) + 3 if mark else 0)
+
+    bounds = content_bounds(index, options)
+    pending = deque(plan_shards(
+        index, budget, title_size, overhead, lambda record: bounds[record.relative_path]
+    ))
+    announced: set[str] = set()
+
+    def announce(record: FileRecord) -> None:
+        if on_block is not None and record.relative_path not in announced:
+            announced.add(record.relative_path)
+            on_block(record)
+
+    summary = ExportSummary()
+    number = 1
+    while pending:
+        shard = pending.popleft()
+        if shard.oversized:
+            record = shard.records[0]
+            announce(record)
+            text = None
+            contents = _transformed(iter([read_record(record, limits=options.limits)]), 1, options)
+            result = next(contents)
+            transformed = result.omitted or result.skeleton or result.minified or result.redactions
+            if result.text is not None and (transformed or result.encoding != 'utf-8'):
+                text = result.text
+                _count_transforms(summary, result, options.quiet)
+            redactions = Counter() if options.redact and text is None else None
+            written, failure = _write_split_file(
+                record, index, output_file, number, budget, marks, text, redactions, result.encoding
+            )
+            summary.shards.extend(written)
+            number += len(written)
+            if failure is None:
+                summary.files_written += 1
+                _count_redactions(summary, record.relative_path, redactions, options.quiet)
+            elif failure == "binary":
+                _warn_binary(record.relative_path, options.quiet)
+                summary.add_binary(record.size)
+            else:
+                _warn_error(record.relative_path, failure, options.quiet)
+                summary.errors += 1
+            continue
+
+        # Render in memory and check the actual size before the shard is written
+        remembered = dict(dedup.first_paths) if dedup is not None else None
+        buffer = io.StringIO()
+        part = write_document(
+            buffer, _shard_title(index.name, number), index.subset(shard.records), options, cache, dedup,
+            marks=marks, on_block=announce
+        )
+        document = buffer.getvalue()
+        if len(document.encode('utf-8')) > budget:
+            if dedup is not None:
+                dedup.first_paths = remembered
+            records = shard.records
+            if len(records) == 1:
+                pending.appendleft(Shard(records=records, oversized=True))
+            else:
+                half = len(records) // 2
+                pending.extendleft([Shard(records=records[half:]), Shard(records=records[:half])])
+            continue
+
+        path = shard_path(output_file, number)
+        with open_output(path) as md_file:
+            md_file.write(document)
+        summary.merge(part)
+        summary.shards.append(path)
+        number += 1
+
+    return summary
+
+
+def content_bounds(index: ProjectIndex, options: ExportOptions) -> dict[str, int]:
+    """
+    Bound the rendered content of every file, in bytes, for shard and budget planning.
+
+    The stat size (or the truncation bound) holds for UTF-8 files, but
+    redaction markers can be longer than the secrets they replace: with
+    ``options.redact``, files are read and redacted once up front and
+    measured instead. Otherwise only the leading window of each file is
+    sniffed, and files in another encoding are bounded by their worst-case
+    growth once re-encoded to UTF-8 (``UTF8_GROWTH``). Either way, the
+    bound includes the comment recording a file's encoding. Skeletons and
+    minification only shrink the content.
+    """
+    records = list(index.iter_files())
+    bounds = {
+        record.relative_path: options.limits.content_bound(record.size) if options.limits else record.size
+        for record in records
+    }
+    if not options.redact:
+        for record in records:
+            try:
+                encoding = sniff_record(record)
+            except OSError:
+                continue
+            grown = math.ceil(bounds[record.relative_path] * UTF8_GROWTH.get(encoding, 1))
+            bounds[record.relative_path] = grown + len(render_encoding_comment(encoding))
+        return bounds
+
+    for result in iter_redacted(iter_contents(records, jobs=options.jobs, limits=options.limits)):
+        relative_path = result.record.relative_path
+        comment = len(render_encoding_comment(result.encoding))
+        if result.text is not None:
+            bounds[relative_path] = len(result.text.encode('utf-8')) + comment
+        elif result.streamed:
+            size = 0
+            try:
+                for chunk in _record_chunks(result.record, Counter()):
+                    size += len(chunk.encode('utf-8'))
+            except (BinaryContentError, OSError):
+                pass
+            bounds[relative_path] = size + comment
+    return bounds
@@ -0,0 +1,283 @@
+"""
+Exports of a git revision, read from the object database.
+
+``--rev <ref>`` exports a project as it is in a commit without checking it
+out or touching the working tree. The tree is listed once with ``git
+ls-tree``, and every blob is read through a single ``git cat-file --batch``
+process kept open for the whole export, instead of spawning one ``git
+show`` per file. The listing goes through the usual exclusion rules (see
+``scanner.index_listing``), with the ignore files of the revision itself.
+
+Files of a revision all get the commit time as their modification time, so
+age filters select by commit date. Symbolic links and submodules are left
+out, since their blobs do not hold file contents.
+"""
+from __future__ import annotations
+
+import io
+import os
+import posixpath
+import subprocess
+import tempfile
+import threading
+from typing import BinaryIO
+
+from .reader import CHUNK_SIZE, STREAM_THRESHOLD
+from .scanner import FileRecord
+
+# Tree entry modes that are not regular files
+SYMLINK_MODE = "120000"
+SUBMODULE_MODE = "160000"
+
+
+class GitRevisionError(RuntimeError):
+    """Raised when a revision cannot be read from git."""
+
+
+def _git(root: str, *args: str) -> str:
+    """Run a git command in ``root`` and return its output."""
+    try:
+        completed = subprocess.run(
+            ["git", *args],
+            cwd=root,
+            check=True,
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='surrogateescape'
+        )
+    except FileNotFoundError as e:
+        raise GitRevisionError("git is not installed") from e
+    except subprocess.CalledProcessError as e:
+        message = (e.stderr or "").strip().splitlines()
+        raise GitRevisionError(message[0] if message else str(e)) from e
+    return completed.stdout
+
+
+class _Blob:
+    """A blob on the ``git cat-file`` pipe, spooled as far as it has been read."""
+
+    def __init__(self, blob_id: str, size: int, pipe: BinaryIO):
+        self.blob_id = blob_id
+        self.size = size
+        self.filled = 0
+        self.spool = tempfile.SpooledTemporaryFile(max_size=STREAM_THRESHOLD)
+        self._pipe = pipe
+        self._finish()
+
+    def _finish(self) -> None:
+        """Consume the line break git writes after a fully read blob."""
+        if self.filled == self.size:
+            self._pipe.read(1)
+
+    def fill(self, end: int) -> None:
+        """Copy the blob from the pipe to the spool up to offset ``end``."""
+        if self.filled >= end:
+            return
+        self.spool.seek(self.filled)
+        while self.filled < end:
+            data = self._pipe.read(min(CHUNK_SIZE, end - self.filled))
+            if not data:
+                raise OSError("git cat-file exited while reading a blob")
+            self.spool.write(data)
+            self.filled += len(data)
+        self._finish()
+
+    def discard(self) -> None:
+        """Skip the unread rest of the blob on the pipe, without copying it, and free the spool."""
+        self.spool.close()
+        remaining = self.size - self.filled
+        if not remaining:
+            return
+        while remaining:
+            data = self._pipe.read(min(CHUNK_SIZE, remaining))
+            if not data:
+                raise OSError("git cat-file exited while reading a blob")
+            remaining -= len(data)
+        self.filled = self.size
+        self._finish()
+
+
+class _BlobReader(io.RawIOBase):
+    """Seekable handle on a blob, which holds the pipe until it is closed."""
+
+    def __init__(self, store: BlobStore, blob: _Blob):
+        self._store = store
+        self._blob = blob
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: self._blob.size}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        count = min(len(buffer), self._blob.size - self._position)
+        if count <= 0:
+            return 0
+        self._blob.fill(self._position + count)
+        self._blob.spool.seek(self._position)
+        data = self._blob.spool.read(count)
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._store._park(self._blob)
+        super().close()
+
+
+class BlobStore:
+    """
+    Reads blobs through one persistent ``git cat-file --batch`` process.
+
+    A blob is pulled from the pipe only as far as it is read, into a spool
+    that stays in memory up to ``STREAM_THRESHOLD`` bytes, and an open
+    handle holds the pipe until it is closed; reader threads wait for it.
+    The last blob closed is kept: opening it again (e.g. to stream a file
+    that was only sniffed) resumes it, while opening another blob first
+    skips the unread rest of it, so a binary blob costs its sniffed window.
+    """
+
+    def __init__(self, root: str):
+        """
+        Start the ``git cat-file`` process.
+
+        Args:
+            root: Directory inside the repository.
+
+        Raises:
+            GitRevisionError: If git is not installed.
+        """
+        try:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=root,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        except FileNotFoundError as e:
+            raise GitRevisionError("git is not installed") from e
+        self._lock = threading.Lock()
+        self._parked: _Blob | None = None
+
+    def open(self, record: FileRecord) -> BinaryIO:
+        """
+        Open the blob of a file.
+
+        Args:
+            record: A file of the revision; its ``path`` is the blob id.
+
+        Returns:
+            BinaryIO: A seekable handle on the blob's bytes. Close it
+            promptly: other blobs cannot be read while it is open.
+
+        Raises:
+            OSError: If the blob is missing or the process has exited.
+        """
+        self._lock.acquire()
+        try:
+            blob, self._parked = self._parked, None
+            if blob is None or blob.blob_id != record.path:
+                if blob is not None:
+                    blob.discard()
+                self._process.stdin.write(f"{record.path}\n".encode('ascii'))
+                self._process.stdin.flush()
+                header = self._process.stdout.readline().split()
+                if len(header) != 3 or header[1] != b"blob":
+                    raise FileNotFoundError(f"blob {record.path} of '{record.relative_path}' not found")
+                blob = _Blob(record.path, int(header[2]), self._process.stdout)
+        except (OSError, ValueError):
+            self._lock.release()
+            raise
+        return io.BufferedReader(_BlobReader(self, blob), CHUNK_SIZE)
+
+    def _park(self, blob: _Blob) -> None:
+        """Keep a closed blob for an immediate re-open and release the pipe."""
+        self._parked = blob
+        self._lock.release()
+
+    def close(self) -> None:
+        """Stop the ``git cat-file`` process, even in the middle of a blob."""
+        with self._lock:
+            if self._parked is not None:
+                self._parked.spool.close()
+                self._parked = None
+        if self._process.stdin:
+            self._process.stdin.close()
+        # Closing our end first: git may still be writing the unread rest of a blob
+        if self._process.stdout:
+            self._process.stdout.close()
+        self._process.wait()
+
+
+class GitRevision:
+    """A commit of the repository holding a project, read without a checkout."""
+
+    def __init__(self, root: str, rev: str):
+        """
+        Resolve the revision and start reading its blobs.
+
+        Args:
+            root: Project directory, inside a git work tree. Only the files
+                  below it are listed, relative to it.
+            rev: Branch, tag or commit to export.
+
+        Raises:
+            GitRevisionError: If git is missing, ``root`` is not in a
+                              repository or the ref is unknown.
+        """
+        self.root = os.path.abspath(root)
+        self.rev = rev
+        output = _git(self.root, "log", "-1", "--format=%H %ct", "--end-of-options", rev, "--")
+        self.commit, timestamp = output.split()
+        self.mtime_ns = int(timestamp) * 1_000_000_000
+        self.blobs = BlobStore(self.root)
+
+    def list_files(self) -> list[FileRecord]:
+        """
+        List the files of the project in the revision.
+
+        Returns:
+            list[FileRecord]: One record per blob, with its size and the
+            commit time; ``path`` holds the blob id.
+        """
+        output = _git(self.root, "ls-tree", "-r", "-z", "--long", self.commit)
+        records = []
+        for entry in output.split('\0'):
+            if not entry:
+                continue
+            meta, path = entry.split('\t', 1)
+            mode, kind, blob, size = meta.split()
+            if kind != "blob" or mode in (SYMLINK_MODE, SUBMODULE_MODE):
+                continue
+            records.append(FileRecord(
+                name=posixpath.basename(path),
+                relative_path=path.replace('/', os.sep),
+                path=blob,
+                size=int(size),
+                mtime_ns=self.mtime_ns,
+                source=self.blobs,
+            ))
+        return records
+
+    def close(self) -> None:
+        """Stop reading blobs."""
+        self.blobs.close()
+
+    def __enter__(self) -> GitRevision:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
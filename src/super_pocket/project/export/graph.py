@@ -0,0 +1,391 @@
+"""
+Import-graph ranking for budget-limited exports.
+
+When a whole project does not fit a context budget, the files worth keeping
+are the ones the rest of the code depends on. This module parses the
+imports of every Python file (on a process pool for large projects),
+resolves them to files of the project, ranks files by PageRank over the
+resulting graph, and greedily keeps the best ranked files that fit.
+
+Parsed imports are stored in a JSON sidecar next to the export
+(``<output>.graph.json``), keyed by path with the file's mtime and size,
+so repeated exports only parse the files that changed. Resolution and
+ranking are cheap and always redone, since they depend on the whole tree.
+"""
+from __future__ import annotations
+
+import ast
+import json
+import os
+import sys
+import tempfile
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+from .reader import BATCH_SIZE
+from .scanner import FileRecord, ProjectIndex, open_record
+
+# Bump when the sidecar layout changes; older graphs are then discarded
+GRAPH_VERSION = 1
+# Below this many files to parse, imports are parsed inline
+POOL_MIN_FILES = 64
+# PageRank damping factor and convergence settings
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-9
+
+
+@dataclass(slots=True)
+class GraphEntry:
+    """Imports parsed from one file, with the stat data they were read at."""
+    mtime_ns: int
+    size: int
+    imports: list[str]
+
+
+def default_graph_path(output_file: str) -> str:
+    """
+    Return the sidecar path of the import graph of an export.
+
+    Args:
+        output_file: Path of the exported document.
+
+    Returns:
+        str: ``<output_file>.graph.json``.
+    """
+    return f"{output_file}.graph.json"
+
+
+def module_name(relative_path: str) -> str | None:
+    """
+    Return the dotted name of a Python file relative to the project root.
+
+    Packages are named after their directory, so ``pkg/__init__.py`` is
+    ``pkg``. Imports are matched against the trailing parts of these names
+    (see ``resolve_imports``), which handles ``src/`` layouts.
+
+    Returns:
+        str | None: The dotted name, or None for other files.
+    """
+    path = relative_path.replace(os.sep, '/')
+    if not path.endswith('.py'):
+        return None
+    parts = path[:-3].split('/')
+    if parts[-1] == '__init__':
+        parts.pop()
+    return '.'.join(parts) or None
+
+
+def parse_imports(source: str, module: str = "", is_package: bool = False) -> list[str]:
+    """
+    List the modules a Python source imports, as absolute dotted names.
+
+    ``from a import b`` yields both ``a.b`` (``b`` may be a submodule) and
+    ``a``. Relative imports are made absolute from ``module``.
+
+    Args:
+        source: Python source code.
+        module: Dotted name of the file (see ``module_name``).
+        is_package: Whether the file is a package ``__init__``.
+
+    Returns:
+        list[str]: Imported names in source order, without duplicates; empty
+        if the source does not parse.
+
+    Example:
+        >>> parse_imports("from . import utils\\nimport os.path", "app.main")
+        ['app.utils', 'app', 'os.path']
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    package = module.split('.') if is_package else module.split('.')[:-1]
+    names: dict[str, None] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(dict.fromkeys(alias.name for alias in node.names))
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package[:len(package) - node.level + 1] if node.level <= len(package) + 1 else []
+                base_name = '.'.join(base + ([node.module] if node.module else []))
+            else:
+                base_name = node.module or ""
+            for alias in node.names:
+                if alias.name != '*':
+                    names[f"{base_name}.{alias.name}" if base_name else alias.name] = None
+            if base_name:
+                names[base_name] = None
+    return list(names)
+
+
+def _parse_file(path: str, module: str, is_package: bool) -> list[str]:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as handle:
+            return parse_imports(handle.read(), module, is_package)
+    except OSError:
+        return []
+
+
+def _parse_record(record: FileRecord, module: str) -> list[str]:
+    """Parse the imports of a file read from its content source."""
+    try:
+        with open_record(record) as handle:
+            text = handle.read().decode('utf-8', errors='replace')
+    except OSError:
+        return []
+    return parse_imports(text, module, record.name == '__init__.py')
+
+
+def _parse_batch(batch: list[tuple[str, str, bool]]) -> list[list[str]]:
+    """Parse the imports of a batch of files in a worker process."""
+    return [_parse_file(path, module, is_package) for path, module, is_package in batch]
+
+
+class ImportGraphCache:
+    """Parsed imports of every Python file, persisted between exports."""
+
+    def __init__(self, path: str | None = None, entries: dict[str, GraphEntry] | None = None):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Location of the JSON sidecar; None keeps it in memory.
+            entries: Previously stored entries, keyed by relative path.
+        """
+        self.path = path
+        self._previous = entries or {}
+        self._current: dict[str, GraphEntry] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: str) -> ImportGraphCache:
+        """
+        Load a graph sidecar; missing or incompatible files yield an empty cache.
+
+        Args:
+            path: Location of the JSON sidecar.
+
+        Returns:
+            ImportGraphCache: The loaded (possibly empty) cache.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                data = json.load(handle)
+            if data.get("version") != GRAPH_VERSION:
+                return cls(path)
+            entries = {
+                relative_path: GraphEntry(**entry)
+                for relative_path, entry in data.get("files", {}).items()
+            }
+        except (OSError, ValueError, TypeError, AttributeError):
+            return cls(path)
+        return cls(path, entries)
+
+    def lookup(self, record: FileRecord) -> list[str] | None:
+        """Return the cached imports of a file if its stat data is unchanged."""
+        entry = self._previous.get(record.relative_path)
+        if entry is None or entry.mtime_ns != record.mtime_ns or entry.size != record.size:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._current[record.relative_path] = entry
+        return entry.imports
+
+    def store(self, record: FileRecord, imports: list[str]) -> None:
+        """Record the imports parsed from a file."""
+        self._current[record.relative_path] = GraphEntry(record.mtime_ns, record.size, imports)
+
+    def save(self) -> None:
+        """Atomically write the entries of the current run to disk."""
+        if self.path is None:
+            return
+        payload = {
+            "version": GRAPH_VERSION,
+            "files": {path: asdict(entry) for path, entry in self._current.items()},
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".pocket-graph-", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(payload, handle, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def resolve_imports(modules: dict[str, str], imports: dict[str, list[str]]) -> dict[str, set[str]]:
+    """
+    Resolve imported names to files of the project.
+
+    A name matches a module whose dotted name equals it or ends with it
+    (``pkg.util`` matches ``src/pkg/util.py``); the shortest match wins.
+    Top-level standard library names are never matched, so a local
+    ``json.py`` does not attract every ``import json``.
+
+    Args:
+        modules: Dotted name of each Python file, by relative path.
+        imports: Imported names of each Python file, by relative path.
+
+    Returns:
+        dict[str, set[str]]: Relative paths imported by each file.
+    """
+    by_suffix: dict[str, str] = {}
+    for relative_path, name in sorted(modules.items(), key=lambda item: item[1].count('.')):
+        parts = name.split('.')
+        for start in range(len(parts)):
+            by_suffix.setdefault('.'.join(parts[start:]), relative_path)
+
+    stdlib = getattr(sys, "stdlib_module_names", frozenset())
+    graph: dict[str, set[str]] = {}
+    for relative_path, names in imports.items():
+        targets = set()
+        for name in names:
+            if name.split('.')[0] in stdlib:
+                continue
+            target = by_suffix.get(name)
+            if target is not None and target != relative_path:
+                targets.add(target)
+        graph[relative_path] = targets
+    return graph
+
+
+def build_import_graph(
+    index: ProjectIndex,
+    cache: ImportGraphCache | None = None,
+    jobs: int | None = None
+) -> dict[str, set[str]]:
+    """
+    Build the import graph of the Python files of a project.
+
+    Args:
+        index: The scanned project.
+        cache: Imports parsed by previous exports; updated with this run's.
+        jobs: Number of worker processes; defaults to one per CPU. Fewer
+              than ``POOL_MIN_FILES`` files to parse are parsed inline.
+
+    Returns:
+        dict[str, set[str]]: Relative paths imported by each Python file.
+    """
+    cache = cache if cache is not None else ImportGraphCache()
+    modules: dict[str, str] = {}
+    imports: dict[str, list[str]] = {}
+    stale: list[FileRecord] = []
+    for record in index.iter_files():
+        name = module_name(record.relative_path)
+        if name is None:
+            continue
+        modules[record.relative_path] = name
+        cached = cache.lookup(record)
+        if cached is None:
+            stale.append(record)
+        else:
+            imports[record.relative_path] = cached
+
+    # Files of a git revision or an archive are only readable in this process
+    items = [
+        (record.path, modules[record.relative_path], record.name == '__init__.py')
+        for record in stale
+        if record.source is None
+    ]
+    batches = [items[i:i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE)]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(items) < POOL_MIN_FILES:
+        results = map(_parse_batch, batches)
+        parsed = [names for batch in results for names in batch]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(batches))) as pool:
+            parsed = [names for batch in pool.map(_parse_batch, batches) for names in batch]
+
+    parsed_files = iter(parsed)
+    for record in stale:
+        if record.source is None:
+            names = next(parsed_files)
+        else:
+            names = _parse_record(record, modules[record.relative_path])
+        imports[record.relative_path] = names
+        cache.store(record, names)
+
+    return resolve_imports(modules, imports)
+
+
+def rank_files(index: ProjectIndex, graph: dict[str, set[str]]) -> list[FileRecord]:
+    """
+    Order the files of a project from most to least central.
+
+    Python files are scored with PageRank over the import graph, so a
+    module imported by many (or by central) modules scores high. Other
+    files get the score of a module nobody imports. Ties keep export order.
+
+    Args:
+        index: The scanned project.
+        graph: Import graph from ``build_import_graph``.
+
+    Returns:
+        list[FileRecord]: Every file of the index, best ranked first.
+    """
+    records = list(index.iter_files())
+    nodes = list(graph)
+    count = len(nodes)
+    scores: dict[str, float] = {}
+    if count:
+        base = (1 - DAMPING) / count
+        scores = dict.fromkeys(nodes, 1 / count)
+        for _ in range(MAX_ITERATIONS):
+            dangling = sum(scores[node] for node in nodes if not graph[node])
+            updated = dict.fromkeys(nodes, base + DAMPING * dangling / count)
+            for node in nodes:
+                targets = graph[node]
+                if targets:
+                    share = DAMPING * scores[node] / len(targets)
+                    for target in targets:
+                        updated[target] += share
+            delta = sum(abs(updated[node] - scores[node]) for node in nodes)
+            scores = updated
+            if delta < TOLERANCE:
+                break
+
+    floor = min(scores.values()) if scores else 0.0
+    order = {record.relative_path: position for position, record in enumerate(records)}
+    return sorted(
+        records,
+        key=lambda record: (-scores.get(record.relative_path, floor), order[record.relative_path])
+    )
+
+
+def select_within_budget(
+    ranked: Iterable[FileRecord],
+    budget: int,
+    cost: Callable[[FileRecord], int]
+) -> tuple[list[FileRecord], list[FileRecord]]:
+    """
+    Greedily keep the best ranked files that fit a budget.
+
+    A file that does not fit is skipped and smaller, lower ranked files may
+    still be kept after it.
+
+    Args:
+        ranked: Files, best first.
+        budget: Bytes available for file blocks.
+        cost: Upper bound of the bytes a file's block takes.
+
+    Returns:
+        tuple[list[FileRecord], list[FileRecord]]: Kept and omitted files,
+        in ranking order.
+    """
+    kept: list[FileRecord] = []
+    omitted: list[FileRecord] = []
+    used = 0
+    for record in ranked:
+        size = cost(record)
+        if used + size <= budget:
+            kept.append(record)
+            used += size
+        else:
+            omitted.append(record)
+    return kept, omitted
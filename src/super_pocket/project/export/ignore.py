@@ -0,0 +1,303 @@
+"""
+Gitignore-style exclusion matching.
+
+Patterns from ``-e/--exclude``, from every ``.gitignore`` and from every
+``.pocketignore`` found during the scan are compiled once into regular
+expressions. The scanner asks the matcher about each entry before entering
+it, so ignored directories are pruned and their contents never listed.
+
+Supported syntax follows gitignore: ``#`` comments, ``!`` negation, a
+trailing ``/`` for directory-only rules, a leading or inner ``/`` to anchor a
+rule to the directory holding it, and the ``*``, ``?``, ``[...]`` and ``**``
+wildcards. A pattern without a slash, such as ``node_modules``, matches that
+name at any depth.
+"""
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# Ignore files read in every scanned directory, lowest priority first
+IGNORE_FILES = (".gitignore", ".pocketignore")
+
+
+@dataclass(frozen=True, slots=True)
+class IgnoreRule:
+    """A single compiled ignore pattern."""
+    pattern: str
+    regex: re.Pattern[str]
+    negated: bool = False
+    dir_only: bool = False
+
+    def matches(self, path: str, is_dir: bool) -> bool:
+        """Tell whether the rule applies to a '/'-separated relative path."""
+        if self.dir_only and not is_dir:
+            return False
+        return self.regex.match(path) is not None
+
+
+def _translate(pattern: str) -> str:
+    """Translate the body of a gitignore pattern into a regular expression."""
+    parts = []
+    i, length = 0, len(pattern)
+    while i < length:
+        char = pattern[i]
+        if char == '*':
+            if pattern.startswith('**', i):
+                at_start = i == 0 or pattern[i - 1] == '/'
+                at_end = i + 2 == length
+                if at_start and at_end:
+                    parts.append('.*')
+                    i += 2
+                    continue
+                if at_start and pattern.startswith('/', i + 2):
+                    parts.append('(?:.*/)?')
+                    i += 3
+                    continue
+            parts.append('[^/]*')
+            while i < length and pattern[i] == '*':
+                i += 1
+            continue
+        if char == '?':
+            parts.append('[^/]')
+        elif char == '[':
+            j = i + 1
+            if j < length and pattern[j] in '!^':
+                j += 1
+            if j < length and pattern[j] == ']':
+                j += 1
+            end = pattern.find(']', j)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = end
+        elif char == '\\' and i + 1 < length:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return ''.join(parts)
+
+
+def compile_rule(line: str) -> IgnoreRule | None:
+    """
+    Compile one line of an ignore file.
+
+    Args:
+        line: Raw pattern line.
+
+    Returns:
+        IgnoreRule | None: The compiled rule, or None for blank lines and comments.
+
+    Example:
+        >>> rule = compile_rule('build/**/*.map')
+        >>> rule.matches('build/js/app.map', is_dir=False)
+        True
+    """
+    pattern = line.rstrip('\n\r')
+    if not pattern.endswith('\\ '):
+        pattern = pattern.rstrip(' ')
+    if not pattern or pattern.startswith('#'):
+        return None
+
+    negated = pattern.startswith('!')
+    if negated or pattern.startswith('\\!') or pattern.startswith('\\#'):
+        pattern = pattern[1:]
+
+    dir_only = pattern.endswith('/')
+    body = pattern.rstrip('/')
+    if not body:
+        return None
+
+    anchored = '/' in body
+    body = body.lstrip('/')
+    prefix = '' if anchored else '(?:.*/)?'
+    regex = re.compile(f"^{prefix}{_translate(body)}$", re.DOTALL)
+
+    return IgnoreRule(pattern=line.strip(), regex=regex, negated=negated, dir_only=dir_only)
+
+
+@dataclass(frozen=True, slots=True)
+class RuleSet:
+    """
+    Rules that apply below one directory of the project.
+
+    When no rule is negated, the order of the rules does not matter and
+    they are also folded into one regular expression per entry kind, so a
+    path is tested with a single match call.
+    """
+    base: str
+    rules: tuple[IgnoreRule, ...]
+    file_regex: re.Pattern[str] | None = None
+    dir_regex: re.Pattern[str] | None = None
+
+    def decide(self, path: str, is_dir: bool) -> bool | None:
+        """
+        Evaluate the rules against a project-relative path.
+
+        Returns:
+            bool | None: True if ignored, False if re-included by a negation,
+                         None if no rule matches or the path is outside ``base``.
+        """
+        if self.base:
+            if not path.startswith(self.base + '/'):
+                return None
+            path = path[len(self.base) + 1:]
+
+        combined = self.dir_regex if is_dir else self.file_regex
+        if combined is not None:
+            return True if combined.match(path) else None
+
+        for rule in reversed(self.rules):
+            if rule.matches(path, is_dir):
+                return not rule.negated
+        return None
+
+
+def compile_rules(patterns: Iterable[str], base: str = "") -> RuleSet:
+    """
+    Compile a sequence of patterns into a RuleSet.
+
+    Args:
+        patterns: Pattern lines, in file order.
+        base: '/'-separated directory the patterns are relative to.
+
+    Returns:
+        RuleSet: The compiled rules.
+    """
+    rules = tuple(rule for rule in map(compile_rule, patterns) if rule is not None)
+    if not rules or any(rule.negated for rule in rules):
+        return RuleSet(base=base, rules=rules)
+
+    def combine(selected: list[IgnoreRule]) -> re.Pattern[str]:
+        # Each rule regex is '^...$'; strip the anchors and alternate the bodies
+        if not selected:
+            return re.compile(r'(?!)')
+        bodies = '|'.join(f"(?:{rule.regex.pattern[1:-1]})" for rule in selected)
+        return re.compile(f"^(?:{bodies})$", re.DOTALL)
+
+    return RuleSet(
+        base=base,
+        rules=rules,
+        file_regex=combine([rule for rule in rules if not rule.dir_only]),
+        dir_regex=combine(list(rules)),
+    )
+
+
+class IgnoreMatcher:
+    """
+    Decides whether a project path is excluded.
+
+    Rules loaded from ignore files are evaluated like git does: deeper files
+    override shallower ones and later lines override earlier ones. Override
+    patterns (from the command line) take precedence over every file.
+    """
+
+    def __init__(self, overrides: RuleSet | None = None, rule_sets: tuple[RuleSet, ...] = ()):
+        """
+        Initialize the matcher.
+
+        Args:
+            overrides: Patterns evaluated before any ignore file.
+            rule_sets: Rules read from ignore files, shallowest first.
+        """
+        self.overrides = overrides or RuleSet(base="", rules=())
+        self.rule_sets = rule_sets
+
+    @classmethod
+    def from_patterns(cls, patterns: Iterable[str]) -> IgnoreMatcher:
+        """
+        Build a matcher from command-line style patterns.
+
+        Args:
+            patterns: Patterns relative to the project root.
+
+        Returns:
+            IgnoreMatcher: A matcher with those patterns as overrides.
+        """
+        return cls(overrides=compile_rules(pattern.strip() for pattern in patterns))
+
+    def with_ignore_files(
+        self,
+        directory: str,
+        relative_dir: str,
+        present: Iterable[str] | None = None
+    ) -> IgnoreMatcher:
+        """
+        Extend the matcher with the ignore files found in a directory.
+
+        Args:
+            directory: Absolute path of the directory being scanned.
+            relative_dir: Its path relative to the project root.
+            present: Names of the ignore files the directory holds, known
+                     from its listing; only these are opened. By default
+                     each of ``IGNORE_FILES`` is tried.
+
+        Returns:
+            IgnoreMatcher: ``self`` if the directory has no ignore files,
+                           otherwise a new matcher including their rules.
+        """
+        present = IGNORE_FILES if present is None else frozenset(present)
+        files = []
+        for filename in IGNORE_FILES:
+            if filename not in present:
+                continue
+            try:
+                with open(os.path.join(directory, filename), 'r', encoding='utf-8', errors='replace') as handle:
+                    files.append(handle.readlines())
+            except OSError:
+                continue
+        return self.with_ignore_lines(files, relative_dir)
+
+    def with_ignore_lines(self, files: Iterable[Iterable[str]], relative_dir: str) -> IgnoreMatcher:
+        """
+        Extend the matcher with the lines of ignore files read elsewhere,
+        such as from a git revision or an archive.
+
+        Args:
+            files: Lines of each ignore file of a directory, lowest priority
+                   first.
+            relative_dir: Path of the directory relative to the project root.
+
+        Returns:
+            IgnoreMatcher: ``self`` if the files hold no rules, otherwise a
+                           new matcher including them.
+        """
+        base = relative_dir.replace(os.sep, '/')
+        added = [rule_set for rule_set in (compile_rules(lines, base) for lines in files) if rule_set.rules]
+        if not added:
+            return self
+        return IgnoreMatcher(self.overrides, self.rule_sets + tuple(added))
+
+    def is_ignored(self, relative_path: str, is_dir: bool = False) -> bool:
+        """
+        Tell whether a path is excluded by the rules.
+
+        Only the path itself is tested; the scanner never reaches the
+        contents of an ignored directory, which is how they are excluded.
+
+        Args:
+            relative_path: Path relative to the project root.
+            is_dir: Whether the path is a directory.
+
+        Returns:
+            bool: True if the path must be left out.
+        """
+        path = relative_path.replace(os.sep, '/')
+
+        decision = self.overrides.decide(path, is_dir)
+        if decision is not None:
+            return decision
+
+        for rule_set in reversed(self.rule_sets):
+            decision = rule_set.decide(path, is_dir)
+            if decision is not None:
+                return decision
+        return False
@@ -0,0 +1,386 @@
+"""
+Language-aware minification of exported files.
+
+Comments, trailing whitespace and blank lines are removed from the
+languages the exporter knows how to lex, keyed on the identifier returned by
+``get_language_identifier``: Python is split with ``tokenize``; JavaScript,
+TypeScript, CSS, SCSS and SQL with small lexers that only need to tell
+code, comments and literals apart.
+
+String literals are never modified: each one is swapped for a placeholder
+while whitespace is collapsed and restored afterwards. When a lexer is
+unsure (an unterminated string, a backslash before a SQL quote, a '/' after
+')' that may open a regular expression, a file that does not tokenize), it
+keeps the text rather than risk touching a literal. Indentation is kept, so the
+output stays readable and Python stays valid.
+"""
+from __future__ import annotations
+
+import io
+import re
+import tokenize
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+
+from .reader import FileContent
+
+CODE, LITERAL, COMMENT = range(3)
+
+_TRAILING_WHITESPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+_BLANK_LINES = re.compile(r"\n{2,}")
+_PLACEHOLDER = re.compile(r"\x00(\d+)\x00")
+_WORD = re.compile(r"[\w$]+")
+_DOLLAR_TAG = re.compile(r"\$[A-Za-z_]*\$")
+_CODING_COOKIE = re.compile(r"^[ \t\f]*#.*?coding[:=]")
+
+# Characters and keywords after which a '/' starts a regular expression
+_REGEX_PREFIX = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = frozenset({
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void",
+    "throw", "case", "do", "else", "yield", "await",
+})
+
+
+@dataclass(frozen=True)
+class Syntax:
+    """What a C-like lexer must recognize to find comments and literals."""
+    line_comments: tuple[str, ...] = ()
+    block_comments: bool = True
+    quotes: str = "'\""
+    # Backslash escapes inside quotes (SQL doubles the quote instead)
+    escapes: bool = True
+    # JavaScript template literals with ${...} substitutions
+    templates: bool = False
+    # JavaScript regular expression literals
+    regexes: bool = False
+    # PostgreSQL $tag$...$tag$ strings
+    dollar_quotes: bool = False
+    # Unquoted CSS url(...) arguments, which may contain '//'
+    urls: bool = False
+
+
+JAVASCRIPT = Syntax(line_comments=("//",), quotes="'\"", templates=True, regexes=True)
+CSS = Syntax()
+SCSS = Syntax(line_comments=("//",), urls=True)
+SQL = Syntax(line_comments=("--",), quotes="'\"`", escapes=False, dollar_quotes=True)
+
+
+def _end_of_string(text: str, start: int, syntax: Syntax) -> int | None:
+    """
+    Return the end of the quoted literal opened at ``start``, or None when
+    it is ambiguous: without escapes, a backslash before the quote may
+    still escape it (MySQL) or not (standard SQL).
+    """
+    quote = text[start]
+    index = start + 1
+    while index < len(text):
+        char = text[index]
+        if char == "\\":
+            if syntax.escapes:
+                index += 2
+                continue
+            if text.startswith(quote, index + 1):
+                return None
+        if char == quote:
+            if not syntax.escapes and text.startswith(quote, index + 1):
+                index += 2
+                continue
+            return index + 1
+        index += 1
+    return len(text)
+
+
+def _end_of_template(text: str, index: int) -> tuple[int, bool]:
+    """
+    Return where a template literal part ends, and whether it ends by
+    opening a ``${`` substitution rather than with the closing backtick.
+    """
+    while index < len(text):
+        char = text[index]
+        if char == "\\":
+            index += 2
+        elif char == "`":
+            return index + 1, False
+        elif text.startswith("${", index):
+            return index + 2, True
+        else:
+            index += 1
+    return len(text), False
+
+
+def _end_of_regex(text: str, start: int) -> int | None:
+    """Return the end of the regex literal at ``start``, or None if it is not one."""
+    index = start + 1
+    in_class = False
+    while index < len(text):
+        char = text[index]
+        if char == "\n":
+            return None
+        if char == "\\":
+            index += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "/":
+            return index + 1
+        index += 1
+    return None
+
+
+def _odd_quotes(line: str, quotes: str) -> bool:
+    """Tell whether any quote character occurs an odd number of times in ``line``."""
+    return any(line.count(quote) % 2 for quote in quotes)
+
+
+def lex(text: str, syntax: Syntax) -> list[tuple[int, str]] | None:
+    """
+    Split C-like source code into code, literal and comment pieces.
+
+    Args:
+        text: Source code.
+        syntax: What the language's comments and literals look like.
+
+    Returns:
+        list[tuple[int, str]] | None: ``(kind, text)`` pieces covering
+        ``text`` exactly, ``kind`` being ``CODE``, ``LITERAL`` or
+        ``COMMENT``; ``/*! ... */`` comments (licenses) are literals. None
+        when a literal cannot be delimited safely.
+    """
+    pieces: list[tuple[int, str]] = []
+    substitutions: list[int] = []
+    regex_allowed = True
+    after_paren = False
+    start = index = 0
+
+    while index < len(text):
+        char = text[index]
+        kind = end = None
+
+        if syntax.block_comments and text.startswith("/*", index):
+            close = text.find("*/", index + 2)
+            end = len(text) if close < 0 else close + 2
+            kind = LITERAL if text.startswith("/*!", index) else COMMENT
+        elif any(text.startswith(marker, index) for marker in syntax.line_comments):
+            newline = text.find("\n", index)
+            end = len(text) if newline < 0 else newline
+            kind = COMMENT
+        elif char in syntax.quotes:
+            end, kind = _end_of_string(text, index, syntax), LITERAL
+            if end is None:
+                return None
+        elif syntax.templates and (char == "`" or (char == "}" and substitutions and substitutions[-1] == 0)):
+            if char == "}":
+                substitutions.pop()
+            end, opened = _end_of_template(text, index + 1)
+            kind = LITERAL
+            if opened:
+                substitutions.append(0)
+        elif syntax.regexes and char == "/" and regex_allowed:
+            end = _end_of_regex(text, index)
+            kind = LITERAL if end is not None else None
+        elif syntax.regexes and char == "/" and after_paren:
+            # 'if (x) /re/' and '(a) / b' look alike: give up if taking a
+            # regex for a division could leave a quote unpaired
+            newline = text.find("\n", index)
+            if _odd_quotes(text[index:len(text) if newline < 0 else newline], syntax.quotes + "`"):
+                return None
+        elif syntax.dollar_quotes and char == "$" and (tag := _DOLLAR_TAG.match(text, index)):
+            close = text.find(tag.group(), tag.end())
+            end = len(text) if close < 0 else close + len(tag.group())
+            kind = LITERAL
+        elif syntax.urls and text[index:index + 4].lower() == "url(":
+            argument = text[index + 4:index + 5]
+            if argument not in ("'", '"'):
+                close = text.find(")", index)
+                end = len(text) if close < 0 else close + 1
+                kind = LITERAL
+
+        if kind is None:
+            word = _WORD.match(text, index)
+            if word:
+                regex_allowed = word.group() in _REGEX_KEYWORDS
+                after_paren = False
+                index = word.end()
+                continue
+            if substitutions and char in "{}":
+                substitutions[-1] += 1 if char == "{" else -1
+            if not char.isspace():
+                regex_allowed = char in _REGEX_PREFIX
+                after_paren = char == ")"
+            index += 1
+            continue
+
+        if start < index:
+            pieces.append((CODE, text[start:index]))
+        pieces.append((kind, text[index:end]))
+        if kind == LITERAL:
+            regex_allowed = after_paren = False
+        start = index = end
+
+    if start < len(text):
+        pieces.append((CODE, text[start:]))
+    return pieces
+
+
+def lex_python(text: str) -> list[tuple[int, str]] | None:
+    """
+    Split Python source code into code, literal and comment pieces.
+
+    A shebang and an encoding declaration are kept as literals.
+
+    Args:
+        text: Python source code with ``\\n`` line endings.
+
+    Returns:
+        list[tuple[int, str]] | None: Pieces covering ``text`` exactly, or
+        None if it does not tokenize.
+    """
+    line_starts = [0]
+    for line in text.split("\n"):
+        line_starts.append(line_starts[-1] + len(line) + 1)
+
+    def offset(position: tuple[int, int]) -> int:
+        return line_starts[position[0] - 1] + position[1]
+
+    fstring_start = getattr(tokenize, "FSTRING_START", None)
+    fstring_end = getattr(tokenize, "FSTRING_END", None)
+    pieces: list[tuple[int, str]] = []
+    cursor = 0
+    fstring_depth = 0
+    literal_start = 0
+
+    def add(kind: int, start: int, end: int) -> None:
+        nonlocal cursor
+        if cursor < start:
+            pieces.append((CODE, text[cursor:start]))
+        pieces.append((kind, text[start:end]))
+        cursor = end
+
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(text).readline):
+            if fstring_start is not None and token.type == fstring_start:
+                if fstring_depth == 0:
+                    literal_start = offset(token.start)
+                fstring_depth += 1
+            elif fstring_depth:
+                if token.type == fstring_end:
+                    fstring_depth -= 1
+                    if fstring_depth == 0:
+                        add(LITERAL, literal_start, offset(token.end))
+            elif token.type == tokenize.STRING:
+                add(LITERAL, offset(token.start), offset(token.end))
+            elif token.type == tokenize.COMMENT:
+                row = token.start[0]
+                keep = (row == 1 and token.string.startswith("#!")) or (
+                    row <= 2 and _CODING_COOKIE.match(token.line)
+                )
+                add(LITERAL if keep else COMMENT, offset(token.start), offset(token.end))
+    except (tokenize.TokenError, SyntaxError):
+        return None
+
+    if cursor < len(text):
+        pieces.append((CODE, text[cursor:]))
+    return pieces
+
+
+def render(pieces: list[tuple[int, str]]) -> str:
+    """
+    Reassemble lexed pieces without comments, trailing whitespace and
+    blank lines, leaving every literal as it was.
+
+    Args:
+        pieces: Output of ``lex`` or ``lex_python``.
+
+    Returns:
+        str: The minified text.
+    """
+    literals: list[str] = []
+    parts: list[str] = []
+    for kind, chunk in pieces:
+        if kind == CODE:
+            parts.append(chunk)
+        elif kind == LITERAL:
+            parts.append(f"\x00{len(literals)}\x00")
+            literals.append(chunk)
+        elif chunk.startswith("/*"):
+            # A block comment still separates tokens, and still ends a line
+            parts.append("\n" if "\n" in chunk else " ")
+
+    text = _TRAILING_WHITESPACE.sub("", "".join(parts))
+    text = _BLANK_LINES.sub("\n", text).lstrip("\n")
+    return _PLACEHOLDER.sub(lambda match: literals[int(match.group(1))], text)
+
+
+def _minifier(syntax: Syntax) -> Callable[[str], str | None]:
+    def minify_text(text: str) -> str | None:
+        pieces = lex(text, syntax)
+        return None if pieces is None else render(pieces)
+    return minify_text
+
+
+def minify_python(text: str) -> str | None:
+    """Minify Python source code, or return None if it does not tokenize."""
+    pieces = lex_python(text)
+    return None if pieces is None else render(pieces)
+
+
+# Minifiers by language identifier (see ``get_language_identifier``)
+MINIFIERS: dict[str, Callable[[str], str | None]] = {
+    "python": minify_python,
+    "javascript": _minifier(JAVASCRIPT),
+    "typescript": _minifier(JAVASCRIPT),
+    "css": _minifier(CSS),
+    "scss": _minifier(SCSS),
+    "sql": _minifier(SQL),
+}
+
+
+def minify(text: str, language: str) -> str | None:
+    """
+    Minify source code of a supported language.
+
+    Args:
+        text: Source code with ``\\n`` line endings.
+        language: Language identifier, as returned by ``get_language_identifier``.
+
+    Returns:
+        str | None: The minified text, or None if the language is not
+        supported or the text could not be lexed safely.
+
+    Example:
+        >>> print(minify("x = 1  # one\\n\\n\\ns = '#  kept  '\\n", "python"), end="")
+        x = 1
+        s = '#  kept  '
+    """
+    minifier = MINIFIERS.get(language)
+    if minifier is None or "\x00" in text:
+        return None
+    return minifier(text)
+
+
+def iter_minified(
+    contents: Iterable[FileContent],
+    language_of: Callable[[str], str]
+) -> Iterator[FileContent]:
+    """
+    Minify the text of read files whose language is supported.
+
+    Truncated excerpts and streamed files are left as they are.
+
+    Args:
+        contents: Read results, in export order.
+        language_of: Maps a file name to its language identifier.
+
+    Yields:
+        FileContent: The same results, with ``text`` minified and
+        ``minified`` set to the number of bytes saved.
+    """
+    for content in contents:
+        if content.text is not None and not content.omitted:
+            text = minify(content.text, language_of(content.record.name))
+            if text is not None and text != content.text:
+                content.minified = len(content.text.encode('utf-8')) - len(text.encode('utf-8'))
+                content.text = text
+        yield content
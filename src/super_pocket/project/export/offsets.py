@@ -0,0 +1,193 @@
+"""
+Byte-offset sidecar index for random access into an exported document.
+
+While the Markdown export is written, the position of every file's content
+inside the document is appended to a sidecar file, one compact JSON array
+per line::
+
+    {"version": 1, "document": "project-1-file.md"}
+    ["src/main.py", 1234, 567, "<sha256 of the 567 content bytes>"]
+
+A retrieval service can then load the index once and slice any file out of
+the document with ``read_file``, which maps the document with ``mmap``
+instead of reading or parsing it.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+from dataclasses import dataclass
+
+INDEX_VERSION = 1
+
+
+def default_index_path(output_file: str) -> str:
+    """
+    Return the default location of the sidecar index of a document.
+
+    Args:
+        output_file: Path of the exported document.
+
+    Returns:
+        str: ``<output_file>.index.jsonl``.
+    """
+    return f"{output_file}.index.jsonl"
+
+
+class TrackingWriter:
+    """
+    Text stream wrapper that knows its position in UTF-8 bytes.
+
+    The position is counted from what is written rather than asked from the
+    underlying stream, so it is exact for any text stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.position = 0
+
+    def write(self, text: str) -> int:
+        self.stream.write(text)
+        self.position += len(text.encode('utf-8'))
+        return len(text)
+
+    def tell(self) -> int:
+        return self.position
+
+    def seekable(self) -> bool:
+        return self.stream.seekable()
+
+    def seek(self, position: int) -> int:
+        self.stream.seek(position)
+        self.position = position
+        return position
+
+    def truncate(self) -> int:
+        return self.stream.truncate()
+
+
+@dataclass(frozen=True, slots=True)
+class IndexEntry:
+    """Where one file's content lies in the document."""
+    offset: int
+    length: int
+    sha256: str
+
+
+class OffsetIndexWriter:
+    """Appends index entries to the sidecar as the document is produced."""
+
+    def __init__(self, path: str, document: str):
+        """
+        Create the sidecar and write its header line.
+
+        Args:
+            path: Location of the sidecar index.
+            document: Path of the indexed document.
+        """
+        self.path = path
+        self.entries: dict[str, IndexEntry] = {}
+        self.handle = open(path, 'w', encoding='utf-8')
+        header = {"version": INDEX_VERSION, "document": os.path.basename(document)}
+        self.handle.write(json.dumps(header) + "\n")
+
+    def add(self, relative_path: str, offset: int, content: bytes | None = None, length: int | None = None, sha256: str | None = None) -> None:
+        """
+        Record the content range of one file.
+
+        Args:
+            relative_path: Path of the file in the project.
+            offset: Byte offset of its content in the document.
+            content: The content bytes, to measure and hash them; or pass
+                     ``length`` and ``sha256`` when they were computed while
+                     streaming.
+        """
+        if content is not None:
+            length = len(content)
+            sha256 = hashlib.sha256(content).hexdigest()
+        entry = IndexEntry(offset, length, sha256)
+        self._append(relative_path.replace(os.sep, '/'), entry)
+
+    def alias(self, relative_path: str, original: str) -> None:
+        """Point a duplicate file at the content of the file it repeats."""
+        entry = self.entries.get(original.replace(os.sep, '/'))
+        if entry is not None:
+            self._append(relative_path.replace(os.sep, '/'), entry)
+
+    def _append(self, path: str, entry: IndexEntry) -> None:
+        self.entries[path] = entry
+        self.handle.write(json.dumps([path, entry.offset, entry.length, entry.sha256], separators=(',', ':')) + "\n")
+
+    def close(self) -> None:
+        """Flush and close the sidecar."""
+        self.handle.close()
+
+    def __enter__(self) -> OffsetIndexWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+
+def load_index(path: str) -> dict[str, IndexEntry]:
+    """
+    Load a sidecar index.
+
+    Args:
+        path: Location of the sidecar index.
+
+    Returns:
+        dict[str, IndexEntry]: Entries by '/'-separated relative path.
+
+    Raises:
+        ValueError: If the file is not a supported index.
+    """
+    with open(path, 'r', encoding='utf-8') as handle:
+        header = json.loads(handle.readline() or "null")
+        if not isinstance(header, dict) or header.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported offset index: {path}")
+        entries = {}
+        for line in handle:
+            relative_path, offset, length, sha256 = json.loads(line)
+            entries[relative_path] = IndexEntry(offset, length, sha256)
+    return entries
+
+
+def read_file(
+    document: str,
+    relative_path: str,
+    index: dict[str, IndexEntry] | None = None,
+    verify: bool = False
+) -> str:
+    """
+    Slice one file's content out of an exported document.
+
+    Args:
+        document: Path of the exported Markdown document.
+        relative_path: Path of the file in the project ('/' or OS separators).
+        index: Entries from ``load_index``; loaded from the default sidecar
+               location when omitted.
+        verify: Check the slice against the hash stored in the index.
+
+    Returns:
+        str: The file's content as exported.
+
+    Raises:
+        KeyError: If the file is not in the index.
+        ValueError: If ``verify`` is set and the slice does not match.
+    """
+    if index is None:
+        index = load_index(default_index_path(document))
+    entry = index[relative_path.replace(os.sep, '/')]
+    if entry.length == 0:
+        return ""
+
+    with open(document, 'rb') as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = mapped[entry.offset:entry.offset + entry.length]
+
+    if verify and hashlib.sha256(data).hexdigest() != entry.sha256:
+        raise ValueError(f"Index entry for '{relative_path}' does not match {document}")
+    return data.decode('utf-8')
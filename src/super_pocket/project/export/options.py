@@ -0,0 +1,146 @@
+"""
+Export options.
+
+``ExportOptions`` gathers what an export selects from a project and how it
+renders each file, so the command-line exporter and the library API (see
+``super_pocket.project.stream``) share one description of an export.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .filters import FileFilter
+from .redact import REDACT_SIGNATURE
+from .scanner import FileRecord, ProjectIndex, index_listing, scan_project, scan_roots
+from .skeleton import SkeletonOptions
+from .truncate import TruncationLimits
+
+# Paths left out of an export unless other exclusions are given
+DEFAULT_EXCLUDE = (
+    "env", ".env", "venv", ".venv", ".gitignore", ".git", ".vscode", ".idea", ".cursor",
+    "lib", "bin", "site-packages", "node_modules", "__pycache__", ".DS_Store", ".python-version",
+)
+# Identifies the minification rules in cache signatures
+MINIFY_SIGNATURE = "minify-v1"
+
+
+@dataclass(frozen=True)
+class ExportOptions:
+    """
+    What an export selects from a project and how it renders each file.
+
+    Attributes:
+        exclude: Gitignore-style patterns of paths to leave out.
+        use_gitignore: Honor the project's ``.gitignore`` and
+                       ``.pocketignore`` files.
+        file_filter: Stat-only selection by extension, size and age.
+        jobs: Number of threads reading files in parallel.
+        dedup: Write each distinct content once; later copies become
+               references to the first one.
+        limits: Per-file caps beyond which a file is cut to its head and tail.
+        skeleton: Reduce Python files to their signatures.
+        minify: Remove comments, trailing whitespace and blank lines.
+        redact: Replace secrets (keys, tokens, private keys, secret-looking
+                assignments) with ``[REDACTED:<detector>]`` markers.
+        quiet: Do not print a warning for each skipped file; the counts are
+               still in the returned summary. Library exports are silent by
+               default; the command line turns warnings on.
+    """
+    exclude: tuple[str, ...] = DEFAULT_EXCLUDE
+    use_gitignore: bool = True
+    file_filter: FileFilter | None = None
+    jobs: int = 1
+    dedup: bool = False
+    limits: TruncationLimits = TruncationLimits()
+    skeleton: SkeletonOptions | None = None
+    minify: bool = False
+    redact: bool = False
+    quiet: bool = True
+
+    @property
+    def signature(self) -> str:
+        """Identify the options that change rendered blocks, for cache signatures."""
+        parts = []
+        if self.limits:
+            parts.append(self.limits.signature)
+        if self.skeleton is not None:
+            parts.append(self.skeleton.signature)
+        if self.minify:
+            parts.append(MINIFY_SIGNATURE)
+        if self.redact:
+            parts.append(REDACT_SIGNATURE)
+        return ";".join(parts)
+
+    def scan(self, root: str, ignore_paths: Iterable[str] = ()) -> ProjectIndex:
+        """
+        Scan a project with these options' selection rules.
+
+        Args:
+            root: Root directory of the project.
+            ignore_paths: Specific paths to leave out, such as the export itself.
+
+        Returns:
+            ProjectIndex: The selected files.
+        """
+        return scan_project(
+            root,
+            self.exclude,
+            ignore_paths=ignore_paths,
+            use_ignore_files=self.use_gitignore,
+            file_filter=self.file_filter
+        )
+
+    def scan_listing(
+        self,
+        root: str,
+        records: Iterable[FileRecord],
+        directories: Iterable[str] = (),
+        ignore_paths: Iterable[str] = (),
+        name: str | None = None
+    ) -> ProjectIndex:
+        """
+        Index a listed project (a git revision, an archive) with these
+        options' selection rules.
+
+        Args:
+            root: Path the project is shown under.
+            records: Every file of the project.
+            directories: Directories to show even when they hold no file.
+            ignore_paths: Specific paths to leave out, such as the export itself.
+            name: Name of the project; defaults to the last part of ``root``.
+
+        Returns:
+            ProjectIndex: The selected files.
+        """
+        return index_listing(
+            root,
+            records,
+            directories,
+            self.exclude,
+            ignore_paths=ignore_paths,
+            use_ignore_files=self.use_gitignore,
+            file_filter=self.file_filter,
+            name=name
+        )
+
+    def scan_roots(self, parent: str, names: Iterable[str], ignore_paths: Iterable[str] = ()) -> list[ProjectIndex]:
+        """
+        Scan sibling projects in one pass of their parent with these options' selection rules.
+
+        Args:
+            parent: Directory holding the projects.
+            names: Names of the project directories within ``parent``.
+            ignore_paths: Specific paths to leave out, such as the exports.
+
+        Returns:
+            list[ProjectIndex]: One index per name, in the same order.
+        """
+        return scan_roots(
+            parent,
+            names,
+            self.exclude,
+            ignore_paths=ignore_paths,
+            use_ignore_files=self.use_gitignore,
+            file_filter=self.file_filter
+        )
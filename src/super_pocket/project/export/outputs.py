@@ -0,0 +1,172 @@
+"""
+Output destinations for the project exporter.
+
+An export can be written to a regular file, streamed to standard output
+(``-``), or compressed on the fly when the output name ends in ``.gz``,
+``.xz`` or ``.zip``. Compression goes through a streaming compressor, so the
+uncompressed document never touches the disk. Library callers can also pass
+any text or binary file-like object, such as an HTTP response body.
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import lzma
+import os
+import sys
+import zipfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import IO, TextIO
+
+# Output name meaning "write to standard output"
+STDOUT = "-"
+
+COMPRESSED_EXTENSIONS = (".gz", ".xz", ".zip")
+
+
+class _StreamingGzipFile(gzip.GzipFile):
+    """GzipFile that admits it cannot rewind while writing."""
+
+    def seekable(self) -> bool:
+        return False
+
+
+class _EncodingWriter:
+    """Text view of a binary file-like object that only needs ``write``."""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def write(self, text: str) -> int:
+        self.raw.write(text.encode('utf-8'))
+        return len(text)
+
+    def seekable(self) -> bool:
+        return False
+
+    def flush(self) -> None:
+        flush = getattr(self.raw, "flush", None)
+        if flush is not None:
+            flush()
+
+
+def is_text_stream(stream) -> bool:
+    """
+    Tell whether a file-like object takes text rather than bytes.
+
+    Args:
+        stream: A writable file-like object.
+
+    Returns:
+        bool: True for text streams, False for binary ones.
+    """
+    if isinstance(stream, io.TextIOBase):
+        return True
+    if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+        return False
+    mode = getattr(stream, "mode", None)
+    if isinstance(mode, str):
+        return "b" not in mode
+    try:
+        stream.write("")
+    except TypeError:
+        return False
+    return True
+
+
+def is_stdout(path: str | None) -> bool:
+    """Tell whether an output name designates standard output."""
+    return path == STDOUT
+
+
+def compression_of(path: str) -> str | None:
+    """
+    Return the compression selected by an output file name.
+
+    Args:
+        path: Output path.
+
+    Returns:
+        str | None: 'gz', 'xz' or 'zip', or None for an uncompressed file.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    return ext[1:] if ext in COMPRESSED_EXTENSIONS else None
+
+
+def split_compression(path: str) -> tuple[str, str]:
+    """
+    Split a path into its name and its compression extension.
+
+    Args:
+        path: Output path, e.g. ``export.md.gz``.
+
+    Returns:
+        tuple[str, str]: e.g. ``('export.md', '.gz')``; the extension is
+        empty for an uncompressed file.
+    """
+    if compression_of(path) is None:
+        return path, ""
+    return os.path.splitext(path)
+
+
+def zip_member_name(path: str) -> str:
+    """
+    Return the name of the document stored inside a ``.zip`` output.
+
+    ``export.md.zip`` stores ``export.md``; ``export.zip`` stores ``export.md``.
+    """
+    inner = os.path.basename(split_compression(path)[0])
+    return inner if os.path.splitext(inner)[1] else f"{inner}.md"
+
+
+@contextmanager
+def open_output(path: str | IO) -> Iterator[TextIO]:
+    """
+    Open an export destination as a UTF-8 text stream.
+
+    Args:
+        path: Output path, or ``-`` for standard output. ``.gz``, ``.xz`` and
+              ``.zip`` names are compressed while writing. A file-like
+              object is written to directly (binary ones receive UTF-8).
+
+    Yields:
+        TextIO: A writable text stream. Standard output and file-like
+                objects are flushed but not closed when the block exits.
+    """
+    if not isinstance(path, str):
+        stream = path if is_text_stream(path) else _EncodingWriter(path)
+        try:
+            yield stream
+        finally:
+            flush = getattr(stream, "flush", None)
+            if flush is not None:
+                flush()
+        return
+
+    if is_stdout(path):
+        sys.stdout.flush()
+        stream = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+        try:
+            yield stream
+        finally:
+            stream.flush()
+            stream.detach()
+        return
+
+    compression = compression_of(path)
+    if compression == "gz":
+        with open(path, 'wb') as raw, _StreamingGzipFile(fileobj=raw, mode='wb', filename="") as gz:
+            with io.TextIOWrapper(gz, encoding='utf-8') as stream:
+                yield stream
+    elif compression == "xz":
+        with lzma.open(path, 'wt', encoding='utf-8') as stream:
+            yield stream
+    elif compression == "zip":
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            with archive.open(zip_member_name(path), 'w', force_zip64=True) as member:
+                with io.TextIOWrapper(member, encoding='utf-8') as stream:
+                    yield stream
+    else:
+        with open(path, 'w', encoding='utf-8') as stream:
+            yield stream
@@ -0,0 +1,365 @@
+"""
+File content reading for the project exporter.
+
+Files are read and decoded either inline or on a thread pool. In both cases
+results are handed back strictly in index order, so a single writer can emit
+them deterministically while the pool keeps a bounded number of reads in
+flight ahead of it.
+
+Files larger than ``STREAM_THRESHOLD`` are never loaded whole: they are
+flagged for streaming and the writer pulls them through ``iter_record_chunks``
+in ``CHUNK_SIZE`` pieces, so peak memory does not depend on file size.
+With per-file limits (see ``truncate``), an oversized file is read as a
+head/tail excerpt instead.
+
+Each file is decoded with the encoding sniffed from its first
+``SNIFF_BYTES`` (see ``sniff.detect_encoding``), which is recorded on the
+result. A file read whole that turns out not to be UTF-8 past that window
+is decoded again from memory as CP1252 or Latin-1, never read twice; a
+streamed one switches to the legacy encoding where UTF-8 stops decoding.
+"""
+from __future__ import annotations
+
+import codecs
+import hashlib
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .scanner import FileRecord, open_record
+from .sniff import (
+    ASCII_COMPATIBLE,
+    SNIFF_BYTES,
+    detect_encoding,
+    has_binary_extension,
+    legacy_encoding,
+)
+from .truncate import TruncationLimits, read_excerpt
+
+# Number of batches kept in flight per worker thread
+PREFETCH_PER_JOB = 4
+# Files read by one pool task; amortizes scheduling overhead on small files
+BATCH_SIZE = 32
+# Files above this size are streamed by the writer instead of read whole
+STREAM_THRESHOLD = 1024 * 1024
+# Size of the raw reads used when streaming a file
+CHUNK_SIZE = 64 * 1024
+
+
+class BinaryContentError(ValueError):
+    """Raised when a streamed file turns out not to be valid text."""
+
+
+@dataclass(slots=True)
+class FileContent:
+    """The outcome of reading one indexed file."""
+    record: FileRecord
+    text: str | None = None
+    error: Exception | None = None
+    digest: str | None = None
+    binary: bool = False
+    streamed: bool = False
+    omitted: int = 0
+    skeleton: bool = False
+    minified: int = 0
+    redactions: dict[str, int] | None = None
+    encoding: str | None = None
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the content hash stored for a file."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _decode(render: Callable[[str], str], data: bytes, encoding: str) -> tuple[str, str]:
+    """
+    Decode with the sniffed encoding, falling back to a legacy one for
+    content that is only UTF-8 within the sniffed window.
+
+    Args:
+        render: Decodes the content with a given codec.
+        data: The bytes ``render`` decodes, to choose the fallback from.
+        encoding: The sniffed codec.
+
+    Returns:
+        tuple[str, str]: The text, with line endings normalized, and the
+        codec that decoded it.
+
+    Raises:
+        UnicodeDecodeError: If no codec fits the content.
+    """
+    try:
+        text = render(encoding)
+    except UnicodeDecodeError:
+        fallback = legacy_encoding(data) if encoding == 'utf-8' else None
+        if fallback is None:
+            raise
+        text, encoding = render(fallback), fallback
+    return text.replace('\r\n', '\n').replace('\r', '\n'), encoding
+
+
+def read_record(
+    record: FileRecord,
+    with_digest: bool = False,
+    limits: TruncationLimits | None = None
+) -> FileContent:
+    """
+    Read and decode a single file.
+
+    Binary files are detected from their extension or from the first
+    ``SNIFF_BYTES`` bytes and flagged without reading the rest of them; the
+    same bytes give the encoding of text files. Files exceeding ``limits``
+    are reduced to a head/tail excerpt, whose ``omitted`` byte count is set
+    and which has no digest (UTF-16 and UTF-32 files, whose lines cannot be
+    cut on bytes, are never truncated). Other files larger than
+    ``STREAM_THRESHOLD`` are only sniffed and flagged for streaming.
+    Line endings are normalized to ``\\n`` exactly like a text-mode read.
+    Errors are captured on the result rather than raised, so that a failing
+    file never interrupts the export.
+
+    Args:
+        record: The indexed file to read.
+        with_digest: Also compute the SHA-256 of the raw bytes.
+        limits: Optional per-file size caps.
+
+    Returns:
+        FileContent: The decoded text and its encoding, the binary or
+                     streaming flag, or the error that prevented reading it.
+    """
+    result = FileContent(record)
+    if has_binary_extension(record.name):
+        result.binary = True
+        return result
+
+    try:
+        with open_record(record) as handle:
+            head = handle.read(SNIFF_BYTES)
+            encoding = detect_encoding(head)
+            if encoding is None:
+                result.binary = True
+                return result
+            result.encoding = encoding
+            data = None
+            if limits and encoding in ASCII_COMPATIBLE:
+                excerpt = read_excerpt(handle, record.size, limits)
+                if excerpt is not None and excerpt.omitted_bytes:
+                    result.text, result.encoding = _decode(excerpt.render, excerpt.head + excerpt.tail, encoding)
+                    result.omitted = excerpt.omitted_bytes
+                    return result
+                if excerpt is not None:
+                    data = excerpt.head
+                else:
+                    handle.seek(len(head))
+            if data is None:
+                if record.size > STREAM_THRESHOLD:
+                    result.streamed = True
+                    return result
+                data = head + handle.read()
+        if with_digest:
+            result.digest = hash_bytes(data)
+        result.text, result.encoding = _decode(data.decode, data, encoding)
+    except UnicodeDecodeError:
+        result.binary = True
+    except Exception as e:
+        result.error = e
+    return result
+
+
+class _FallbackDecoder:
+    """
+    Incremental decoder that switches to a legacy encoding at the first
+    byte the sniffed one rejects.
+
+    The text decoded so far is kept; only the remaining bytes are decoded
+    with the legacy encoding picked from them (see ``legacy_encoding``).
+    """
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+
+    def decode(self, data: bytes, final: bool = False) -> str:
+        try:
+            return self._decoder.decode(data, final)
+        except UnicodeDecodeError as e:
+            if self.encoding not in ('utf-8', 'cp1252'):
+                raise
+            rest = e.object[e.start:]
+            fallback = legacy_encoding(rest[:SNIFF_BYTES])
+            if fallback is None or fallback == self.encoding:
+                raise
+            prefix = e.object[:e.start].decode(self.encoding)
+            self.encoding = fallback
+            self._decoder = codecs.getincrementaldecoder(fallback)()
+            return prefix + self.decode(rest, final)
+
+
+def iter_text_chunks(
+    handle,
+    chunk_size: int = CHUNK_SIZE,
+    encoding: str = 'utf-8',
+    fallback: bool = False
+) -> Iterator[str]:
+    """
+    Incrementally decode a binary handle into text chunks.
+
+    Multi-byte characters split across reads are carried over by the
+    incremental decoder, and line endings are normalized to ``\\n`` like a
+    text-mode read, including a ``\\r\\n`` pair split across two reads.
+
+    Args:
+        handle: Binary file-like object positioned where decoding starts.
+        chunk_size: Number of bytes read at a time.
+        encoding: Codec used to decode the bytes.
+        fallback: Decode the rest as CP1252 or Latin-1 once UTF-8 (or
+                  CP1252) content stops decoding, instead of raising.
+
+    Yields:
+        str: Decoded text, at most about ``chunk_size`` characters at a time.
+
+    Raises:
+        UnicodeDecodeError: If the bytes are not valid for ``encoding`` (nor,
+                            with ``fallback``, for a legacy encoding).
+    """
+    if fallback:
+        decoder = _FallbackDecoder(encoding)
+    else:
+        decoder = codecs.getincrementaldecoder(encoding)()
+    carry_cr = False
+
+    while True:
+        data = handle.read(chunk_size)
+        final = not data
+        text = decoder.decode(data, final=final)
+
+        if carry_cr:
+            text = '\r' + text
+        carry_cr = not final and text.endswith('\r')
+        if carry_cr:
+            text = text[:-1]
+
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if text:
+            yield text
+        if final:
+            return
+
+
+def iter_record_chunks(record: FileRecord, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Stream a file's decoded content in bounded chunks.
+
+    The leading window is sniffed before anything is yielded, so a binary
+    file raises before the caller has written any of it, and gives the
+    encoding the file is decoded with. Content that stops being valid UTF-8
+    past that window is decoded from there on as CP1252 or Latin-1, like a
+    file read whole.
+
+    Args:
+        record: The indexed file to stream.
+        chunk_size: Number of bytes read at a time.
+
+    Yields:
+        str: Decoded text chunks.
+
+    Raises:
+        BinaryContentError: If the file is binary or stops decoding with
+                            both the sniffed and a legacy encoding.
+        OSError: If the file cannot be read.
+    """
+    with open_record(record) as handle:
+        encoding = detect_encoding(handle.read(SNIFF_BYTES))
+        if encoding is None:
+            raise BinaryContentError(record.relative_path)
+        handle.seek(0)
+
+        try:
+            yield from iter_text_chunks(handle, chunk_size, encoding, fallback=True)
+        except UnicodeDecodeError as e:
+            raise BinaryContentError(record.relative_path) from e
+
+
+def sniff_record(record: FileRecord) -> str | None:
+    """
+    Sniff the encoding of a file from its leading window only.
+
+    Returns:
+        str | None: The codec ``read_record`` would start decoding with, or
+        None for a binary file.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    if has_binary_extension(record.name):
+        return None
+    with open_record(record) as handle:
+        return detect_encoding(handle.read(SNIFF_BYTES))
+
+
+def _read_batch(
+    batch: list[FileRecord],
+    with_digest: bool,
+    limits: TruncationLimits | None
+) -> list[FileContent]:
+    """Read a batch of files on a worker thread."""
+    return [read_record(record, with_digest, limits=limits) for record in batch]
+
+
+def _batched(records: Iterable[FileRecord], size: int) -> Iterator[list[FileRecord]]:
+    """Group records into lists of at most ``size`` items."""
+    batch: list[FileRecord] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_contents(
+    records: Iterable[FileRecord],
+    jobs: int = 1,
+    prefetch: int | None = None,
+    with_digest: bool = False,
+    limits: TruncationLimits | None = None
+) -> Iterator[FileContent]:
+    """
+    Read files and yield their contents in the order of ``records``.
+
+    With ``jobs`` greater than one, reads run on a thread pool in batches of
+    ``BATCH_SIZE`` files and at most ``prefetch`` batches are pending at any
+    time, which bounds memory use regardless of the project size.
+
+    Args:
+        records: Files to read, in the order they must be emitted.
+        jobs: Number of reader threads. ``1`` reads inline.
+        prefetch: Maximum number of batches read ahead of the consumer.
+                  Defaults to ``jobs * PREFETCH_PER_JOB``.
+        with_digest: Compute the SHA-256 of each file's raw bytes.
+        limits: Optional per-file size caps (see ``read_record``).
+
+    Yields:
+        FileContent: One result per record, in input order.
+    """
+    if jobs <= 1:
+        for record in records:
+            yield read_record(record, with_digest, limits=limits)
+        return
+
+    window = max(prefetch or jobs * PREFETCH_PER_JOB, 1)
+    pending: deque[Future[list[FileContent]]] = deque()
+
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="pocket-read") as pool:
+        try:
+            for batch in _batched(records, BATCH_SIZE):
+                pending.append(pool.submit(_read_batch, batch, with_digest, limits))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
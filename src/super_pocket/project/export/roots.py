@@ -0,0 +1,94 @@
+"""
+Multi-root exports.
+
+A monorepo is often exported one sub-project at a time. These helpers turn
+the roots given on the command line (paths or globs such as
+``packages/*``) into a list of project directories, name the export of
+each one, and group the roots by parent directory so that siblings are
+scanned in one pass of their parent (see ``scanner.scan_roots``).
+"""
+from __future__ import annotations
+
+import glob
+import os
+from collections.abc import Iterable
+
+# Characters that make a root a glob pattern rather than a path
+GLOB_CHARS = frozenset("*?[")
+
+
+def expand_roots(patterns: Iterable[str]) -> list[str]:
+    """
+    Expand root paths and glob patterns into project directories.
+
+    Args:
+        patterns: Directory paths or glob patterns; matches that are not
+                  directories are ignored.
+
+    Returns:
+        list[str]: Absolute directory paths, in the order given (glob matches
+        sorted), without duplicates.
+
+    Raises:
+        ValueError: If a path is not a directory or a pattern matches none.
+
+    Example:
+        >>> expand_roots(["packages/*", "tools"])
+        ['/repo/packages/api', '/repo/packages/web', '/repo/tools']
+    """
+    roots: dict[str, None] = {}
+    for pattern in patterns:
+        if GLOB_CHARS.intersection(pattern):
+            matches = sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isdir(path))
+            if not matches:
+                raise ValueError(f"No directory matches {pattern!r}")
+        elif os.path.isdir(pattern):
+            matches = [pattern]
+        else:
+            raise ValueError(f"Not a directory: {pattern!r}")
+        roots.update(dict.fromkeys(os.path.abspath(path) for path in matches))
+    return list(roots)
+
+
+def group_roots(roots: Iterable[str]) -> dict[str, list[str]]:
+    """
+    Group absolute root paths by parent directory.
+
+    Args:
+        roots: Absolute project directories.
+
+    Returns:
+        dict[str, list[str]]: Names of the roots within each parent, in order.
+    """
+    groups: dict[str, list[str]] = {}
+    for root in roots:
+        parent, name = os.path.split(root.rstrip(os.sep))
+        groups.setdefault(parent, []).append(name)
+    return groups
+
+
+def root_outputs(roots: Iterable[str], output_dir: str, extension: str = ".md") -> dict[str, str]:
+    """
+    Name the export of each root: ``<output_dir>/<name>-1-file<extension>``.
+
+    Args:
+        roots: Absolute project directories.
+        output_dir: Directory receiving the exports.
+        extension: Extension of the output format.
+
+    Returns:
+        dict[str, str]: Output path of each root.
+
+    Raises:
+        ValueError: If two roots have the same name, so their exports would
+                    overwrite each other.
+    """
+    outputs: dict[str, str] = {}
+    owners: dict[str, str] = {}
+    for root in roots:
+        name = os.path.basename(root.rstrip(os.sep))
+        if name in owners:
+            raise ValueError(f"Roots {owners[name]!r} and {root!r} would both be exported as {name!r}")
+        owners[name] = root
+        outputs[root] = os.path.join(output_dir, f"{name}-1-file{extension}")
+    return outputs
@@ -0,0 +1,493 @@
+"""
+Single-pass project scanner.
+
+This module walks a project directory exactly once with ``os.scandir`` and
+builds an in-memory index of every directory and file that survives the
+exclusion rules (see ``ignore.IgnoreMatcher``). The tree renderer and the content writer both consume the
+same index, so the file system metadata is only read once per export.
+
+Projects that are not a directory on disk (a git revision, an archive) are
+listed by their own module and indexed with ``index_listing``, which applies
+the same rules and ordering; their records carry the ``ContentSource`` their
+bytes are read from (see ``open_record``).
+"""
+from __future__ import annotations
+
+import os
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import BinaryIO, Protocol
+
+from .filters import FileFilter
+from .ignore import IGNORE_FILES, IgnoreMatcher, compile_rules
+
+
+class ContentSource(Protocol):
+    """Where the bytes of files that are not on disk are read from."""
+
+    def open(self, record: FileRecord) -> BinaryIO:
+        """Open a file of the source for binary reading."""
+
+
+@dataclass(slots=True)
+class FileRecord:
+    """
+    A file discovered during the scan, with the stat data collected for it.
+
+    ``path`` is where the content is read from: a file system path, or the
+    key ``source`` resolves (a blob id, an archive member name).
+    """
+    name: str
+    relative_path: str
+    path: str
+    size: int = 0
+    mtime_ns: int = 0
+    source: ContentSource | None = None
+
+
+def open_record(record: FileRecord) -> BinaryIO:
+    """
+    Open the content of an indexed file for binary reading.
+
+    Args:
+        record: The indexed file.
+
+    Returns:
+        BinaryIO: A seekable handle on the file's bytes.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    if record.source is not None:
+        return record.source.open(record)
+    return open(record.path, 'rb')
+
+
+@dataclass(slots=True)
+class DirectoryNode:
+    """A directory of the scanned tree with its sorted files and subdirectories."""
+    name: str
+    relative_path: str
+    files: list[FileRecord] = field(default_factory=list)
+    directories: list[DirectoryNode] = field(default_factory=list)
+
+
+@dataclass
+class ProjectIndex:
+    """
+    In-memory index of a scanned project.
+
+    Files are ordered the same way the exporter has always emitted them:
+    a directory's own files (sorted by name) come before its subdirectories
+    (also sorted by name), recursively. ``skipped`` counts the entries the
+    scan left out, by reason: 'excluded' by ignore rules (a pruned
+    directory counts once) and 'filtered' by the file filter.
+    """
+    root: str
+    name: str
+    tree: DirectoryNode
+    skipped: Counter[str] = field(default_factory=Counter)
+
+    def iter_files(self) -> Iterator[FileRecord]:
+        """
+        Iterate over every indexed file in export order.
+
+        Yields:
+            FileRecord: Each file of the project.
+        """
+        stack = [self.tree]
+        while stack:
+            node = stack.pop()
+            yield from node.files
+            stack.extend(reversed(node.directories))
+
+    def iter_tree_lines(self, marks: Mapping[str, str] | None = None) -> Iterator[str]:
+        """
+        Render the index as an ASCII tree, one line at a time.
+
+        The root directory itself is not included; callers print the project
+        name before these lines.
+
+        Args:
+            marks: Optional label per relative path, appended to the file's
+                   line in square brackets (e.g. a git status letter).
+
+        Yields:
+            str: Lines of the tree using box-drawing characters.
+        """
+        stack: list[tuple[DirectoryNode, int]] = [(self.tree, 0)]
+        while stack:
+            node, level = stack.pop()
+            if level > 0:
+                yield f"{'│   ' * (level - 1)}├── {node.name}/"
+
+            last = len(node.files) - 1
+            for i, record in enumerate(node.files):
+                prefix = '└── ' if i == last else '├── '
+                mark = marks.get(record.relative_path) if marks else None
+                suffix = f" [{mark}]" if mark else ""
+                yield f"{'│   ' * level}{prefix}{record.name}{suffix}"
+
+            stack.extend((child, level + 1) for child in reversed(node.directories))
+
+    def subset(self, records: Iterable[FileRecord]) -> ProjectIndex:
+        """
+        Return an index restricted to some of the files.
+
+        Directories left without any selected file are dropped, so the tree
+        of the subset only shows the paths leading to those files.
+
+        Args:
+            records: Files of this index to keep.
+
+        Returns:
+            ProjectIndex: A new index sharing the same root and name.
+        """
+        keep = {record.relative_path for record in records}
+
+        def prune(node: DirectoryNode) -> DirectoryNode | None:
+            files = [record for record in node.files if record.relative_path in keep]
+            directories = [child for child in map(prune, node.directories) if child is not None]
+            if not files and not directories:
+                return None
+            return DirectoryNode(node.name, node.relative_path, files, directories)
+
+        tree = prune(self.tree) or DirectoryNode(self.tree.name, self.tree.relative_path)
+        return ProjectIndex(root=self.root, name=self.name, tree=tree)
+
+    @property
+    def file_count(self) -> int:
+        """Number of files in the index."""
+        return sum(1 for _ in self.iter_files())
+
+    def __iter__(self) -> Iterator[FileRecord]:
+        return self.iter_files()
+
+
+def _scan_directory(
+    path: str,
+    relative_path: str,
+    matcher: IgnoreMatcher,
+    ignore_paths: frozenset[str],
+    use_ignore_files: bool,
+    file_filter: FileFilter | None = None,
+    skipped: Counter[str] | None = None
+) -> DirectoryNode:
+    """
+    Recursively scan one directory into a DirectoryNode.
+
+    Symlinked directories are listed by ``os.scandir`` but, like ``os.walk``
+    with its default settings, are never descended into nor shown. With a
+    ``file_filter``, files are selected from their name and stat data, and
+    subdirectories left without any file are dropped. Entries left out are
+    counted in ``skipped``.
+    """
+    skipped = skipped if skipped is not None else Counter()
+    node = DirectoryNode(name=os.path.basename(path), relative_path=relative_path)
+    subdirs: list[tuple[str, str]] = []
+
+    try:
+        with os.scandir(path) as listing:
+            entries = list(listing)
+    except OSError:
+        return node
+
+    if use_ignore_files:
+        # Only the ignore files the listing shows are opened
+        present = [entry.name for entry in entries if entry.name in IGNORE_FILES]
+        if present:
+            matcher = matcher.with_ignore_files(path, relative_path, present)
+
+    try:
+        for entry in entries:
+            if entry.path in ignore_paths:
+                continue
+
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            child_relative = os.path.join(relative_path, entry.name) if relative_path else entry.name
+            if matcher.is_ignored(child_relative, is_dir):
+                skipped["excluded"] += 1
+                continue
+
+            if is_dir:
+                if not entry.is_symlink():
+                    subdirs.append((entry.name, entry.path))
+                continue
+            if file_filter and not file_filter.accepts_name(entry.name):
+                skipped["filtered"] += 1
+                continue
+
+            try:
+                stat = entry.stat()
+                size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            except OSError:
+                size, mtime_ns = 0, 0
+            if file_filter and not file_filter.accepts(entry.name, size, mtime_ns):
+                skipped["filtered"] += 1
+                continue
+
+            node.files.append(FileRecord(
+                name=entry.name,
+                relative_path=child_relative,
+                path=entry.path,
+                size=size,
+                mtime_ns=mtime_ns,
+            ))
+    except OSError:
+        return node
+
+    node.files.sort(key=lambda record: record.name)
+    for name, child_path in sorted(subdirs):
+        child_relative = os.path.join(relative_path, name) if relative_path else name
+        child = _scan_directory(
+            child_path, child_relative, matcher, ignore_paths, use_ignore_files, file_filter, skipped
+        )
+        if file_filter and not child.files and not child.directories:
+            continue
+        node.directories.append(child)
+
+    return node
+
+
+def scan_project(
+    root_dir: str,
+    exclude: Iterable[str] | IgnoreMatcher = (),
+    ignore_paths: Iterable[str] = (),
+    use_ignore_files: bool = False,
+    file_filter: FileFilter | None = None
+) -> ProjectIndex:
+    """
+    Scan a project directory once and build its file index.
+
+    Args:
+        root_dir: Root directory of the project.
+        exclude: Gitignore-style patterns (a bare name matches at any depth)
+                 or a prebuilt IgnoreMatcher. Excluded directories are
+                 pruned and never entered.
+        ignore_paths: Specific paths to leave out, such as the export itself
+                      when it is written inside the project.
+        use_ignore_files: Also honor the ``.gitignore`` and ``.pocketignore``
+                          files found in the scanned directories.
+        file_filter: Only index files passing this filter, which is checked
+                     against the scan's stat data so other files are never
+                     opened. Directories left empty are not indexed.
+
+    Returns:
+        ProjectIndex: The index shared by the tree renderer and the content writer.
+
+    Example:
+        >>> index = scan_project('/path/to/project', {'.git', 'node_modules'})
+        >>> [record.relative_path for record in index.iter_files()]
+        ['README.md', 'src/main.py']
+    """
+    root = os.path.abspath(root_dir)
+    ignored = frozenset(os.path.abspath(path) for path in ignore_paths)
+    matcher = exclude if isinstance(exclude, IgnoreMatcher) else IgnoreMatcher.from_patterns(exclude)
+    skipped: Counter[str] = Counter()
+    tree = _scan_directory(root, "", matcher, ignored, use_ignore_files, file_filter, skipped)
+    return ProjectIndex(root=root, name=os.path.basename(root), tree=tree, skipped=skipped)
+
+
+def _index_directory(
+    relative_path: str,
+    listing: Mapping[str, tuple[list[FileRecord], set[str]]],
+    root: str,
+    matcher: IgnoreMatcher,
+    ignore_paths: frozenset[str],
+    use_ignore_files: bool,
+    file_filter: FileFilter | None,
+    skipped: Counter[str]
+) -> DirectoryNode:
+    """Build the DirectoryNode of one listed directory, like ``_scan_directory``."""
+    files, subdirs = listing.get(relative_path, ([], set()))
+    node = DirectoryNode(name=os.path.basename(relative_path or root), relative_path=relative_path)
+
+    if use_ignore_files:
+        ignore_files = {record.name: record for record in files if record.name in IGNORE_FILES}
+        texts = []
+        for name in IGNORE_FILES:
+            if name in ignore_files:
+                try:
+                    with open_record(ignore_files[name]) as handle:
+                        texts.append(handle.read().decode('utf-8', errors='replace').splitlines())
+                except OSError:
+                    continue
+        matcher = matcher.with_ignore_lines(texts, relative_path)
+
+    for record in files:
+        if os.path.join(root, record.relative_path) in ignore_paths:
+            continue
+        if matcher.is_ignored(record.relative_path, False):
+            skipped["excluded"] += 1
+            continue
+        if file_filter and not (
+            file_filter.accepts_name(record.name)
+            and file_filter.accepts(record.name, record.size, record.mtime_ns)
+        ):
+            skipped["filtered"] += 1
+            continue
+        node.files.append(record)
+    node.files.sort(key=lambda record: record.name)
+
+    for name in sorted(subdirs):
+        child_relative = os.path.join(relative_path, name) if relative_path else name
+        if os.path.join(root, child_relative) in ignore_paths:
+            continue
+        if matcher.is_ignored(child_relative, True):
+            skipped["excluded"] += 1
+            continue
+        child = _index_directory(
+            child_relative, listing, root, matcher, ignore_paths, use_ignore_files, file_filter, skipped
+        )
+        if file_filter and not child.files and not child.directories:
+            continue
+        node.directories.append(child)
+
+    return node
+
+
+def index_listing(
+    root_dir: str,
+    records: Iterable[FileRecord],
+    directories: Iterable[str] = (),
+    exclude: Iterable[str] | IgnoreMatcher = (),
+    ignore_paths: Iterable[str] = (),
+    use_ignore_files: bool = False,
+    file_filter: FileFilter | None = None,
+    name: str | None = None
+) -> ProjectIndex:
+    """
+    Index a project listed up front instead of scanned from disk.
+
+    The listing goes through the same exclusion rules, filter and ordering
+    as ``scan_project``, so a project indexed from a git revision or an
+    archive renders exactly like the same files in a directory. Ignore files
+    are read from the listing itself.
+
+    Args:
+        root_dir: Path the project is shown under; ``ignore_paths`` are
+                  matched against the records' relative paths joined to it.
+        records: Every file of the project, with ``relative_path`` using
+                 ``os.sep``; their parent directories are implied.
+        directories: Relative paths of directories to show even when they
+                     hold no file.
+        exclude: Gitignore-style patterns or a prebuilt IgnoreMatcher.
+        ignore_paths: Specific paths to leave out.
+        use_ignore_files: Also honor the listed ``.gitignore`` and
+                          ``.pocketignore`` files.
+        file_filter: Only index files passing this filter.
+        name: Name of the project; defaults to the last part of ``root_dir``.
+
+    Returns:
+        ProjectIndex: The index shared by the tree renderer and the content writer.
+    """
+    root = os.path.abspath(root_dir)
+    ignored = frozenset(os.path.abspath(path) for path in ignore_paths)
+    matcher = exclude if isinstance(exclude, IgnoreMatcher) else IgnoreMatcher.from_patterns(exclude)
+    name = name or os.path.basename(root)
+
+    listing: dict[str, tuple[list[FileRecord], set[str]]] = {}
+
+    def add_directory(relative_path: str) -> None:
+        while relative_path:
+            listing.setdefault(relative_path, ([], set()))
+            parent, name = os.path.split(relative_path)
+            subdirs = listing.setdefault(parent, ([], set()))[1]
+            if name in subdirs:
+                return
+            subdirs.add(name)
+            relative_path = parent
+
+    for directory in directories:
+        add_directory(directory.strip(os.sep))
+    for record in records:
+        parent = os.path.dirname(record.relative_path)
+        add_directory(parent)
+        listing.setdefault(parent, ([], set()))[0].append(record)
+
+    skipped: Counter[str] = Counter()
+    tree = _index_directory("", listing, root, matcher, ignored, use_ignore_files, file_filter, skipped)
+    tree.name = name
+    return ProjectIndex(root=root, name=name, tree=tree, skipped=skipped)
+
+
+def _rebase(node: DirectoryNode, prefix_length: int) -> None:
+    """Strip a leading directory from the relative paths below a node, in place."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        current.relative_path = current.relative_path[prefix_length:]
+        for record in current.files:
+            record.relative_path = record.relative_path[prefix_length:]
+        stack.extend(current.directories)
+
+
+def scan_roots(
+    parent_dir: str,
+    names: Iterable[str],
+    exclude: Iterable[str] = (),
+    ignore_paths: Iterable[str] = (),
+    use_ignore_files: bool = False,
+    file_filter: FileFilter | None = None
+) -> list[ProjectIndex]:
+    """
+    Scan several sibling projects in one pass of their parent directory.
+
+    The parent is listed once: its ignore files, read from that listing,
+    apply to every project as they would in git, and each project found in
+    it is walked into its own index, as ``scan_project`` would index it on
+    its own: the ``exclude`` patterns are relative to that project and its
+    relative paths start inside it. The projects' trees are disjoint, so no
+    directory is listed twice, and a name given twice is scanned once.
+
+    Args:
+        parent_dir: Directory holding the projects.
+        names: Names of the project directories within ``parent_dir``.
+        exclude: Gitignore-style patterns, relative to each project.
+        ignore_paths: Specific paths to leave out, such as the exports.
+        use_ignore_files: Also honor the ``.gitignore`` and ``.pocketignore``
+                          files of the parent and of the scanned directories.
+        file_filter: Only index files passing this filter.
+
+    Returns:
+        list[ProjectIndex]: One index per name, in the same order; a name
+        that is not a directory of the parent gets an empty index.
+    """
+    parent = os.path.abspath(parent_dir)
+    ignored = frozenset(os.path.abspath(path) for path in ignore_paths)
+    patterns = [pattern.strip() for pattern in exclude]
+    try:
+        with os.scandir(parent) as listing:
+            entries = {entry.name: entry for entry in listing}
+    except OSError:
+        entries = {}
+    shared = IgnoreMatcher()
+    if use_ignore_files:
+        present = [name for name in IGNORE_FILES if name in entries]
+        if present:
+            shared = shared.with_ignore_files(parent, "", present)
+
+    scanned: dict[str, ProjectIndex] = {}
+    for name in names:
+        if name in scanned:
+            continue
+        root = os.path.join(parent, name)
+        skipped: Counter[str] = Counter()
+        entry = entries.get(name)
+        try:
+            is_dir = entry is not None and entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            matcher = IgnoreMatcher(compile_rules(patterns, base=name), shared.rule_sets)
+            tree = _scan_directory(entry.path, name, matcher, ignored, use_ignore_files, file_filter, skipped)
+            _rebase(tree, len(name) + 1)
+        else:
+            tree = DirectoryNode(name=name, relative_path="")
+        scanned[name] = ProjectIndex(root=root, name=name, tree=tree, skipped=skipped)
+    return [scanned[name] for name in names]
@@ -0,0 +1,225 @@
+"""
+Budget-based sharding of a codebase export.
+
+When an export must fit a hard size or context limit, files are packed
+greedily, in export order, into numbered shards that each stay within a
+byte budget. Packing is planned from a per-file bound of the rendered
+content supplied by the caller (by default the stat size collected by the
+scan); the writer still checks the actual size of each shard before writing
+it. A file that does not fit in a shard on its own is placed alone and split
+across as many shards as it needs.
+
+Token budgets are converted to bytes with a fast approximate counter
+(``BYTES_PER_TOKEN``) rather than a real tokenizer.
+"""
+from __future__ import annotations
+
+import glob
+import math
+import os
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from .outputs import split_compression
+from .scanner import FileRecord, ProjectIndex
+from .sniff import has_binary_extension
+
+# Average number of UTF-8 bytes per token for source code and prose
+BYTES_PER_TOKEN = 4
+
+# Byte length of the box-drawing prefixes used by ProjectIndex.iter_tree_lines
+_INDENT_BYTES = len('│   '.encode('utf-8'))
+_BRANCH_BYTES = len('├── '.encode('utf-8'))
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the number of tokens in a text.
+
+    Args:
+        text: Text to measure.
+
+    Returns:
+        int: Estimated token count (UTF-8 bytes divided by ``BYTES_PER_TOKEN``).
+    """
+    return bytes_to_tokens(len(text.encode('utf-8')))
+
+
+def bytes_to_tokens(size: int) -> int:
+    """
+    Approximate the number of tokens in ``size`` bytes of text.
+
+    Args:
+        size: Number of UTF-8 bytes.
+
+    Returns:
+        int: Estimated token count.
+    """
+    return math.ceil(size / BYTES_PER_TOKEN)
+
+
+def tokens_to_bytes(tokens: int) -> int:
+    """
+    Convert a token budget into the byte budget used for packing.
+
+    Args:
+        tokens: Maximum number of tokens per shard.
+
+    Returns:
+        int: Equivalent number of bytes.
+    """
+    return tokens * BYTES_PER_TOKEN
+
+
+def shard_path(output_file: str, number: int) -> str:
+    """
+    Return the path of a numbered shard.
+
+    Args:
+        output_file: Path the unsharded export would be written to.
+        number: 1-based shard number.
+
+    Returns:
+        str: e.g. ``project-1-file-003.md`` for ``project-1-file.md``, and
+             ``project-1-file-003.md.gz`` for ``project-1-file.md.gz``.
+    """
+    name, compression = split_compression(output_file)
+    stem, ext = os.path.splitext(name)
+    return f"{stem}-{number:03d}{ext}{compression}"
+
+
+def existing_shards(output_file: str) -> list[str]:
+    """
+    List shards left by a previous sharded export of ``output_file``.
+
+    Args:
+        output_file: Path the unsharded export would be written to.
+
+    Returns:
+        list[str]: Matching shard paths, so the scan can leave them out.
+    """
+    name, compression = split_compression(output_file)
+    stem, ext = os.path.splitext(name)
+    pattern = f"{glob.escape(stem)}-[0-9][0-9][0-9]*{glob.escape(ext + compression)}"
+    return sorted(glob.glob(pattern))
+
+
+def remove_stale_shards(output_file: str, count: int) -> list[str]:
+    """
+    Delete the shards numbered above ``count`` left by a larger previous export.
+
+    Only files named exactly as ``shard_path`` names shards are removed.
+
+    Args:
+        output_file: Path the unsharded export would be written to.
+        count: Number of shards the export just wrote.
+
+    Returns:
+        list[str]: The deleted paths.
+    """
+    name, compression = split_compression(output_file)
+    stem, ext = os.path.splitext(os.path.basename(name))
+    pattern = re.compile(rf"{re.escape(stem)}-(\d{{3,}}){re.escape(ext + compression)}")
+    removed = []
+    for path in existing_shards(output_file):
+        match = pattern.fullmatch(os.path.basename(path))
+        if match is None:
+            continue
+        number = int(match.group(1))
+        if number > count and path == shard_path(output_file, number):
+            os.remove(path)
+            removed.append(path)
+    return removed
+
+
+@dataclass
+class Shard:
+    """Files planned into one shard, with their estimated size in bytes."""
+    records: list[FileRecord] = field(default_factory=list)
+    size: int = 0
+    oversized: bool = False
+
+
+class _TreeCost:
+    """Tracks the byte size of the tree header of a shard as files are added."""
+
+    def __init__(self):
+        self.directories: set[str] = set()
+
+    def added_cost(self, record: FileRecord) -> tuple[int, list[str]]:
+        """Return the bytes a file adds to the tree and the directories it introduces."""
+        parts = record.relative_path.split(os.sep)
+        new_dirs = []
+        cost = 0
+        for level in range(1, len(parts)):
+            directory = os.sep.join(parts[:level])
+            if directory not in self.directories:
+                new_dirs.append(directory)
+                cost += _INDENT_BYTES * (level - 1) + _BRANCH_BYTES + len(parts[level - 1].encode('utf-8')) + 2
+        depth = len(parts) - 1
+        cost += _INDENT_BYTES * depth + _BRANCH_BYTES + len(record.name.encode('utf-8')) + 1
+        return cost, new_dirs
+
+
+def plan_shards(
+    index: ProjectIndex,
+    budget: int,
+    header_size: int,
+    block_overhead: Callable[[FileRecord], int],
+    content_size: Callable[[FileRecord], int] | None = None
+) -> list[Shard]:
+    """
+    Greedily pack the indexed files into shards that fit a byte budget.
+
+    Files with a known binary extension only cost their tree line, since
+    their content is never written.
+
+    Args:
+        index: The scanned project.
+        budget: Maximum size of one shard, in bytes.
+        header_size: Fixed bytes of every shard (title and tree fences).
+        block_overhead: Bytes a file's block adds around its content.
+        content_size: Estimated upper bound of a file's rendered content in
+                      bytes. Defaults to its stat size, which redaction
+                      markers or a re-encoding to UTF-8 can exceed.
+
+    Returns:
+        list[Shard]: Shards in export order. An oversized shard holds a single
+                     file that will be split when written.
+    """
+    shards: list[Shard] = []
+    current = Shard(size=header_size)
+    tree = _TreeCost()
+
+    for record in index.iter_files():
+        if has_binary_extension(record.name):
+            content = 0
+        else:
+            size = record.size if content_size is None else content_size(record)
+            content = block_overhead(record) + size
+        tree_cost, new_dirs = tree.added_cost(record)
+        cost = tree_cost + content
+
+        if current.records and current.size + cost > budget:
+            shards.append(current)
+            current = Shard(size=header_size)
+            tree = _TreeCost()
+            tree_cost, new_dirs = tree.added_cost(record)
+            cost = tree_cost + content
+
+        if header_size + cost > budget:
+            if current.records:
+                shards.append(current)
+            shards.append(Shard(records=[record], size=header_size + cost, oversized=True))
+            current = Shard(size=header_size)
+            tree = _TreeCost()
+            continue
+
+        current.records.append(record)
+        current.size += cost
+        tree.directories.update(new_dirs)
+
+    if current.records or not shards:
+        shards.append(current)
+    return shards
@@ -0,0 +1,226 @@
+"""
+Python skeletons for architecture-level exports.
+
+In skeleton mode, Python files are parsed with ``ast`` and reduced to what
+describes their structure: the module docstring, imports, class and
+function signatures with their decorators and docstrings, and the fields
+and simple assignments of class bodies, so a dataclass keeps its fields.
+Imports under a ``try`` or an ``if`` (``if TYPE_CHECKING:``) are kept in
+their block. Function bodies become ``...``. Parsing is CPU-bound, so it runs on a process pool between the
+reader threads and the single writer, with results kept in export order.
+
+Files matching the keep-full patterns, files that do not parse, and
+truncated or streamed files are exported unchanged.
+"""
+from __future__ import annotations
+
+import ast
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from .ignore import IgnoreMatcher
+from .reader import BATCH_SIZE, PREFETCH_PER_JOB, FileContent
+
+PYTHON_EXTENSIONS = (".py", ".pyi")
+# Below this many Python files, skeletons are built inline: starting a
+# process pool would cost more than it saves
+POOL_MIN_FILES = 64
+
+
+@dataclass(frozen=True)
+class SkeletonOptions:
+    """Which files skeleton mode reduces, and how many processes it uses."""
+    keep_full: tuple[str, ...] = ()
+    jobs: int | None = None
+    matcher: IgnoreMatcher = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "matcher", IgnoreMatcher.from_patterns(self.keep_full))
+
+    @property
+    def signature(self) -> str:
+        """Identify the options in cache signatures."""
+        return f"skeleton-v2;keep-full={','.join(self.keep_full)}"
+
+    def applies_to(self, relative_path: str) -> bool:
+        """Tell whether a file is reduced to its skeleton."""
+        relative_path = relative_path.replace(os.sep, '/')
+        if not relative_path.endswith(PYTHON_EXTENSIONS):
+            return False
+        return not self.matcher.is_ignored(relative_path)
+
+
+def _docstring(node: ast.AST) -> ast.stmt | None:
+    """Return the docstring statement of a module, class or function."""
+    body = getattr(node, "body", None)
+    if body and isinstance(body[0], ast.Expr):
+        value = body[0].value
+        if isinstance(value, ast.Constant) and isinstance(value.value, str):
+            return body[0]
+    return None
+
+
+def _ellipsis() -> ast.stmt:
+    return ast.Expr(value=ast.Constant(value=...))
+
+
+def _is_field(node: ast.stmt) -> bool:
+    """Tell whether a class-body statement declares a field or a plain attribute."""
+    if isinstance(node, ast.AnnAssign):
+        return bool(node.simple)
+    return isinstance(node, ast.Assign) and all(isinstance(target, ast.Name) for target in node.targets)
+
+
+def _reduce_block(body: list[ast.stmt], in_class: bool) -> list[ast.stmt]:
+    """Reduce the statements of a block, dropping those left out."""
+    return [statement for statement in (_reduce(node, in_class) for node in body) if statement is not None]
+
+
+def _reduce(node: ast.stmt, in_class: bool = False) -> ast.stmt | None:
+    """Reduce one statement to its skeleton, or drop it (None)."""
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return node
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        doc = _docstring(node)
+        node.body = ([doc] if doc else []) + [_ellipsis()]
+        return node
+    if isinstance(node, ast.ClassDef):
+        doc = _docstring(node)
+        members = _reduce_block(node.body[1 if doc else 0:], in_class=True)
+        node.body = ([doc] if doc else []) + (members or [_ellipsis()])
+        return node
+    if in_class and _is_field(node):
+        return node
+    if isinstance(node, ast.If):
+        # Kept for the imports or definitions it holds, such as ``if TYPE_CHECKING:``
+        body = _reduce_block(node.body, in_class)
+        orelse = _reduce_block(node.orelse, in_class)
+        if not body and not orelse:
+            return None
+        node.body, node.orelse = body or [_ellipsis()], orelse
+        return node
+    if isinstance(node, (ast.Try, ast.TryStar)):
+        # Kept for optional imports: ``try: import ujson as json`` / ``except ImportError: import json``
+        body = _reduce_block(node.body, in_class)
+        handlers = [_reduce_block(handler.body, in_class) for handler in node.handlers]
+        orelse = _reduce_block(node.orelse, in_class)
+        finalbody = _reduce_block(node.finalbody, in_class)
+        if not body and not any(handlers) and not orelse and not finalbody:
+            return None
+        node.body = body or [_ellipsis()]
+        for handler, kept in zip(node.handlers, handlers):
+            handler.body = kept or [_ellipsis()]
+        node.orelse = orelse
+        node.finalbody = finalbody or ([] if node.handlers else [_ellipsis()])
+        return node
+    return None
+
+
+def skeletonize(source: str) -> str | None:
+    """
+    Reduce Python source code to its skeleton.
+
+    Args:
+        source: Python source code.
+
+    Returns:
+        str | None: The skeleton (module docstring, imports, decorated class
+        and function signatures with docstrings, class fields), or None if
+        the source does not parse.
+
+    Example:
+        >>> print(skeletonize("import os\\n\\n@cache\\ndef f(x: int) -> int:\\n    return x * 2\\n"), end="")
+        import os
+        <BLANKLINE>
+        @cache
+        def f(x: int) -> int:
+            ...
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+
+    doc = _docstring(tree)
+    body = [statement for statement in map(_reduce, tree.body[1 if doc else 0:]) if statement is not None]
+    module = ast.Module(body=([doc] if doc else []) + body, type_ignores=[])
+    text = ast.unparse(module)
+    return f"{text}\n" if text else text
+
+
+def _skeleton_batch(sources: list[str | None]) -> list[str | None]:
+    """Build the skeletons of a batch of sources in a worker process."""
+    return [None if source is None else skeletonize(source) for source in sources]
+
+
+def _eligible(content: FileContent, options: SkeletonOptions) -> bool:
+    return (
+        content.text is not None
+        and not content.omitted
+        and options.applies_to(content.record.relative_path)
+    )
+
+
+def _apply(batch: list[FileContent], skeletons: list[str | None]) -> list[FileContent]:
+    for content, skeleton in zip(batch, skeletons):
+        if skeleton is not None:
+            content.text = skeleton
+            content.skeleton = True
+    return batch
+
+
+def iter_skeletons(
+    contents: Iterable[FileContent],
+    options: SkeletonOptions,
+    expected: int = POOL_MIN_FILES
+) -> Iterator[FileContent]:
+    """
+    Replace the text of eligible Python files with their skeleton.
+
+    Args:
+        contents: Read results, in export order.
+        options: Skeleton mode options.
+        expected: Number of Python files expected; the process pool is only
+                  started for at least ``POOL_MIN_FILES`` of them.
+
+    Yields:
+        FileContent: The same results, in the same order, with ``text``
+        replaced and ``skeleton`` set where a skeleton was built.
+    """
+    jobs = options.jobs or os.cpu_count() or 1
+    if jobs <= 1 or expected < POOL_MIN_FILES:
+        for content in contents:
+            if _eligible(content, options):
+                _apply([content], [skeletonize(content.text)])
+            yield content
+        return
+
+    window = jobs * PREFETCH_PER_JOB
+    pending: deque[tuple[list[FileContent], Future[list[str | None]]]] = deque()
+    batch: list[FileContent] = []
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        def submit() -> None:
+            sources = [content.text if _eligible(content, options) else None for content in batch]
+            pending.append((list(batch), pool.submit(_skeleton_batch, sources)))
+            batch.clear()
+
+        try:
+            for content in contents:
+                batch.append(content)
+                if len(batch) >= BATCH_SIZE:
+                    submit()
+                    if len(pending) >= window:
+                        done, future = pending.popleft()
+                        yield from _apply(done, future.result())
+            if batch:
+                submit()
+            while pending:
+                done, future = pending.popleft()
+                yield from _apply(done, future.result())
+        finally:
+            for _, future in pending:
+                future.cancel()
@@ -0,0 +1,200 @@
+"""
+Cheap binary and encoding detection.
+
+Binary files are recognized before they are read: first from their
+extension, then from a small leading byte window checked against known
+magic numbers, NUL bytes and decodability. A multi-gigabyte checkpoint
+therefore costs at most one ``SNIFF_BYTES`` read instead of a full decode.
+
+The same window decides how a text file is decoded (see
+``detect_encoding``): a byte order mark wins, then a UTF-16 pattern of NUL
+bytes, then UTF-8, and finally CP1252 (or Latin-1 for the bytes CP1252
+leaves undefined) as long as the result does not look like control data.
+"""
+from __future__ import annotations
+
+import codecs
+import os
+import re
+
+# Size of the leading window inspected for each file
+SNIFF_BYTES = 8192
+# Byte order marks, longest first, with the codec decoding (and dropping) each
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+# Encodings that share ASCII's byte values, so bytes can be cut on b'\n'
+ASCII_COMPATIBLE = frozenset({'utf-8', 'utf-8-sig', 'cp1252', 'latin-1'})
+# Worst-case ratio of UTF-8 bytes to source bytes once a text is re-encoded
+# (encodings not listed never grow: UTF-8 itself and UTF-32)
+UTF8_GROWTH = {
+    'cp1252': 3,
+    'latin-1': 2,
+    'utf-16': 1.5,
+    'utf-16-le': 1.5,
+    'utf-16-be': 1.5,
+}
+# Largest share of control characters accepted in single-byte legacy text
+MAX_CONTROL_RATIO = 0.02
+# Control characters that do not occur in text (tab, line breaks, form feed
+# and escape do)
+_CONTROL = re.compile('[\x00-\x08\x0e-\x1a\x1c-\x1f\x7f-\x9f]')
+
+BINARY_EXTENSIONS = frozenset({
+    # Images
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.icns', '.webp', '.tif', '.tiff', '.psd',
+    # Archives and compressed data
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar', '.tar', '.zst', '.lz4',
+    # Compiled code and libraries
+    '.exe', '.dll', '.so', '.dylib', '.o', '.a', '.lib', '.class', '.jar', '.pyc', '.pyo',
+    '.pyd', '.whl', '.egg', '.wasm',
+    # Audio and video
+    '.mp3', '.mp4', '.m4a', '.wav', '.flac', '.ogg', '.avi', '.mov', '.mkv', '.webm',
+    # Fonts
+    '.ttf', '.otf', '.woff', '.woff2', '.eot',
+    # Office documents
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.odt',
+    # Databases, serialized data and model weights
+    '.sqlite', '.sqlite3', '.db', '.pkl', '.pickle', '.npy', '.npz', '.parquet', '.feather',
+    '.h5', '.hdf5', '.pt', '.pth', '.ckpt', '.safetensors', '.onnx', '.tflite', '.bin',
+})
+
+MAGIC_NUMBERS = (
+    b'\x89PNG\r\n\x1a\n',
+    b'\xff\xd8\xff',            # JPEG
+    b'GIF87a',
+    b'GIF89a',
+    b'PK\x03\x04',              # zip, jar, wheel, docx...
+    b'\x1f\x8b',                # gzip
+    b'\xfd7zXZ\x00',            # xz
+    b'7z\xbc\xaf\x27\x1c',
+    b'Rar!\x1a\x07',
+    b'(\xb5/\xfd',              # zstd
+    b'%PDF-',
+    b'\x7fELF',
+    b'\xca\xfe\xba\xbe',        # Mach-O fat binary / Java class
+    b'\xcf\xfa\xed\xfe',        # Mach-O 64-bit
+    b'\xce\xfa\xed\xfe',        # Mach-O 32-bit
+    b'\x00asm',                 # WebAssembly
+    b'SQLite format 3\x00',
+    b'OggS',
+    b'\x93NUMPY',
+)
+
+
+def has_binary_extension(filename: str) -> bool:
+    """
+    Tell whether a file name carries a known binary extension.
+
+    Args:
+        filename: Basename or path of the file.
+
+    Returns:
+        bool: True if the file can be skipped without opening it.
+    """
+    _, ext = os.path.splitext(filename)
+    return ext.lower() in BINARY_EXTENSIONS
+
+
+def _decodes(head: bytes, encoding: str) -> bool:
+    """Tell whether a window decodes, a character cut off at its end aside."""
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _utf16_without_bom(head: bytes) -> str | None:
+    """
+    Recognize UTF-16 without a byte order mark from its NUL bytes.
+
+    Mostly-ASCII UTF-16 has a NUL in one byte of most code units (the odd
+    ones in little endian) and almost never in the other.
+    """
+    units = len(head) // 2
+    if units < 2:
+        return None
+    even = head[0:units * 2:2].count(0)
+    odd = head[1:units * 2:2].count(0)
+    if odd * 2 > units and even * 10 <= odd:
+        return 'utf-16-le'
+    if even * 2 > units and odd * 10 <= even:
+        return 'utf-16-be'
+    return None
+
+
+def legacy_encoding(data: bytes) -> str | None:
+    """
+    Pick the single-byte encoding of text that is not valid UTF-8.
+
+    CP1252 is preferred (it is what Windows tools write, and it decodes
+    "smart" quotes and the euro sign); bytes it leaves undefined fall back to
+    Latin-1. Either way, text with more than ``MAX_CONTROL_RATIO`` control
+    characters is taken for binary data.
+
+    Args:
+        data: Bytes of the file, or of its leading window.
+
+    Returns:
+        str | None: ``'cp1252'``, ``'latin-1'``, or None if the bytes do not
+        look like text.
+
+    Example:
+        >>> legacy_encoding("Café à 5 €".encode("cp1252"))
+        'cp1252'
+    """
+    try:
+        text, encoding = data.decode('cp1252'), 'cp1252'
+    except UnicodeDecodeError:
+        text, encoding = data.decode('latin-1'), 'latin-1'
+    if len(_CONTROL.findall(text)) > len(text) * MAX_CONTROL_RATIO:
+        return None
+    return encoding
+
+
+def detect_encoding(head: bytes) -> str | None:
+    """
+    Choose how to decode a file from its leading byte window.
+
+    Args:
+        head: The first bytes of the file (typically ``SNIFF_BYTES``).
+
+    Returns:
+        str | None: A codec name (``'utf-8'``, ``'utf-8-sig'``, ``'utf-16'``,
+        ``'utf-16-le'``, ``'cp1252'``...), or None if the content is binary:
+        it starts with a known magic number, has NUL bytes that are not
+        UTF-16, or decodes with none of the candidates.
+
+    Example:
+        >>> detect_encoding("print('hé')".encode("utf-16"))
+        'utf-16'
+    """
+    if head.startswith(MAGIC_NUMBERS):
+        return None
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding if _decodes(head, encoding) else None
+    if b'\x00' in head:
+        encoding = _utf16_without_bom(head)
+        return encoding if encoding and _decodes(head, encoding) else None
+    if _decodes(head, 'utf-8'):
+        return 'utf-8'
+    return legacy_encoding(head)
+
+
+def looks_binary(head: bytes) -> bool:
+    """
+    Decide from a leading byte window whether content is binary.
+
+    Args:
+        head: The first bytes of the file (typically ``SNIFF_BYTES``).
+
+    Returns:
+        bool: True if the file should be skipped (see ``detect_encoding``).
+    """
+    return detect_encoding(head) is None
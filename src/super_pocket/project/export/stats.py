@@ -0,0 +1,193 @@
+"""
+Export statistics and progress.
+
+``--stats`` reports where an export spends its time: the wall time of each
+phase (scan, read and decode, render and write), the resulting throughput,
+why files were left out, and the largest files. Reading and writing are
+interleaved, so the read phase is the time the writer spent waiting for
+the reader pipeline (including skeleton and minification stages); the
+rest of the content loop is the write phase. A slow export with a large
+read share is bound by the disk or by decoding, one with a large write
+share by rendering or by the output.
+"""
+from __future__ import annotations
+
+import heapq
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    TextColumn,
+    TimeRemainingColumn,
+)
+
+from .scanner import FileRecord, ProjectIndex
+from .summary import ExportSummary, format_bytes
+
+# Number of largest files listed by default
+TOP_FILES = 10
+# Report order and labels of the phases
+PHASES = {
+    "scan": "Scan",
+    "changes": "Git changes",
+    "rank": "Import graph",
+    "read": "Read and decode",
+    "write": "Render and write",
+}
+
+T = TypeVar("T")
+
+
+@dataclass
+class PhaseTimer:
+    """Wall time spent in each phase of an export, in seconds."""
+    phases: dict[str, float] = field(default_factory=dict)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the ``with`` body to a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def split(self, phase: str, part: str, seconds: float) -> None:
+        """Move ``seconds`` of ``phase`` into another phase ``part``."""
+        seconds = min(seconds, self.phases.get(phase, 0.0))
+        self.phases[phase] = self.phases.get(phase, 0.0) - seconds
+        self.phases[part] = self.phases.get(part, 0.0) + seconds
+
+    @property
+    def total(self) -> float:
+        """Wall time of all phases."""
+        return sum(self.phases.values())
+
+
+def timed(contents: Iterable[T], summary: ExportSummary) -> Iterator[T]:
+    """
+    Pass items through, adding the time spent waiting for each one to
+    ``summary.read_seconds``.
+
+    Args:
+        contents: The reader pipeline.
+        summary: Summary of the export being written.
+
+    Yields:
+        The items of ``contents``, unchanged.
+    """
+    iterator = iter(contents)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            summary.read_seconds += time.perf_counter() - start
+            return
+        summary.read_seconds += time.perf_counter() - start
+        yield item
+
+
+def largest_files(index: ProjectIndex, count: int = TOP_FILES) -> list[FileRecord]:
+    """Return the ``count`` largest files of an index, largest first."""
+    return heapq.nlargest(count, index.iter_files(), key=lambda record: record.size)
+
+
+def _rate(amount: float, seconds: float) -> float:
+    return amount / seconds if seconds > 0 else 0.0
+
+
+def stats_lines(
+    timer: PhaseTimer,
+    summary: ExportSummary,
+    scanned: ProjectIndex,
+    exported: ProjectIndex | None = None,
+    top: int = TOP_FILES
+) -> list[str]:
+    """
+    Render the ``--stats`` report.
+
+    Args:
+        timer: Wall time of each phase.
+        summary: What the export wrote and skipped.
+        scanned: Index produced by the scan, with its skip counters.
+        exported: Files selected for export when fewer than ``scanned``
+                  (e.g. only changed files, or the files fitting a budget);
+                  defaults to ``scanned``.
+        top: Number of largest files to list.
+
+    Returns:
+        list[str]: Report lines.
+    """
+    exported = exported or scanned
+    total = timer.total
+    lines = ["|| Export statistics:"]
+    for name, label in PHASES.items():
+        if name in timer.phases:
+            seconds = timer.phases[name]
+            share = f" ({seconds / total:.0%})" if total > 0 else ""
+            lines.append(f"||   {label}: {seconds:.3f} s{share}")
+    lines.append(f"||   Total: {total:.3f} s")
+
+    source_bytes = sum(record.size for record in exported.iter_files()) - summary.binary_bytes_skipped
+    lines.append(
+        f"||   Throughput: {_rate(summary.files_written, total):.0f} files/s, "
+        f"{_rate(source_bytes, total) / 1024 ** 2:.1f} MB/s"
+    )
+
+    reasons = {
+        "excluded": scanned.skipped.get("excluded", 0),
+        "filtered": scanned.skipped.get("filtered", 0),
+        "not selected": scanned.file_count - exported.file_count if exported is not scanned else 0,
+        "binary": summary.binary_skipped,
+        "read errors": summary.errors,
+    }
+    skipped = ", ".join(f"{reason} {count}" for reason, count in reasons.items() if count)
+    lines.append(f"||   Skipped: {skipped or 'none'}")
+
+    largest = largest_files(exported, top)
+    if largest:
+        lines.append("||   Largest files:")
+        width = max(len(format_bytes(record.size)) for record in largest)
+        for record in largest:
+            lines.append(f"||     {format_bytes(record.size):>{width}}  {record.relative_path}")
+    return lines
+
+
+@contextmanager
+def progress_bar(console: Console, total: int, enabled: bool = True) -> Iterator[Callable[[FileRecord], None]]:
+    """
+    Show a progress bar advanced once per exported file.
+
+    Nothing is shown when ``enabled`` is false or when the console is not a
+    terminal, so redirected output stays free of control sequences.
+
+    Args:
+        console: Console the bar is drawn on; messages printed on it during
+                 the export appear above the bar.
+        total: Number of files to export.
+        enabled: Whether the bar may be shown at all.
+
+    Yields:
+        Callable[[FileRecord], None]: Callback to call for each file.
+    """
+    if not enabled or not console.is_terminal:
+        yield lambda record: None
+        return
+
+    columns = (
+        TextColumn("|| Exporting"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeRemainingColumn(),
+    )
+    with Progress(*columns, console=console, transient=True) as progress:
+        task = progress.add_task("export", total=total)
+        yield lambda record: progress.advance(task)
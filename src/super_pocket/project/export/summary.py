@@ -0,0 +1,159 @@
+"""
+Export summary.
+
+Counters collected while an export is written, and the helpers used to
+report them at the end of the run.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+
+def format_bytes(size: int) -> str:
+    """
+    Format a byte count for humans.
+
+    Args:
+        size: Number of bytes.
+
+    Returns:
+        str: The size with a binary unit, e.g. '1.5 MB'.
+    """
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+@dataclass
+class ExportSummary:
+    """Counters describing what an export wrote and what it skipped."""
+    files_written: int = 0
+    binary_skipped: int = 0
+    binary_bytes_skipped: int = 0
+    errors: int = 0
+    duplicates: int = 0
+    duplicate_bytes_saved: int = 0
+    truncated: int = 0
+    truncated_bytes_omitted: int = 0
+    skeletons: int = 0
+    skeleton_bytes_saved: int = 0
+    minified: int = 0
+    minified_bytes_saved: int = 0
+    redacted: dict[str, dict[str, int]] = field(default_factory=dict)
+    encodings: Counter[str] = field(default_factory=Counter)
+    read_seconds: float = 0.0
+    shards: list[str] = field(default_factory=list)
+
+    def add_binary(self, size: int) -> None:
+        """Account for a binary file left out of the export."""
+        self.binary_skipped += 1
+        self.binary_bytes_skipped += size
+
+    def add_duplicate(self, saved: int) -> None:
+        """Account for a file written as a reference to an identical one."""
+        self.duplicates += 1
+        self.duplicate_bytes_saved += max(saved, 0)
+
+    def add_truncated(self, omitted: int) -> None:
+        """Account for a file exported as a head/tail excerpt."""
+        self.truncated += 1
+        self.truncated_bytes_omitted += omitted
+
+    def add_skeleton(self, saved: int) -> None:
+        """Account for a Python file reduced to its skeleton."""
+        self.skeletons += 1
+        self.skeleton_bytes_saved += max(saved, 0)
+
+    def add_minified(self, saved: int) -> None:
+        """Account for a file whose comments and blank lines were removed."""
+        self.minified += 1
+        self.minified_bytes_saved += saved
+
+    def add_encoding(self, encoding: str | None) -> None:
+        """Account for a text file decoded with something other than UTF-8."""
+        if encoding is not None and encoding != 'utf-8':
+            self.encodings[encoding] += 1
+
+    def add_redacted(self, relative_path: str, counts: dict[str, int]) -> None:
+        """Account for the secrets replaced in a file, per detector."""
+        self.redacted[relative_path] = dict(counts)
+
+    @property
+    def redactions(self) -> Counter[str]:
+        """Number of secrets replaced per detector, over all files."""
+        total: Counter[str] = Counter()
+        for counts in self.redacted.values():
+            total.update(counts)
+        return total
+
+    def merge(self, other: ExportSummary) -> None:
+        """Add the counters of another summary (e.g. of one shard) to this one."""
+        self.files_written += other.files_written
+        self.binary_skipped += other.binary_skipped
+        self.binary_bytes_skipped += other.binary_bytes_skipped
+        self.errors += other.errors
+        self.duplicates += other.duplicates
+        self.duplicate_bytes_saved += other.duplicate_bytes_saved
+        self.truncated += other.truncated
+        self.truncated_bytes_omitted += other.truncated_bytes_omitted
+        self.skeletons += other.skeletons
+        self.skeleton_bytes_saved += other.skeleton_bytes_saved
+        self.minified += other.minified
+        self.minified_bytes_saved += other.minified_bytes_saved
+        self.redacted.update(other.redacted)
+        self.encodings.update(other.encodings)
+        self.read_seconds += other.read_seconds
+        self.shards.extend(other.shards)
+
+    def lines(self) -> list[str]:
+        """
+        Render the summary as report lines.
+
+        Returns:
+            list[str]: One line per non-empty counter.
+        """
+        lines = [f"|| Files exported: {self.files_written}"]
+        if self.binary_skipped:
+            lines.append(
+                f"|| Binary files skipped: {self.binary_skipped} "
+                f"({format_bytes(self.binary_bytes_skipped)} not read)"
+            )
+        if self.duplicates:
+            lines.append(
+                f"|| Duplicate files referenced: {self.duplicates} "
+                f"({format_bytes(self.duplicate_bytes_saved)} saved)"
+            )
+        if self.truncated:
+            lines.append(
+                f"|| Files truncated: {self.truncated} "
+                f"({format_bytes(self.truncated_bytes_omitted)} omitted)"
+            )
+        if self.skeletons:
+            lines.append(
+                f"|| Python files reduced to skeletons: {self.skeletons} "
+                f"({format_bytes(self.skeleton_bytes_saved)} saved)"
+            )
+        if self.minified:
+            lines.append(
+                f"|| Files minified: {self.minified} "
+                f"({format_bytes(self.minified_bytes_saved)} saved)"
+            )
+        if self.encodings:
+            encodings = ", ".join(f"{name} {count}" for name, count in self.encodings.most_common())
+            lines.append(f"|| Non-UTF-8 files decoded: {sum(self.encodings.values())} ({encodings})")
+        if self.redacted:
+            redactions = self.redactions
+            detectors = ", ".join(f"{name} {count}" for name, count in redactions.most_common())
+            lines.append(
+                f"|| Secrets redacted: {sum(redactions.values())} in {len(self.redacted)} file(s) "
+                f"({detectors})"
+            )
+        if self.errors:
+            lines.append(f"|| Files with read errors: {self.errors}")
+        if self.shards:
+            lines.append(f"|| Shards written: {len(self.shards)}")
+        return lines
@@ -0,0 +1,260 @@
+"""
+Head/tail truncation of oversized files.
+
+A single fixture or log file can dominate an export. With per-file limits,
+a file above ``max_bytes`` or ``max_lines`` is exported as its first and last
+lines around a marker. The head is read forward from the start and the tail
+backward from the end with ``seek``, so the middle of the file is never read.
+
+Because the middle is skipped, the number of omitted lines is estimated from
+the line density of the head and tail, while the number of omitted bytes is
+exact.
+
+With only a line limit, each end is scanned within ``LINE_SCAN_BYTES``
+rather than loaded whole to find its line breaks. When the two windows do
+not hold enough lines to decide, the line breaks of the middle are counted
+in ``SCAN_SIZE`` chunks that are not kept: a file within the limit is then
+exported whole, and a longer one is cut at the windows. A file that fits
+in the windows is handed back whole from the bytes already read.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+# Size of the reads used to look for line breaks from either end
+SCAN_SIZE = 64 * 1024
+# Bytes scanned from either end for line breaks when no byte limit applies
+# (the same as reader.STREAM_THRESHOLD)
+LINE_SCAN_BYTES = 1024 * 1024
+# Bytes reserved for the truncation marker line when bounding a block's size
+MARKER_RESERVE = 96
+
+
+@dataclass(frozen=True, slots=True)
+class TruncationLimits:
+    """Per-file size caps; a file exceeding either one is truncated."""
+    max_bytes: int | None = None
+    max_lines: int | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.max_bytes or self.max_lines)
+
+    @property
+    def signature(self) -> str:
+        """Identify the limits in cache signatures."""
+        return f"max-file-bytes={self.max_bytes};max-file-lines={self.max_lines}"
+
+    def content_bound(self, size: int) -> int:
+        """Upper bound of the exported content size of a file of ``size`` bytes."""
+        if self.max_bytes is None:
+            return size
+        return min(size, self.max_bytes + MARKER_RESERVE)
+
+
+@dataclass(frozen=True, slots=True)
+class Excerpt:
+    """
+    The kept start and end of a truncated file.
+
+    An excerpt omitting nothing holds the whole file in ``head``.
+    """
+    head: bytes
+    tail: bytes
+    omitted_bytes: int
+
+    @property
+    def omitted_lines(self) -> int:
+        """Estimated number of lines in the skipped middle."""
+        sampled = len(self.head) + len(self.tail)
+        if not sampled:
+            return 0
+        newlines = self.head.count(b'\n') + self.tail.count(b'\n')
+        return math.ceil(self.omitted_bytes * newlines / sampled)
+
+    def render(self, encoding: str = 'utf-8') -> str:
+        """
+        Decode the excerpt with the truncation marker on its own line.
+
+        Args:
+            encoding: Codec of the file; it must be ASCII compatible, since
+                      the excerpt is cut on ``\\n`` bytes.
+
+        Raises:
+            UnicodeDecodeError: If the kept bytes do not decode.
+        """
+        head = self.head.decode(encoding)
+        tail = self.tail.decode(encoding)
+        if head and not head.endswith(('\n', '\r')):
+            head += '\n'
+        marker = (
+            f"[... truncated: {self.omitted_bytes:,} bytes "
+            f"(~{self.omitted_lines:,} lines) omitted ...]\n"
+        )
+        return (head + marker + tail).replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _complete_prefix(data: bytes) -> bytes:
+    """Drop a UTF-8 character cut off at the end of ``data``."""
+    i = len(data) - 1
+    while i >= 0 and data[i] & 0xC0 == 0x80 and len(data) - i < 4:
+        i -= 1
+    if i < 0:
+        return data
+    lead = data[i]
+    width = 1 if lead < 0xC0 else 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+    return data if i + width <= len(data) else data[:i]
+
+
+def _read_head(handle, limit: int, lines: int | None) -> bytes:
+    """
+    Read the first ``lines`` lines of a file, within ``limit`` bytes.
+
+    When the byte limit is reached first, the head is cut after its last line
+    break, or on a character boundary if it has none.
+    """
+    handle.seek(0)
+    parts: list[bytes] = []
+    read = 0
+    found = 0
+    while read < limit:
+        data = handle.read(min(SCAN_SIZE, limit - read))
+        if not data:
+            return b''.join(parts)
+        if lines is not None:
+            count = data.count(b'\n')
+            if found + count >= lines:
+                pos = -1
+                for _ in range(lines - found):
+                    pos = data.index(b'\n', pos + 1)
+                parts.append(data[:pos + 1])
+                return b''.join(parts)
+            found += count
+        parts.append(data)
+        read += len(data)
+
+    head = b''.join(parts)
+    newline = head.rfind(b'\n')
+    if newline >= 0:
+        return head[:newline + 1]
+    return _complete_prefix(head)
+
+
+def _read_tail(handle, size: int, limit: int, lines: int | None, floor: int) -> tuple[int, bytes]:
+    """
+    Read the last ``lines`` lines of a file backward, within ``limit`` bytes.
+
+    Reading stops at ``floor`` (the end of the head). When the byte limit is
+    reached first, the tail starts after its first line break, or on a
+    character boundary if it has none.
+
+    Returns:
+        tuple[int, bytes]: The offset where the tail starts and its bytes.
+    """
+    start_min = max(floor, size - limit)
+    if lines is not None:
+        handle.seek(size - 1)
+        # A final line break ends the last line rather than separating two
+        wanted = lines + (1 if size and handle.read(1) == b'\n' else 0)
+    parts: list[bytes] = []
+    pos = size
+    found = 0
+    while pos > start_min:
+        step = min(SCAN_SIZE, pos - start_min)
+        pos -= step
+        handle.seek(pos)
+        data = handle.read(step)
+        if lines is not None and wanted:
+            count = data.count(b'\n')
+            if found + count >= wanted:
+                cut = len(data)
+                for _ in range(wanted - found):
+                    cut = data.rindex(b'\n', 0, cut)
+                parts.append(data[cut + 1:])
+                parts.reverse()
+                return pos + cut + 1, b''.join(parts)
+            found += count
+        parts.append(data)
+
+    parts.reverse()
+    tail = b''.join(parts)
+    if pos > floor:
+        # The file's final line break does not start a line
+        newline = tail.find(b'\n', 0, len(tail) - 1)
+        if newline >= 0:
+            return pos + newline + 1, tail[newline + 1:]
+        index = 0
+        while index < len(tail) and tail[index] & 0xC0 == 0x80:
+            index += 1
+        return pos + index, tail[index:]
+    return pos, tail
+
+
+def _exceeds_lines(handle, start: int, end: int, found: int, limit: int) -> bool:
+    """
+    Count the line breaks between ``start`` and ``end`` without keeping the bytes.
+
+    Args:
+        found: Lines already counted elsewhere in the file.
+        limit: Number of lines the file may hold.
+
+    Returns:
+        bool: Whether the file holds more than ``limit`` lines; the count
+        stops as soon as it does.
+    """
+    handle.seek(start)
+    while start < end and found <= limit:
+        data = handle.read(min(SCAN_SIZE, end - start))
+        if not data:
+            break
+        found += data.count(b'\n')
+        start += len(data)
+    return found > limit
+
+
+def read_excerpt(handle, size: int, limits: TruncationLimits) -> Excerpt | None:
+    """
+    Read the head and tail of a file that exceeds its limits.
+
+    Args:
+        handle: Binary file handle, positioned anywhere.
+        size: Size of the file in bytes.
+        limits: The per-file caps. Each is split between the head (first
+                half, rounded up) and the tail.
+
+    Returns:
+        Excerpt | None: The head, tail and omitted byte count. When the file
+        fits within the limits, an excerpt omitting nothing if it was read
+        in full while looking for line breaks, otherwise None.
+    """
+    over_bytes = limits.max_bytes is not None and size > limits.max_bytes
+    if not over_bytes and not limits.max_lines:
+        return None
+
+    head_limit = tail_limit = min(size, LINE_SCAN_BYTES)
+    if over_bytes:
+        head_limit = (limits.max_bytes + 1) // 2
+        tail_limit = limits.max_bytes - head_limit
+    head_lines = tail_lines = None
+    if limits.max_lines:
+        head_lines = (limits.max_lines + 1) // 2
+        tail_lines = limits.max_lines - head_lines
+
+    head = _read_head(handle, head_limit, head_lines)
+    if len(head) >= size:
+        return Excerpt(head=head, tail=b'', omitted_bytes=0)
+    if tail_limit and tail_lines != 0:
+        tail_start, tail = _read_tail(handle, size, tail_limit, tail_lines, len(head))
+    else:
+        tail_start, tail = size, b''
+    if tail_start <= len(head):
+        # The head and the tail meet: they are the whole file
+        return Excerpt(head=head + tail, tail=b'', omitted_bytes=0)
+    if not over_bytes:
+        # A line limit alone: the middle decides whether the file is too long.
+        # A last line without a line break counts like one that has it.
+        handle.seek(size - 1)
+        found = head.count(b'\n') + tail.count(b'\n') + (handle.read(1) != b'\n')
+        if not _exceeds_lines(handle, len(head), tail_start, found, limits.max_lines):
+            return None
+    return Excerpt(head=head, tail=tail, omitted_bytes=tail_start - len(head))
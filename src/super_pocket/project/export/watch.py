@@ -0,0 +1,471 @@
+"""
+Live exports that follow changes to the project.
+
+A watched export keeps the scan index in memory and waits for file system
+events: inotify on Linux, or a stat-based poll of the indexed files and
+directories elsewhere. Bursts of events are debounced into one update.
+
+An update only re-renders the sections of the document that changed: the
+tree header when files were added or removed, and the blocks of files whose
+stat data changed. Every other section is copied byte for byte from the
+previous document, which is then atomically replaced, so readers never see
+a half-written export.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+from .ignore import IGNORE_FILES
+from .scanner import DirectoryNode, FileRecord, ProjectIndex
+
+# Quiet period closing a burst of events, in seconds
+DEBOUNCE_SECONDS = 0.3
+# Interval between two polls of the fallback watcher, in seconds
+POLL_INTERVAL = 1.0
+
+# inotify(7) event masks
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_ISDIR = 0x40000000
+_IN_ONLYDIR = 0x01000000
+_CONTENT_EVENTS = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_ATTRIB
+_STRUCTURE_EVENTS = (
+    _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+@dataclass
+class Changes:
+    """Paths reported by a watcher, and whether the tree itself changed."""
+    paths: set[str] = field(default_factory=set)
+    structural: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.paths) or self.structural
+
+    def merge(self, other: Changes) -> None:
+        """Fold the changes of a later event batch into these ones."""
+        self.paths |= other.paths
+        self.structural = self.structural or other.structural
+
+
+def _directories(node: DirectoryNode) -> Iterable[DirectoryNode]:
+    """Iterate over a directory node and all its subdirectories."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(current.directories)
+
+
+class InotifyWatcher:
+    """Watches every indexed directory through Linux inotify."""
+
+    def __init__(self, index: ProjectIndex, ignore_paths: Iterable[str] = ()):
+        """
+        Start watching the directories of a project.
+
+        Args:
+            index: The scanned project.
+            ignore_paths: Files whose events are never reported (the export
+                          itself and its temporary file).
+
+        Raises:
+            OSError: If inotify is not available.
+        """
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = index.root
+        self.ignored = {os.path.abspath(path) for path in ignore_paths}
+        self.directories: dict[int, str] = {}
+        self.sync(index)
+
+    def sync(self, index: ProjectIndex) -> None:
+        """Watch the directories that appeared since the last scan."""
+        watched = set(self.directories.values())
+        mask = _CONTENT_EVENTS | _STRUCTURE_EVENTS | _IN_ONLYDIR
+        for node in _directories(index.tree):
+            if node.relative_path in watched:
+                continue
+            path = os.path.join(self.root, node.relative_path)
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+            if wd >= 0:
+                self.directories[wd] = node.relative_path
+
+    def wait(self, timeout: float | None) -> Changes:
+        """
+        Block until events arrive or ``timeout`` seconds pass.
+
+        Args:
+            timeout: Maximum wait, or None to wait without limit.
+
+        Returns:
+            Changes: Reported project-relative paths (empty on timeout).
+        """
+        changes = Changes()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return changes
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changes
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                changes.structural = True
+                continue
+            directory = self.directories.get(wd)
+            if directory is None:
+                continue
+            if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                del self.directories[wd]
+                changes.structural = True
+                continue
+            relative_path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            if os.path.join(self.root, relative_path) in self.ignored:
+                continue
+            if mask & _STRUCTURE_EVENTS or mask & _IN_ISDIR:
+                changes.structural = True
+            else:
+                changes.paths.add(relative_path)
+        return changes
+
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Detects changes by comparing the stat data of indexed paths."""
+
+    def __init__(self, index: ProjectIndex, interval: float = POLL_INTERVAL):
+        """
+        Take a first snapshot of a project.
+
+        Args:
+            index: The scanned project.
+            interval: Seconds between two polls.
+        """
+        self.interval = interval
+        self.root = index.root
+        self.sync(index)
+
+    def sync(self, index: ProjectIndex) -> None:
+        """Replace the snapshot with the stat data of a new scan."""
+        self.files = {record.relative_path: (record.mtime_ns, record.size) for record in index.iter_files()}
+        self.directories = {node.relative_path: self._dir_mtime(node.relative_path) for node in _directories(index.tree)}
+
+    def _dir_mtime(self, relative_path: str) -> int | None:
+        try:
+            return os.stat(os.path.join(self.root, relative_path)).st_mtime_ns
+        except OSError:
+            return None
+
+    def poll(self) -> Changes:
+        """Compare the snapshot with the file system once."""
+        changes = Changes()
+        for relative_path, previous in self.directories.items():
+            current = self._dir_mtime(relative_path)
+            if current != previous:
+                self.directories[relative_path] = current
+                changes.structural = True
+        for relative_path, previous in self.files.items():
+            try:
+                stat = os.stat(os.path.join(self.root, relative_path))
+            except OSError:
+                changes.structural = True
+                continue
+            current = (stat.st_mtime_ns, stat.st_size)
+            if current != previous:
+                self.files[relative_path] = current
+                changes.paths.add(relative_path)
+        return changes
+
+    def wait(self, timeout: float | None) -> Changes:
+        """
+        Poll until something changed or ``timeout`` seconds pass.
+
+        Args:
+            timeout: Maximum wait, or None to wait without limit.
+
+        Returns:
+            Changes: Modified project-relative paths (empty on timeout).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval if deadline is None else min(self.interval, max(deadline - time.monotonic(), 0))
+            time.sleep(delay)
+            changes = self.poll()
+            if changes or (deadline is not None and time.monotonic() >= deadline):
+                return changes
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+def open_watcher(index: ProjectIndex, ignore_paths: Iterable[str] = ()) -> InotifyWatcher | PollingWatcher:
+    """
+    Create the best available watcher for a project.
+
+    Args:
+        index: The scanned project.
+        ignore_paths: Files whose events must be ignored.
+
+    Returns:
+        InotifyWatcher | PollingWatcher: inotify on Linux, polling otherwise.
+    """
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(index, ignore_paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(index)
+
+
+def wait_for_changes(watcher, debounce: float = DEBOUNCE_SECONDS) -> Changes:
+    """
+    Wait for a burst of changes and return it once it has settled.
+
+    Args:
+        watcher: An ``InotifyWatcher`` or ``PollingWatcher``.
+        debounce: Quiet period, in seconds, that ends the burst.
+
+    Returns:
+        Changes: Every change reported during the burst.
+    """
+    changes = Changes()
+    while not changes:
+        changes = watcher.wait(None)
+    while more := watcher.wait(debounce):
+        changes.merge(more)
+    return changes
+
+
+class _CountingWriter:
+    """Text sink encoding to UTF-8 and tracking the byte position."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.position = 0
+
+    def write(self, text: str) -> int:
+        data = text.encode('utf-8')
+        self.raw.write(data)
+        self.position += len(data)
+        return len(text)
+
+    def seekable(self) -> bool:
+        return False
+
+
+@dataclass(slots=True)
+class _Section:
+    """A range of the document: the header (key None) or one file's block."""
+    key: str | None
+    offset: int
+    length: int
+    stamp: tuple[int, int] | None = None
+
+
+class LiveExport:
+    """
+    A document kept in sync with an in-memory project index.
+
+    The document is made of a header section followed by one section per
+    file, in index order. Their byte ranges are remembered so that an update
+    can copy unchanged sections from the previous document.
+    """
+
+    def __init__(
+        self,
+        output_file: str,
+        scan: Callable[[], ProjectIndex],
+        write_header: Callable[[object, ProjectIndex], None],
+        write_files: Callable[[object, list[FileRecord], Callable[[FileRecord], None]], None]
+    ):
+        """
+        Initialize the live export.
+
+        Args:
+            output_file: Path of the document.
+            scan: Scans the project and returns a fresh index.
+            write_header: Writes the header of the document for an index.
+            write_files: Writes the blocks of some files, calling its third
+                         argument before each block.
+        """
+        self.output_file = output_file
+        self.temp_file = f"{output_file}.tmp"
+        self.scan = scan
+        self.write_header = write_header
+        self.write_files = write_files
+        self.index: ProjectIndex | None = None
+        self.records: dict[str, FileRecord] = {}
+        self.sections: list[_Section] = []
+
+    def build(self) -> ProjectIndex:
+        """Scan the project and write the whole document."""
+        index = self.scan()
+        self._write(index, dirty=None)
+        return index
+
+    def update(self, changes: Changes) -> int:
+        """
+        Apply a batch of changes to the document.
+
+        Args:
+            changes: Paths reported by the watcher.
+
+        Returns:
+            int: Number of sections re-rendered (0 if the document is unchanged).
+        """
+        index = self.index
+        if any(os.path.basename(path) in IGNORE_FILES for path in changes.paths):
+            changes.structural = True
+        if not changes.structural:
+            for relative_path in changes.paths:
+                record = self.records.get(relative_path)
+                if record is None:
+                    continue
+                try:
+                    stat = os.stat(record.path)
+                except OSError:
+                    changes.structural = True
+                    break
+                record.size = stat.st_size
+                record.mtime_ns = stat.st_mtime_ns
+        if changes.structural:
+            index = self.scan()
+        return self._write(index, dirty=changes.paths)
+
+    def _write(self, index: ProjectIndex, dirty: set[str] | None) -> int:
+        """Write the document for ``index``, reusing clean sections."""
+        previous = {section.key: section for section in self.sections}
+        records = list(index.iter_files())
+        keys = [record.relative_path for record in records]
+
+        def is_clean(record: FileRecord) -> bool:
+            section = previous.get(record.relative_path)
+            return (
+                dirty is not None
+                and section is not None
+                and record.relative_path not in dirty
+                and section.stamp == (record.mtime_ns, record.size)
+            )
+
+        header_clean = dirty is not None and keys == [section.key for section in self.sections[1:]]
+        rendered = 0 if header_clean else 1
+        rendered += sum(1 for record in records if not is_clean(record))
+        if dirty is not None and rendered == 0:
+            return 0
+
+        sections: list[_Section] = []
+        with open(self.temp_file, 'wb') as raw:
+            writer = _CountingWriter(raw)
+            old = open(self.output_file, 'rb') if dirty is not None else None
+            try:
+                start = writer.position
+                if header_clean:
+                    self._copy(old, previous[None], writer)
+                else:
+                    self.write_header(writer, index)
+                sections.append(_Section(None, start, writer.position - start))
+
+                pending: list[FileRecord] = []
+
+                def flush() -> None:
+                    if not pending:
+                        return
+                    starts: list[tuple[FileRecord, int]] = []
+                    self.write_files(writer, pending, lambda record: starts.append((record, writer.position)))
+                    ends = [position for _, position in starts[1:]] + [writer.position]
+                    for (record, begin), end in zip(starts, ends):
+                        sections.append(_Section(record.relative_path, begin, end - begin, (record.mtime_ns, record.size)))
+                    pending.clear()
+
+                for record in records:
+                    if is_clean(record):
+                        flush()
+                        section = previous[record.relative_path]
+                        start = writer.position
+                        self._copy(old, section, writer)
+                        sections.append(_Section(section.key, start, section.length, section.stamp))
+                    else:
+                        pending.append(record)
+                flush()
+            finally:
+                if old is not None:
+                    old.close()
+        os.replace(self.temp_file, self.output_file)
+
+        self.index = index
+        self.records = {record.relative_path: record for record in records}
+        self.sections = sections
+        return rendered
+
+    @staticmethod
+    def _copy(source, section: _Section, writer: _CountingWriter) -> None:
+        """Copy one section of the previous document."""
+        source.seek(section.offset)
+        remaining = section.length
+        while remaining:
+            data = source.read(min(remaining, 1024 * 1024))
+            if not data:
+                break
+            writer.raw.write(data)
+            remaining -= len(data)
+        writer.position += section.length
+
+
+def watch_loop(
+    live: LiveExport,
+    watcher,
+    on_update: Callable[[int, Changes], None],
+    max_updates: int | None = None
+) -> None:
+    """
+    Keep a live export up to date until interrupted.
+
+    Args:
+        live: The export, already built.
+        watcher: Source of change events.
+        on_update: Called with the number of re-rendered sections after each
+                   update that touched the document.
+        max_updates: Stop after this many batches of changes (for tests).
+    """
+    handled = 0
+    while max_updates is None or handled < max_updates:
+        changes = wait_for_changes(watcher)
+        structural = changes.structural
+        rendered = live.update(changes)
+        if structural or changes.structural:
+            watcher.sync(live.index)
+        if rendered:
+            on_update(rendered, changes)
+        handled += 1
+
@@ -0,0 +1,247 @@
+"""
+Structured output formats for the project exporter.
+
+Markdown is the default, human-oriented format. Machine consumers can
+instead ask for one record per exported file (path, language, size, hash,
+source encoding and content) through a writer registered here:
+
+* ``jsonl`` writes one JSON object per line, so a reader can stream the
+  export and stop at the file it needs;
+* ``sqlite`` writes a database with a ``files`` table and an FTS5 full-text
+  index over paths and contents, so the export can be queried without being
+  loaded whole.
+
+New formats subclass ``ExportWriter`` and are registered with
+``register_writer``.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import tempfile
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+
+from .outputs import compression_of, is_stdout, open_output, split_compression
+
+# Size above which a JSONL record being built spills to a temporary file
+SPOOL_BYTES = 1024 * 1024
+
+
+@dataclass(slots=True)
+class ExportEntry:
+    """Metadata of one exported file."""
+    path: str
+    language: str
+    size: int
+    sha256: str | None
+    truncated: bool = False
+    encoding: str = "utf-8"
+
+
+class ExportWriter:
+    """
+    Base class of the structured output formats.
+
+    A writer is used as a context manager; ``write_file`` is called once per
+    exported file, in export order, with its decoded content in chunks.
+    """
+    name = ""
+    extension = ""
+    # Whether the format can be written to stdout or through a compressor
+    streamable = False
+
+    def __init__(self, output_file: str, project_name: str):
+        """
+        Open the output.
+
+        Args:
+            output_file: Destination path; if the format is streamable, also
+                         ``-`` for stdout or a file-like object.
+            project_name: Name of the exported project.
+        """
+        self.output_file = output_file
+        self.project_name = project_name
+
+    def write_file(self, entry: ExportEntry, chunks: Iterable[str]) -> None:
+        """
+        Write one file.
+
+        Args:
+            entry: The file's metadata.
+            chunks: Its decoded content. Iterating may raise (e.g. when a
+                    streamed file turns out to be binary), in which case
+                    nothing must be written for the file.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Finish the output."""
+
+    def __enter__(self) -> ExportWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+
+WRITERS: dict[str, type[ExportWriter]] = {}
+
+
+def register_writer(cls: type[ExportWriter]) -> type[ExportWriter]:
+    """
+    Register an output format under its ``name``.
+
+    Args:
+        cls: The writer class.
+
+    Returns:
+        type[ExportWriter]: ``cls``, so this can be used as a decorator.
+    """
+    WRITERS[cls.name] = cls
+    return cls
+
+
+def format_for(output_file: str | None) -> str:
+    """
+    Infer the output format from an output file name.
+
+    Args:
+        output_file: Output path, possibly compressed (``export.jsonl.gz``).
+
+    Returns:
+        str: The name of the registered format whose extension matches, or
+        ``'markdown'``.
+    """
+    if not output_file:
+        return "markdown"
+    name = split_compression(output_file)[0].lower()
+    for writer in WRITERS.values():
+        if name.endswith(writer.extension):
+            return writer.name
+    return "markdown"
+
+
+@register_writer
+class JsonlWriter(ExportWriter):
+    """
+    One JSON object per line: path, language, size, sha256, content.
+
+    ``truncated`` and ``encoding`` are only present when the file was cut or
+    was not UTF-8.
+    """
+    name = "jsonl"
+    extension = ".jsonl"
+    streamable = True
+
+    def __init__(self, output_file: str, project_name: str):
+        super().__init__(output_file, project_name)
+        self._stack = contextlib.ExitStack()
+        self.stream = self._stack.enter_context(open_output(output_file))
+
+    def write_file(self, entry: ExportEntry, chunks: Iterable[str]) -> None:
+        """Write one record; large contents are built in a spooled buffer first."""
+        fields = asdict(entry)
+        if not entry.truncated:
+            del fields["truncated"]
+        if entry.encoding == "utf-8":
+            del fields["encoding"]
+        prefix = json.dumps(fields, ensure_ascii=False)[:-1] + ', "content": "'
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES, mode='w+', encoding='utf-8') as spool:
+            for chunk in chunks:
+                spool.write(json.dumps(chunk, ensure_ascii=False)[1:-1])
+            spool.seek(0)
+            self.stream.write(prefix)
+            while data := spool.read(SPOOL_BYTES):
+                self.stream.write(data)
+            self.stream.write('"}\n')
+
+    def close(self) -> None:
+        self._stack.close()
+
+
+@register_writer
+class SqliteWriter(ExportWriter):
+    """
+    SQLite database with a ``files`` table and a ``files_fts`` FTS5 index.
+
+    Example query::
+
+        SELECT path FROM files_fts WHERE files_fts MATCH 'create_codebase_markdown';
+    """
+    name = "sqlite"
+    extension = ".sqlite"
+
+    SCHEMA = """
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE files (
+            id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
+            language TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            sha256 TEXT,
+            truncated INTEGER NOT NULL DEFAULT 0,
+            encoding TEXT NOT NULL DEFAULT 'utf-8',
+            content TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, output_file: str, project_name: str):
+        super().__init__(output_file, project_name)
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        self.connection = sqlite3.connect(output_file)
+        self.connection.executescript(self.SCHEMA)
+        self.connection.execute("INSERT INTO meta VALUES ('project', ?)", (project_name,))
+        self.has_fts = True
+        try:
+            self.connection.execute(
+                "CREATE VIRTUAL TABLE files_fts USING fts5(path, content, content='files', content_rowid='id')"
+            )
+        except sqlite3.OperationalError:
+            self.has_fts = False
+
+    def write_file(self, entry: ExportEntry, chunks: Iterable[str]) -> None:
+        """Insert one row; the full-text index is built once at the end."""
+        content = "".join(chunks)
+        self.connection.execute(
+            "INSERT INTO files (path, language, size, sha256, truncated, encoding, content) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (entry.path, entry.language, entry.size, entry.sha256, int(entry.truncated), entry.encoding, content)
+        )
+
+    def close(self) -> None:
+        try:
+            if self.has_fts:
+                self.connection.execute("INSERT INTO files_fts(files_fts) VALUES ('rebuild')")
+            self.connection.commit()
+        finally:
+            self.connection.close()
+
+
+def open_writer(output_format: str, output_file: str, project_name: str) -> ExportWriter:
+    """
+    Create the writer of a registered format.
+
+    Args:
+        output_format: Registered format name.
+        output_file: Destination path, or a file-like object.
+        project_name: Name of the exported project.
+
+    Returns:
+        ExportWriter: The opened writer.
+
+    Raises:
+        ValueError: If the format is unknown, or cannot be written to
+                    ``output_file`` (stdout, compressed or a stream).
+    """
+    try:
+        cls = WRITERS[output_format]
+    except KeyError:
+        raise ValueError(f"Unknown output format: {output_format}") from None
+    if not cls.streamable and (not isinstance(output_file, str) or is_stdout(output_file) or compression_of(output_file)):
+        raise ValueError(f"The {output_format} format needs a plain output file")
+    return cls(output_file, project_name)
@@ -0,0 +1,237 @@
+"""
+Streaming library API for project exports.
+
+``create_codebase_markdown`` is the command-line entry point: it writes to a
+path and reports progress on the console. Services embedding super-pocket
+can instead stream an export without temporary files:
+
+* ``iter_markdown`` yields the Markdown document in chunks;
+* ``iter_records`` yields one ``ExportRecord`` (metadata and content) per file;
+* ``export_to`` writes the document, or a streamable format such as JSONL,
+  into any text or binary file-like object.
+
+All of them are silent unless ``ExportOptions.quiet`` is turned off.
+Generators are lazy: the export is produced on a background thread that
+stays at most ``QUEUE_SIZE`` chunks ahead of the consumer, and stops when
+the generator is closed.
+
+Example:
+    >>> from super_pocket.project.stream import ExportOptions, iter_markdown
+    >>> for chunk in iter_markdown("my-app", ExportOptions(jobs=4)):
+    ...     response.write(chunk)
+"""
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import IO
+
+from super_pocket.project.export.archives import is_archive, open_archive
+from super_pocket.project.export.dedup import Deduplicator
+from super_pocket.project.export.document import (
+    write_document,
+    write_index,
+    write_records,
+)
+from super_pocket.project.export.options import ExportOptions
+from super_pocket.project.export.scanner import ProjectIndex
+from super_pocket.project.export.summary import ExportSummary
+from super_pocket.project.export.writers import ExportEntry, ExportWriter
+
+# Chunks or records produced ahead of the consumer
+QUEUE_SIZE = 64
+
+
+@dataclass(slots=True)
+class ExportRecord:
+    """One exported file: its metadata and its rendered content."""
+    entry: ExportEntry
+    content: str
+
+
+class _CancelledError(Exception):
+    """Raised in the producer thread once the consumer has gone away."""
+
+
+class _Failure:
+    """An exception raised by the producer, handed over to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_DONE = object()
+
+
+def _produced(produce: Callable[[Callable[[object], None]], object]) -> Iterator:
+    """
+    Run a push-style producer on a thread and yield what it emits.
+
+    Args:
+        produce: Called with a ``put`` function, which blocks while
+                 ``QUEUE_SIZE`` items are waiting.
+
+    Yields:
+        object: The items passed to ``put``, in order. An exception raised
+        by ``produce`` is re-raised here.
+    """
+    items: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+    cancelled = threading.Event()
+
+    def put(item: object) -> None:
+        while not cancelled.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise _CancelledError()
+
+    def run() -> None:
+        try:
+            produce(put)
+            put(_DONE)
+        except _CancelledError:
+            pass
+        except BaseException as e:
+            try:
+                put(_Failure(e))
+            except _CancelledError:
+                pass
+
+    thread = threading.Thread(target=run, name="pocket-export", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        cancelled.set()
+        thread.join()
+
+
+class _ChunkWriter:
+    """Text sink passing every write on as a chunk."""
+
+    def __init__(self, put: Callable[[object], None]):
+        self.put = put
+
+    def write(self, text: str) -> int:
+        if text:
+            self.put(text)
+        return len(text)
+
+    def seekable(self) -> bool:
+        return False
+
+
+class _RecordCollector(ExportWriter):
+    """Writer passing every file on as an ExportRecord."""
+    name = "records"
+    streamable = True
+
+    def __init__(self, put: Callable[[object], None], project_name: str):
+        super().__init__("", project_name)
+        self.put = put
+
+    def write_file(self, entry: ExportEntry, chunks) -> None:
+        self.put(ExportRecord(entry, "".join(chunks)))
+
+
+@contextmanager
+def _scanned(project_path: str, options: ExportOptions, ignore_paths=()) -> Iterator[ProjectIndex]:
+    """Scan a project directory, or list an archive and keep it open while it is exported."""
+    root = os.path.abspath(project_path)
+    if not is_archive(root):
+        yield options.scan(root, ignore_paths)
+        return
+    with open_archive(root) as archive:
+        index = options.scan_listing(root, archive.files, archive.directories, name=archive.name)
+        archive.load(index.iter_files())
+        yield index
+
+
+def iter_markdown(project_path: str, options: ExportOptions | None = None) -> Iterator[str]:
+    """
+    Export a project as Markdown, chunk by chunk.
+
+    Args:
+        project_path: Root directory of the project, or a zip or tar archive.
+        options: Selection and rendering options; defaults to ``ExportOptions()``.
+
+    Yields:
+        str: Consecutive pieces of the document; joined, they are exactly
+        what ``create_codebase_markdown`` writes with the same options.
+
+    Raises:
+        OSError: If the project cannot be scanned.
+        ArchiveError: If an archive cannot be read.
+    """
+    options = options or ExportOptions()
+
+    def produce(put: Callable[[object], None]) -> None:
+        with _scanned(project_path, options) as index:
+            dedup = Deduplicator(index) if options.dedup else None
+            write_document(_ChunkWriter(put), index.name, index, options, dedup=dedup)
+
+    yield from _produced(produce)
+
+
+def iter_records(project_path: str, options: ExportOptions | None = None) -> Iterator[ExportRecord]:
+    """
+    Export a project as one record per file.
+
+    Binary and unreadable files are skipped, like in the Markdown export.
+    ``options.dedup`` does not apply: every file is yielded with its content.
+
+    Args:
+        project_path: Root directory of the project, or a zip or tar archive.
+        options: Selection and rendering options; defaults to ``ExportOptions()``.
+
+    Yields:
+        ExportRecord: Path, language, size, SHA-256 and content of each file,
+        in export order.
+    """
+    options = options or ExportOptions()
+
+    def produce(put: Callable[[object], None]) -> None:
+        with _scanned(project_path, options) as index:
+            write_records(_RecordCollector(put, index.name), index.iter_files(), options)
+
+    yield from _produced(produce)
+
+
+def export_to(
+    stream: IO,
+    project_path: str,
+    options: ExportOptions | None = None,
+    output_format: str = "markdown"
+) -> ExportSummary:
+    """
+    Write the export of a project into a file-like object.
+
+    Args:
+        stream: Writable text or binary file-like object; binary ones receive
+                UTF-8. It is flushed but not closed.
+        project_path: Root directory of the project, or a zip or tar archive.
+        options: Selection and rendering options; defaults to ``ExportOptions()``.
+        output_format: 'markdown' or a streamable structured format ('jsonl').
+
+    Returns:
+        ExportSummary: What was written and what was skipped.
+
+    Raises:
+        ValueError: If the format cannot be written to a stream.
+    """
+    options = options or ExportOptions()
+    name = getattr(stream, "name", None)
+    with _scanned(project_path, options, [name] if isinstance(name, str) else ()) as index:
+        return write_index(stream, index, options, output_format)
@@ -9,80 +9,68 @@ containing the entire codebase with syntax highlighting and file tree structure.
 import os
 import argparse
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from super_pocket.settings import click, CONTEXT_SETTINGS, add_help_argument
-from rich.console import Console
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from pathlib import Path
 from typing import Set
 
+from super_pocket.project.export.archives import ArchiveError, archive_stem, is_archive, open_archive
+from super_pocket.project.export.cache import ExportCache, default_cache_path
+from super_pocket.project.export.changes import GitChangesError, changed_files
+from super_pocket.project.export.dedup import Deduplicator
+from super_pocket.project.export.document import (
+    BLOCK_SIGNATURE,
+    block_overhead,
+    console,
+    content_bounds,
+    get_language_identifier,  # noqa: F401 (kept importable from here)
+    header_size,
+    write_document,
+    write_file_contents,
+    write_header,
+    write_index,
+    write_records,
+    write_shards,
+)
+from super_pocket.project.export.filters import FileFilter
+from super_pocket.project.export.gitrev import GitRevision, GitRevisionError
+from super_pocket.project.export.graph import (
+    ImportGraphCache,
+    build_import_graph,
+    default_graph_path,
+    rank_files,
+    select_within_budget,
+)
+from super_pocket.project.export.options import DEFAULT_EXCLUDE, ExportOptions
+from super_pocket.project.export.offsets import OffsetIndexWriter, default_index_path
+from super_pocket.project.export.outputs import compression_of, is_stdout, open_output
+from super_pocket.project.export.roots import expand_roots, group_roots, root_outputs
+from super_pocket.project.export.scanner import FileRecord, ProjectIndex, scan_project
+from super_pocket.project.export.shards import (
+    bytes_to_tokens,
+    existing_shards,
+    remove_stale_shards,
+    tokens_to_bytes,
+)
+from super_pocket.project.export.skeleton import SkeletonOptions
+from super_pocket.project.export.stats import TOP_FILES, PhaseTimer, progress_bar, stats_lines
+from super_pocket.project.export.summary import ExportSummary, format_bytes
+from super_pocket.project.export.truncate import TruncationLimits
+from super_pocket.project.export.watch import InotifyWatcher, LiveExport, open_watcher, watch_loop
+from super_pocket.project.export.writers import WRITERS, format_for, open_writer
 
-console = Console()
-
-
-# Language mapping for syntax highlighting in Markdown code blocks
-LANG_MAP = {
-    '.py': 'python',
-    '.js': 'javascript',
-    '.ts': 'typescript',
-    '.html': 'html',
-    '.css': 'css',
-    '.scss': 'scss',
-    '.json': 'json',
-    '.xml': 'xml',
-    '.yml': 'yaml',
-    '.yaml': 'yaml',
-    '.md': 'markdown',
-    '.sh': 'bash',
-    '.java': 'java',
-    '.c': 'c',
-    '.cpp': 'cpp',
-    '.go': 'go',
-    '.rs': 'rust',
-    '.php': 'php',
-    '.rb': 'ruby',
-    '.sql': 'sql',
-    '.dockerfile': 'dockerfile',
-    'Dockerfile': 'dockerfile',
-}
 
 DEFAULT_VALUES = {
     "project": ".",
     "output": None,
-    "exclude": "env,.env,venv,.venv,.gitignore,.git,.vscode,.idea,.cursor,lib,bin,site-packages,node_modules,__pycache__,.DS_Store,.python-version",
-    "extend_exclude": ""
+    "exclude": ",".join(DEFAULT_EXCLUDE),
+    "extend_exclude": "",
+    "jobs": 1
 }
 
 
-def get_language_identifier(filename: str) -> str:
-    """
-    Determine the language identifier for a Markdown code block based on file extension.
-
-    This function maps file extensions to their corresponding language identifiers
-    for proper syntax highlighting in Markdown code blocks. Special files like
-    'Dockerfile' are handled separately.
-
-    Args:
-        filename: The name of the file (can be basename or full path).
-
-    Returns:
-        str: Language identifier for syntax highlighting (e.g., 'python', 'javascript').
-             Returns 'plaintext' if the extension is not recognized.
-
-    Example:
-        >>> get_language_identifier('script.py')
-        'python'
-        >>> get_language_identifier('Dockerfile')
-        'dockerfile'
-    """
-    # Handle special cases like 'Dockerfile' without extension
-    if os.path.basename(filename) in LANG_MAP:
-        return LANG_MAP[os.path.basename(filename)]
-
-    # Handle standard extensions
-    _, ext = os.path.splitext(filename)
-    return LANG_MAP.get(ext.lower(), 'plaintext')
-
-
 def generate_tree(root_dir: str, exclude: Set[str]) -> Generator[str, None, None]:
     """
     Generate a text representation of the project tree structure.
@@ -91,6 +79,10 @@ def generate_tree(root_dir: str, exclude: Set[str]) -> Generator[str, None, None
     the Unix 'tree' command. Excludes specified files and directories from the
     output. Uses box-drawing characters (│, ├, └) for visual hierarchy.
 
+    This is a convenience wrapper that scans the tree; callers that also need
+    the file list should use ``scan_project`` once and render the index with
+    ``ProjectIndex.iter_tree_lines``.
+
     Args:
         root_dir: Root directory to scan.
         exclude: Set of file/directory names to exclude from the tree.
@@ -105,35 +97,420 @@ def generate_tree(root_dir: str, exclude: Set[str]) -> Generator[str, None, None
         │   ├── main.py
         │   └── utils.py
     """
-    for root, dirs, files in os.walk(root_dir, topdown=True):
-        # Modify in-place to prevent os.walk from exploring excluded directories
-        dirs[:] = [d for d in dirs if d not in exclude]
-        files = [f for f in files if f not in exclude]
+    yield from scan_project(root_dir, exclude).iter_tree_lines()
 
-        level = root.replace(root_dir, '').count(os.sep)
-        indent = '│   ' * (level - 1) + '├── ' if level > 0 else ''
 
-        # Display current directory name (relative)
-        if level > 0:
-            yield f"{indent}{os.path.basename(root)}/"
+def _export(
+    project_path: str,
+    project_name: str,
+    output_file: str,
+    options: ExportOptions,
+    incremental: bool = False,
+    cache_file: str | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+    since: str | None = None,
+    staged: bool = False,
+    mark_changes: bool = False,
+    output_format: str = "markdown",
+    offset_index: bool = False,
+    stats: bool = False,
+    stats_top: int = TOP_FILES,
+    progress: bool = True,
+    fit_budget: int | None = None,
+    rev: str | None = None
+) -> None:
+    """Run an export once its paths and options have been normalized."""
+    to_stdout = is_stdout(output_file)
 
-        # Display files in current directory
-        sub_indent = '│   ' * level + '├── '
-        for i, f in enumerate(sorted(files)):
-            # Use different prefix for last element
-            prefix = '└── ' if i == len(files) - 1 else '├── '
-            yield f"{'│   ' * level}{prefix}{f}"
+    console.print(f"|| Starting project scan: '{project_name}'", style="bold")
+    console.print(f"|| Source directory: {project_path}", style="bold")
+    if rev:
+        console.print(f"|| Revision: {rev}", style="bold")
+    console.print(f"|| Output file: {'<stdout>' if to_stdout else output_file}", style="bold")
+    console.print(f"|| Excluded items: {set(options.exclude)}", style="bold")
+
+    cache = None
+    if incremental:
+        cache_file = cache_file or default_cache_path(
+            f"{project_name}-1-file.md" if to_stdout else output_file
+        )
+        signature = f"{BLOCK_SIGNATURE};{options.signature}" if options.signature else BLOCK_SIGNATURE
+        cache = ExportCache.load(cache_file, signature)
+        console.print(f"|| Incremental cache: {cache_file}", style="bold")
+
+    budgets = [budget for budget in (max_bytes, max_tokens and tokens_to_bytes(max_tokens)) if budget]
+    budget = min(budgets) if budgets else None
+    destination = "<stdout>" if to_stdout else f"'{output_file}'"
+
+    if budget is not None and to_stdout:
+        console.print("[red]❌ Sharded exports cannot be streamed to stdout; use -o <file>.[/]", style="bold")
+        return
+
+    timer = PhaseTimer()
+    revision = archive = None
+    try:
+        # 1. Scan the project once; the tree and the contents share the index
+        console.print("|| Generating file tree...", style="bold")
+        index_file = default_index_path(output_file) if offset_index else None
+        graph_file = None
+        if fit_budget is not None:
+            graph_file = default_graph_path(f"{project_name}-1-file.md" if to_stdout else output_file)
+        ignore_paths = [output_file, *existing_shards(output_file)]
+        ignore_paths += [path for path in (cache_file, index_file, graph_file) if path]
+        with timer.phase("scan"):
+            if rev:
+                revision = GitRevision(project_path, rev)
+                index = scanned = options.scan_listing(project_path, revision.list_files(), ignore_paths=ignore_paths)
+            elif is_archive(project_path):
+                archive = open_archive(project_path)
+                index = scanned = options.scan_listing(
+                    project_path, archive.files, archive.directories, name=archive.name
+                )
+                archive.load(index.iter_files())
+                project_name = archive.name
+            else:
+                index = scanned = options.scan(project_path, ignore_paths)
+        console.print("|| File tree generated.", style="bold")
+        if revision is not None:
+            console.print(f"|| Commit: {revision.commit}", style="bold")
+        if options.file_filter:
+            console.print(f"|| Files matching the filters: {index.file_count}", style="bold")
+
+        tree = marks = None
+        if since or staged:
+            with timer.phase("changes"):
+                changes = changed_files(project_path, since=since, staged=staged)
+            tree = index
+            index = index.subset(record for record in tree.iter_files() if record.relative_path in changes)
+            marks = changes if mark_changes else None
+            base = f"'{since}'" if since else "HEAD"
+            console.print(
+                f"|| Changed files: {index.file_count} "
+                f"({'staged, ' if staged else ''}relative to {base})",
+                style="bold"
+            )
+        if fit_budget is not None:
+            with timer.phase("rank"):
+                graph_cache = ImportGraphCache.load(graph_file)
+                graph = build_import_graph(index, graph_cache)
+                graph_cache.save()
+            all_omitted = dict.fromkeys((record.relative_path for record in index.iter_files()), "omitted")
+            available = fit_budget - header_size(project_name, index, all_omitted)
+
+            bounds = content_bounds(index, options)
+
+            def cost(record: FileRecord) -> int:
+                return block_overhead(record) + bounds[record.relative_path]
+
+            kept, omitted = select_within_budget(rank_files(index, graph), available, cost)
+            tree = index
+            index = index.subset(kept)
+            marks = {record.relative_path: "omitted" for record in omitted}
+            console.print(
+                f"|| Import graph: {len(graph)} module(s), imports of {graph_cache.hits} reused "
+                f"from '{graph_file}'",
+                style="bold"
+            )
+            console.print(
+                f"|| Files kept within the budget: {len(kept)} of {len(kept) + len(omitted)} "
+                f"(~{bytes_to_tokens(fit_budget)} tokens)",
+                style="bold"
+            )
+        deduplicator = Deduplicator(index) if options.dedup else None
+
+        # 2. Write the title, tree and file contents
+        console.print("|| Reading and writing file contents...", style="bold")
+        with timer.phase("write"), progress_bar(console, index.file_count, progress) as advance:
+            if output_format != "markdown":
+                with open_writer(output_format, output_file, project_name) as writer:
+                    summary = write_records(writer, index.iter_files(), options, on_block=advance)
+            elif budget is None:
+                offsets = OffsetIndexWriter(index_file, output_file) if index_file else None
+                try:
+                    with open_output(output_file) as md_file:
+                        summary = write_document(
+                            md_file, project_name, index, options, cache, deduplicator,
+                            tree=tree, marks=marks, offsets=offsets, on_block=advance
+                        )
+                finally:
+                    if offsets is not None:
+                        offsets.close()
+                        console.print(f"|| Offset index: {index_file}", style="bold")
+            else:
+                summary = write_shards(
+                    output_file, index, budget, options, cache, deduplicator, marks=marks, on_block=advance
+                )
+                stale = remove_stale_shards(output_file, len(summary.shards))
+                if stale:
+                    console.print(f"|| Removed {len(stale)} stale shard(s) of a previous export.", style="bold")
+        timer.split("write", "read", summary.read_seconds)
+        console.print("|| File contents written.", style="bold")
+
+        for line in summary.lines():
+            console.print(line, style="bold")
+        if summary.shards:
+            destination = f"{len(summary.shards)} shard(s) '{summary.shards[0]}'..'{summary.shards[-1]}'"
+        for path in summary.shards:
+            size = os.path.getsize(path)
+            tokens = f", ~{bytes_to_tokens(size)} tokens" if compression_of(path) is None else ""
+            console.print(f"||   {path}: {format_bytes(size)}{tokens}", style="bold")
+
+        if cache is not None:
+            cache.save()
+            console.print(f"|| Reused {cache.hits} cached file(s), re-read {cache.misses}.", style="bold")
+        if stats:
+            for line in stats_lines(timer, summary, scanned, index, stats_top):
+                console.print(line, style="bold")
+
+    except GitChangesError as e:
+        console.print(f"[red]❌ Cannot list changed files: {e}[/]", style="bold")
+        return
+    except GitRevisionError as e:
+        console.print(f"[red]❌ Cannot read revision '{rev}': {e}[/]", style="bold")
+        return
+    except ArchiveError as e:
+        console.print(f"[red]❌ Cannot read archive '{project_path}': {e}[/]", style="bold")
+        return
+    except IOError as e:
+        console.print(f"[red]❌ Error writing to file [/red]'{output_file}'[red]: {e}[/]", style="bold")
+    except Exception as e:
+        console.print(f"[red]❌ An unexpected error occurred: {e}[/]", style="bold")
+    finally:
+        for source in (revision, archive):
+            if source is not None:
+                source.close()
 
+    console.print(f"\n|| Success! Codebase compiled into {destination}")
 
-def create_codebase_markdown(
+
+def _watch(
     project_path: str,
+    project_name: str,
     output_file: str,
-    exclude_str: str
+    options: ExportOptions
+) -> None:
+    """Write the export, then keep it up to date until interrupted."""
+    console.print(f"|| Starting project scan: '{project_name}'", style="bold")
+    console.print(f"|| Source directory: {project_path}", style="bold")
+    console.print(f"|| Output file: {output_file}", style="bold")
+    console.print(f"|| Excluded items: {set(options.exclude)}", style="bold")
+
+    ignore_paths = [output_file, f"{output_file}.tmp"]
+
+    def scan() -> ProjectIndex:
+        return options.scan(project_path, ignore_paths)
+
+    def write_files(md_file, records, on_block) -> None:
+        write_file_contents(md_file, records, options, on_block=on_block)
+
+    live = LiveExport(
+        output_file,
+        scan,
+        write_header=lambda md_file, index: write_header(md_file, project_name, index),
+        write_files=write_files
+    )
+
+    try:
+        index = live.build()
+    except IOError as e:
+        console.print(f"[red]❌ Error writing to file [/red]'{output_file}'[red]: {e}[/]", style="bold")
+        return
+    console.print(f"|| Exported {index.file_count} file(s) into '{output_file}'.", style="bold")
+
+    watcher = open_watcher(index, ignore_paths)
+    method = "inotify" if isinstance(watcher, InotifyWatcher) else "polling"
+    console.print(f"|| Watching for changes ({method}). Press Ctrl+C to stop.", style="bold")
+
+    def report(rendered, changes) -> None:
+        console.print(f"|| Updated '{output_file}': {rendered} section(s) re-rendered.", style="bold")
+
+    try:
+        watch_loop(live, watcher, report)
+    except KeyboardInterrupt:
+        console.print("\n|| Watch stopped.", style="bold")
+    finally:
+        watcher.close()
+
+
+def _export_roots(
+    roots: Iterable[str],
+    output_dir: str,
+    options: ExportOptions,
+    output_format: str = "markdown",
+    processes: int | None = None
+) -> None:
+    """Export several projects, each to its own file, on a process pool."""
+    extension = WRITERS[output_format].extension if output_format in WRITERS else ".md"
+    try:
+        roots = expand_roots(roots)
+        outputs = root_outputs(roots, output_dir, extension)
+    except ValueError as e:
+        console.print(f"[red]❌ {e}[/]", style="bold")
+        return
+
+    groups = group_roots(roots)
+    processes = max(1, min(processes or os.cpu_count() or 1, len(roots)))
+    console.print(f"|| Exporting {len(roots)} root(s) into '{output_dir}'", style="bold")
+    console.print(f"|| Shared scans: {len(groups)}, processes: {processes}", style="bold")
+    console.print(f"|| Excluded items: {set(options.exclude)}", style="bold")
+
+    # Workers only report through their summaries, and the pool already
+    # spreads the work over the CPUs
+    skeleton = replace(options.skeleton, jobs=1) if options.skeleton else None
+    worker_options = replace(options, quiet=True, skeleton=skeleton)
+
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+    except OSError as e:
+        console.print(f"[red]❌ Cannot create the output directory [/red]'{output_dir}'[red]: {e}[/]", style="bold")
+        return
+
+    pool = ProcessPoolExecutor(max_workers=processes) if processes > 1 else None
+    pending = {}
+    total = ExportSummary()
+    failed = 0
+    try:
+        # 1. Scan each parent once; exports start while later parents are scanned
+        for parent, names in groups.items():
+            for index in options.scan_roots(parent, names, outputs.values()):
+                job = None
+                if pool is not None:
+                    job = pool.submit(write_index, outputs[index.root], index, worker_options, output_format)
+                pending[index.root] = (index, job)
+
+        # 2. Report each export in the order the roots were given
+        for root in roots:
+            index, job = pending[root]
+            try:
+                if job is None:
+                    summary = write_index(outputs[root], index, worker_options, output_format)
+                else:
+                    summary = job.result()
+            except Exception as e:
+                failed += 1
+                console.print(f"[red]❌ {index.name}: {e}[/]", style="bold")
+                continue
+            total.merge(summary)
+            console.print(f"||   {index.name} -> '{outputs[root]}': {summary.files_written} file(s)", style="bold")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    for line in total.lines():
+        console.print(line, style="bold")
+    exported = len(roots) - failed
+    console.print(f"\n|| Success! {exported} of {len(roots)} root(s) compiled into '{output_dir}'")
+
+
+def export_options(
+    exclude_str: str,
+    jobs: int = 1,
+    use_gitignore: bool = True,
+    dedup: bool = False,
+    max_file_bytes: int | None = None,
+    max_file_lines: int | None = None,
+    skeleton: bool = False,
+    keep_full: str = "",
+    minify: bool = False,
+    redact: bool = False,
+    include_ext: str = "",
+    max_size: str | int | None = None,
+    newer_than: str | None = None,
+    older_than: str | None = None
+) -> ExportOptions:
+    """
+    Build the options of a command-line export from its option values.
+
+    Args:
+        exclude_str: Comma-separated gitignore-style patterns to exclude
+                    (e.g., "node_modules,.git,build/**/*.map"). A bare name
+                    matches files and directories at any depth.
+        jobs: Number of threads reading files in parallel. Blocks are still
+              written by a single writer in the same sorted order.
+        use_gitignore: Honor the project's ``.gitignore`` and ``.pocketignore``
+                       files, including nested ones.
+        dedup: Export each distinct file content once; later identical files
+               are written as a reference to the first one.
+        max_file_bytes: Export larger files as their head and tail around a
+                        truncation marker, keeping about this many bytes.
+        max_file_lines: Same, for files with more than this many lines.
+        skeleton: Reduce Python files to their skeleton: module docstring,
+                  imports, and class and function signatures with their
+                  decorators and docstrings. Files are parsed on a process
+                  pool; files that do not parse are exported in full.
+        keep_full: Comma-separated gitignore-style patterns of Python files
+                   exported in full in skeleton mode.
+        minify: Remove comments, trailing whitespace and blank lines from
+                Python, JavaScript, TypeScript, CSS, SCSS and SQL files.
+                String literals and indentation are kept as they are.
+        redact: Replace secrets (cloud keys, API tokens, private key blocks,
+                ``.env``-style assignments of secret-looking names) with
+                ``[REDACTED:<detector>]`` markers as files are read, and
+                report what was replaced.
+        include_ext: Comma-separated extensions (``py,md``); other files are
+                     left out.
+        max_size: Leave out files larger than this (``500k``, ``2M``).
+        newer_than: Leave out files modified before this age or date
+                    (``7d``, ``12h``, ``2024-05-01``).
+        older_than: Leave out files modified after this age or date.
+                    These four filters only use the stat data of the scan,
+                    so filtered files are never opened, and directories
+                    left empty are not shown.
+
+    Returns:
+        ExportOptions: The options, with a warning printed for each skipped file.
+
+    Raises:
+        ValueError: If a size, age or date filter cannot be parsed.
+    """
+    exclude = tuple(dict.fromkeys(pattern.strip() for pattern in exclude_str.split(',') if pattern.strip()))
+    skeleton_options = None
+    if skeleton:
+        patterns = tuple(pattern.strip() for pattern in keep_full.split(',') if pattern.strip())
+        skeleton_options = SkeletonOptions(keep_full=patterns)
+    return ExportOptions(
+        exclude=exclude,
+        use_gitignore=use_gitignore,
+        file_filter=FileFilter.from_options(include_ext, max_size, newer_than, older_than) or None,
+        jobs=jobs,
+        dedup=dedup,
+        limits=TruncationLimits(max_bytes=max_file_bytes, max_lines=max_file_lines),
+        skeleton=skeleton_options,
+        minify=minify,
+        redact=redact,
+        quiet=False
+    )
+
+
+def create_codebase_markdown(
+    project_path: str,
+    output_file: str | None,
+    options: ExportOptions | None = None,
+    incremental: bool = False,
+    cache_file: str | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+    since: str | None = None,
+    staged: bool = False,
+    mark_changes: bool = False,
+    watch: bool = False,
+    output_format: str | None = None,
+    offset_index: bool = False,
+    roots: Iterable[str] = (),
+    output_dir: str = ".",
+    processes: int | None = None,
+    stats: bool = False,
+    stats_top: int = TOP_FILES,
+    progress: bool = True,
+    fit_tokens: int | None = None,
+    fit_bytes: int | None = None,
+    rev: str | None = None
 ) -> None:
     """
     Scan a project and generate a comprehensive Markdown documentation file.
 
-    This function walks through a project directory, generates a file tree
+    This function scans a project directory once, generates a file tree
     visualization, and includes the content of all text-based files in a single
     Markdown document with proper syntax highlighting. Perfect for documentation,
     code reviews, or feeding entire codebases to AI tools.
@@ -144,11 +521,84 @@ def create_codebase_markdown(
     3. Content of each file with syntax highlighting
 
     Args:
-        project_path: Path to the project root directory.
+        project_path: Path to the project root directory, or to a zip or tar
+                      archive (``.zip``, ``.tar``, ``.tar.gz``, ``.tgz``,
+                      ``.tar.bz2``, ``.tar.xz``) exported without extraction,
+                      exactly like the extracted directory. An archive
+                      holding a single top-level directory exports that
+                      directory. Archives cannot be watched, diffed with
+                      ``since``/``staged``, read at a ``rev`` or used as ``roots``.
         output_file: Path to the output Markdown file. If None, defaults to
-                    '<project_name>-1-file.md'.
-        exclude_str: Comma-separated string of files/directories to exclude
-                    (e.g., "node_modules,.git,__pycache__").
+                    '<project_name>-1-file.md'. '-' streams the document to
+                    stdout (status messages then go to stderr), and names
+                    ending in '.gz', '.xz' or '.zip' are compressed on the fly.
+        options: What to export and how each file is rendered (see
+                 ``ExportOptions``, or ``export_options`` to build them from
+                 command-line values). Defaults to the command-line
+                 defaults; skipped files are warned about unless
+                 ``options.quiet`` is set.
+        incremental: Reuse the blocks of unchanged files from a sidecar cache
+                     and only re-read files whose mtime or size changed.
+        cache_file: Location of the sidecar cache. Defaults to
+                    '<output_file>.cache.json'.
+        max_tokens: Split the export into numbered shards of at most about
+                    this many tokens (estimated, not tokenized).
+        max_bytes: Split the export into numbered shards of at most this
+                   many bytes. The smaller of the two budgets applies.
+        since: Only export files changed since this git ref (working tree,
+               or index with ``staged``, compared to the ref). The tree
+               header still shows the whole project.
+        staged: Only export files whose changes are staged.
+        mark_changes: Append the git status letter (``[M]``, ``[A]``, ...)
+                      to changed files in the tree header.
+        watch: After the export, keep watching the project and update the
+               changed sections of the output until interrupted. Needs a
+               plain output file; sharding, deduplication, incremental
+               caching and git-changed modes are not available.
+        output_format: 'markdown', or a structured format with one record
+                       per file: 'jsonl' (path, language, size, sha256,
+                       content) or 'sqlite' (a database with an FTS5 index).
+                       Defaults to the format matching the output extension.
+                       Structured formats cannot be sharded, deduplicated,
+                       cached or watched.
+        offset_index: Also write '<output_file>.index.jsonl', mapping each
+                      file to the byte offset, length and hash of its content
+                      in the document (see ``export.offsets.read_file``).
+                      Needs a plain, unsharded Markdown output file.
+        roots: Export several projects instead of ``project_path``: paths
+               or glob patterns (``packages/*``), each exported to
+               '<output_dir>/<name>-1-file.md' (or the extension of
+               ``output_format``). Roots sharing a parent directory are
+               scanned in one pass of it, and the parent's ignore files
+               apply to them. Sharding, caching, git-changed, watch and
+               offset index modes are not available.
+        output_dir: Directory receiving the exports of ``roots``.
+        processes: Number of processes exporting ``roots`` in parallel;
+                   defaults to one per CPU.
+        stats: After the export, report the wall time of each phase (scan,
+               git changes, read and decode, render and write), files/s and
+               MB/s, the files skipped by reason, and the ``stats_top``
+               largest files.
+        stats_top: Number of largest files listed by ``stats``.
+        progress: Show a progress bar while files are written, when the
+                  console is a terminal. ``stats`` and ``progress`` apply to
+                  single-project exports.
+        fit_tokens: Keep the export within about this many tokens by
+                    leaving out the least central files. Python files are
+                    ranked by PageRank over their import graph (built on a
+                    process pool and cached in '<output_file>.graph.json'),
+                    other files rank like modules nobody imports, and the
+                    best ranked files that fit are kept. The tree header
+                    still shows every file and marks the omitted ones.
+        fit_bytes: Same, with a budget in bytes. The smaller of the two
+                   budgets applies. Needs a Markdown export and cannot be
+                   combined with sharding, ``since``, ``staged`` or ``watch``.
+        rev: Export the project as it is in this git ref (branch, tag or
+             commit) instead of the working tree, which is left untouched:
+             the tree is listed with ``git ls-tree`` and the files are read
+             through one persistent ``git cat-file --batch`` process. Files
+             get the commit time as their modification time. Cannot be
+             combined with ``since``, ``staged``, ``watch`` or ``roots``.
 
     Raises:
         IOError: If there's an error writing to the output file.
@@ -158,84 +608,207 @@ def create_codebase_markdown(
         >>> create_codebase_markdown(
         ...     project_path='/path/to/my-app',
         ...     output_file='my-app.md',
-        ...     exclude_str='node_modules,.git,dist'
+        ...     options=export_options('node_modules,.git,dist', jobs=4)
         ... )
         || Starting project scan: 'my-app'
         ...
         || Success! Codebase compiled into 'my-app.md'
     """
-    # Clean up paths and exclusions
+    # Clean up paths and options
+    options = options or ExportOptions(quiet=False)
     project_path = os.path.abspath(project_path)
     project_name = os.path.basename(project_path)
-    exclude_set = set(exclude_str.split(','))
+    if is_archive(project_path):
+        project_name = archive_stem(project_name)
+        if since or staged or mark_changes or watch or rev:
+            console.print(
+                "[red]❌ Archives cannot be combined with --since, --staged, --mark-changes, "
+                "--watch or --rev.[/]",
+                style="bold"
+            )
+            return
+
+    output_format = output_format or format_for(output_file)
+    if output_format != "markdown" and output_format not in WRITERS:
+        console.print(f"[red]❌ Unknown output format: {output_format}[/]", style="bold")
+        return
+
+    fit_budgets = [budget for budget in (fit_bytes, fit_tokens and tokens_to_bytes(fit_tokens)) if budget]
+    fit_budget = min(fit_budgets) if fit_budgets else None
+    if fit_budget is not None:
+        unsupported = max_tokens or max_bytes or since or staged or watch or roots
+        if unsupported or output_format != "markdown":
+            console.print(
+                "[red]❌ --fit-tokens/--fit-bytes need a Markdown export and cannot be combined with "
+                "sharding, --since, --staged, --watch or --root.[/]",
+                style="bold"
+            )
+            return
+
+    if rev and (since or staged or mark_changes or watch or roots):
+        console.print(
+            "[red]❌ --rev exports a commit and cannot be combined with --since, --staged, "
+            "--mark-changes, --watch or --root.[/]",
+            style="bold"
+        )
+        return
+
+    if roots:
+        unsupported = output_file or incremental or cache_file or max_tokens or max_bytes
+        if unsupported or since or staged or mark_changes or watch or offset_index:
+            console.print(
+                "[red]❌ Multi-root exports are written to --output-dir and cannot be combined with "
+                "--output, sharding, --incremental, --since, --staged, --watch or --offset-index.[/]",
+                style="bold"
+            )
+            return
 
     # Set default output filename if not provided
     if output_file is None:
-        output_file = f"{project_name}-1-file.md"
-
-    console.print(f"|| Starting project scan: '{project_name}'", style="bold")
-    console.print(f"|| Source directory: {project_path}", style="bold")
-    console.print(f"|| Output file: {output_file}", style="bold")
-    console.print(f"|| Excluded items: {exclude_set}", style="bold")
-
+        extension = WRITERS[output_format].extension if output_format in WRITERS else ".md"
+        output_file = f"{project_name}-1-file{extension}"
+
+    if output_format != "markdown":
+        writer = WRITERS[output_format]
+        if not writer.streamable and (is_stdout(output_file) or compression_of(output_file)):
+            console.print(f"[red]❌ The {output_format} format needs a plain output file.[/]", style="bold")
+            return
+        if max_tokens or max_bytes or options.dedup or incremental or watch:
+            console.print(
+                f"[red]❌ The {output_format} format cannot be combined with sharding, "
+                "--dedup, --incremental or --watch.[/]",
+                style="bold"
+            )
+            return
+
+    if roots:
+        _export_roots(roots, output_dir, options, output_format, processes)
+        return
+    if offset_index:
+        unsupported = is_stdout(output_file) or compression_of(output_file) or max_tokens or max_bytes
+        if unsupported or watch or output_format != "markdown":
+            console.print(
+                "[red]❌ --offset-index needs a plain, unsharded Markdown output file "
+                "and cannot be combined with --watch.[/]",
+                style="bold"
+            )
+            return
+    if watch:
+        unsupported = is_stdout(output_file) or compression_of(output_file) or max_tokens or max_bytes
+        if unsupported or options.dedup or incremental or since or staged:
+            console.print(
+                "[red]❌ --watch needs a plain output file and cannot be combined with sharding, "
+                "--dedup, --incremental, --since or --staged.[/]",
+                style="bold"
+            )
+            return
+        _watch(project_path, project_name, output_file, options)
+        return
+
+    # Keep stdout clean for the document when streaming it
+    to_stdout = is_stdout(output_file)
+    previous_stderr = console.stderr
+    console.stderr = previous_stderr or to_stdout
     try:
-        with open(output_file, 'w', encoding='utf-8') as md_file:
-            # 1. Write main title
-            md_file.write(f"# {project_name}\n\n")
-
-            # 2. Generate and write project tree
-            console.print("|| Generating file tree...", style="bold")
-            md_file.write("```bash\n")
-            md_file.write(f"{project_name}/\n")
-            for line in generate_tree(project_path, exclude_set):
-                md_file.write(f"{line}\n")
-            md_file.write("```\n\n")
-            console.print("|| File tree generated.", style="bold")
-
-            # 3. Walk through files and write their content
-            console.print("|| Reading and writing file contents...", style="bold")
-            for root, dirs, files in os.walk(project_path, topdown=True):
-                # Ensure we don't descend into excluded directories
-                dirs[:] = [d for d in dirs if d not in exclude_set]
-
-                for filename in sorted(files):
-                    if filename in exclude_set:
-                        continue
-
-                    file_path = os.path.join(root, filename)
-                    relative_path = os.path.relpath(file_path, project_path)
-
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as file_content:
-                            content = file_content.read()
-                            lang = get_language_identifier(filename)
-
-                            md_file.write("---\n\n")  # Horizontal separator
-                            md_file.write(f"**`{relative_path}`**:\n")
-                            md_file.write(f"```{lang}\n")
-                            md_file.write(content)
-                            md_file.write("\n```\n\n")
-
-                    except UnicodeDecodeError:
-                        console.print(f"[red]|| Warning: Cannot read file [/red]'{relative_path}'[red] (probably binary). Skipping.[/]", style="bold")
-                    except Exception as e:
-                        console.print(f"[red]❌ Error reading file [/red]'{relative_path}'[red]: {e}[/]", style="bold")
-
-            console.print("|| File contents written.", style="bold")
-
-    except IOError as e:
-        console.print(f"[red]❌ Error writing to file [/red]'{output_file}'[red]: {e}[/]", style="bold")
-    except Exception as e:
-        console.print(f"[red]❌ An unexpected error occurred: {e}[/]", style="bold")
+        _export(
+            project_path,
+            project_name,
+            output_file,
+            options,
+            incremental=incremental,
+            cache_file=cache_file,
+            max_tokens=max_tokens,
+            max_bytes=max_bytes,
+            since=since,
+            staged=staged,
+            mark_changes=mark_changes,
+            output_format=output_format,
+            offset_index=offset_index,
+            stats=stats,
+            stats_top=stats_top,
+            progress=progress,
+            fit_budget=fit_budget,
+            rev=rev
+        )
+    finally:
+        console.stderr = previous_stderr
 
-    console.print(f"\n|| Success! Codebase compiled into '{output_file}'")
 
 @click.command(name="proj-to-file", context_settings=CONTEXT_SETTINGS)
-@click.option('-p', '--project', default='.', help='Root directory of the project to scan.')
-@click.option('-o', '--output', default=None, help='Output Markdown file name.')
-@click.option('-e', '--exclude', default=DEFAULT_VALUES["exclude"], help='Comma-separated list of files/directories to exclude.')
-@click.option('-ee', '--extend-exclude', default="", help='Comma-separated list of files/directories to extend the exclude list.')
-def proj_to_file(project: str, output: str, exclude: str, extend_exclude: str):
+@click.option('-p', '--project', default='.', help='Root directory of the project to scan, or a zip or tar archive.')
+@click.option('-o', '--output', default=None, help="Output Markdown file name ('-' for stdout; .gz, .xz and .zip are compressed).")
+@click.option('-e', '--exclude', default=DEFAULT_VALUES["exclude"], help='Comma-separated gitignore-style patterns to exclude.')
+@click.option('-ee', '--extend-exclude', default="", help='Comma-separated patterns to extend the exclude list.')
+@click.option('-j', '--jobs', default=DEFAULT_VALUES["jobs"], type=click.IntRange(min=1), help='Number of threads reading files in parallel.')
+@click.option('--incremental', is_flag=True, default=False, help='Only re-read files changed since the last export, using a sidecar cache.')
+@click.option('--cache-file', default=None, help="Sidecar cache path (default: '<output>.cache.json').")
+@click.option('--no-gitignore', is_flag=True, default=False, help='Do not honor .gitignore and .pocketignore files.')
+@click.option('--max-tokens', default=None, type=click.IntRange(min=1), help='Split the export into shards of about this many tokens.')
+@click.option('--max-bytes', default=None, type=click.IntRange(min=1), help='Split the export into shards of at most this many bytes.')
+@click.option('--dedup', is_flag=True, default=False, help='Write identical files once and reference the first copy.')
+@click.option('--since', default=None, metavar='REF', help='Only export files changed since this git ref.')
+@click.option('--staged', is_flag=True, default=False, help='Only export files with staged changes.')
+@click.option('--mark-changes', is_flag=True, default=False, help='Mark changed files with their git status in the tree.')
+@click.option('--rev', default=None, metavar='REF', help='Export the project as of this git ref, read from git objects.')
+@click.option('--max-file-bytes', default=None, type=click.IntRange(min=1), help='Keep only the head and tail of files larger than this.')
+@click.option('--max-file-lines', default=None, type=click.IntRange(min=1), help='Keep only the head and tail of files longer than this.')
+@click.option('--watch', is_flag=True, default=False, help='Keep the output up to date as files change (Ctrl+C to stop).')
+@click.option('--offset-index', is_flag=True, default=False, help="Write '<output>.index.jsonl' with the byte range of every file.")
+@click.option('--skeleton', is_flag=True, default=False, help='Reduce Python files to imports, signatures and docstrings.')
+@click.option('--keep-full', default="", help='Comma-separated patterns of Python files kept in full with --skeleton.')
+@click.option('--minify', is_flag=True, default=False, help='Strip comments, trailing whitespace and blank lines (strings are kept).')
+@click.option('--redact', is_flag=True, default=False, help='Replace secrets (keys, tokens, private keys) with [REDACTED:<kind>] markers.')
+@click.option('--include-ext', default="", help='Comma-separated extensions to export (e.g. py,md); others are skipped.')
+@click.option('--max-size', default=None, help='Skip files larger than this (e.g. 500k, 2M).')
+@click.option('--newer-than', default=None, help='Skip files modified before this age or date (e.g. 7d, 2024-05-01).')
+@click.option('--older-than', default=None, help='Skip files modified after this age or date.')
+@click.option('-r', '--root', 'roots', multiple=True, help='Export this project (path or quoted glob) to its own file; repeatable. Roots sharing a parent are scanned in one pass of it.')
+@click.option('--output-dir', default=".", help='Directory receiving the exports of --root.')
+@click.option('--processes', default=None, type=click.IntRange(min=1), help='Processes exporting --root projects in parallel (default: one per CPU).')
+@click.option('--fit-tokens', default=None, type=click.IntRange(min=1), help='Keep the most central files fitting about this many tokens.')
+@click.option('--fit-bytes', default=None, type=click.IntRange(min=1), help='Keep the most central files fitting this many bytes.')
+@click.option('--stats', is_flag=True, default=False, help='Report phase timings, throughput, skipped files and the largest files.')
+@click.option('--stats-top', default=TOP_FILES, type=click.IntRange(min=0), help='Number of largest files listed by --stats.')
+@click.option('--no-progress', is_flag=True, default=False, help='Never show the progress bar (it is hidden anyway when not on a terminal).')
+@click.option('-f', '--format', 'output_format', default=None, type=click.Choice(["markdown", *WRITERS]), help='Output format (default: from the output extension, else markdown).')
+def proj_to_file(
+    project: str,
+    output: str,
+    exclude: str,
+    extend_exclude: str,
+    jobs: int,
+    incremental: bool,
+    cache_file: str,
+    no_gitignore: bool,
+    max_tokens: int,
+    max_bytes: int,
+    dedup: bool,
+    since: str,
+    staged: bool,
+    mark_changes: bool,
+    rev: str,
+    max_file_bytes: int,
+    max_file_lines: int,
+    watch: bool,
+    offset_index: bool,
+    skeleton: bool,
+    keep_full: str,
+    minify: bool,
+    redact: bool,
+    include_ext: str,
+    max_size: str,
+    newer_than: str,
+    older_than: str,
+    roots: tuple[str, ...],
+    output_dir: str,
+    processes: int,
+    fit_tokens: int,
+    fit_bytes: int,
+    stats: bool,
+    stats_top: int,
+    no_progress: bool,
+    output_format: str
+):
     """
     Export an entire project directory to a single Markdown file.
 
@@ -259,6 +832,50 @@ def proj_to_file(project: str, output: str, exclude: str, extend_exclude: str):
     if extend_exclude:
         exclude_pattern += f",{extend_exclude}"
 
-    create_codebase_markdown(project_dir, output_path, exclude_pattern)
+    try:
+        options = export_options(
+            exclude_pattern,
+            jobs=jobs,
+            use_gitignore=not no_gitignore,
+            dedup=dedup,
+            max_file_bytes=max_file_bytes,
+            max_file_lines=max_file_lines,
+            skeleton=skeleton,
+            keep_full=keep_full,
+            minify=minify,
+            redact=redact,
+            include_ext=include_ext,
+            max_size=max_size,
+            newer_than=newer_than,
+            older_than=older_than
+        )
+    except ValueError as e:
+        console.print(f"[red]❌ {e}[/]", style="bold")
+        return
+
+    create_codebase_markdown(
+        project_dir,
+        output_path,
+        options,
+        incremental=incremental,
+        cache_file=cache_file,
+        max_tokens=max_tokens,
+        max_bytes=max_bytes,
+        since=since,
+        staged=staged,
+        mark_changes=mark_changes,
+        watch=watch,
+        output_format=output_format,
+        offset_index=offset_index,
+        roots=roots,
+        output_dir=output_dir,
+        processes=processes,
+        stats=stats,
+        stats_top=stats_top,
+        progress=not no_progress,
+        fit_tokens=fit_tokens,
+        fit_bytes=fit_bytes,
+        rev=rev
+    )
 
 add_help_argument(proj_to_file)
@@ -2,10 +2,11 @@
 Pytest configuration and shared fixtures.
 """
 
-import pytest
+import subprocess
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
+import pytest
 from PIL import Image
 
 SAMPLE_ICON_SIZE = 128
@@ -24,6 +25,25 @@ def temp_dir():
         yield Path(tmpdir)
 
 
+@pytest.fixture
+def git():
+    """
+    Provide a runner for git commands, committing as a fixed test identity.
+
+    Returns:
+        Callable: ``git(cwd, *args)`` runs ``git *args`` in ``cwd`` and
+        raises ``CalledProcessError`` if it fails.
+    """
+    def run(cwd, *args):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=cwd,
+            check=True,
+            capture_output=True
+        )
+    return run
+
+
 @pytest.fixture
 def sample_markdown_content():
     """
@@ -74,6 +74,17 @@ def test_cli_project_to_file_default_path(runner: CliRunner, temp_dir):
     assert result.exit_code in [0, 1]
 
 
+def test_cli_project_to_file_rejects_invalid_filter(runner: CliRunner, sample_project_structure, temp_dir):
+    """Test that a filter that does not parse stops the export before anything is written."""
+    output_file = temp_dir / "output.md"
+    result = runner.invoke(
+        cli,
+        ['project', 'to-file', '--path', str(sample_project_structure), '--output', str(output_file), '--max-size', 'lots']
+    )
+    assert "Invalid size" in result.output
+    assert not output_file.exists()
+
+
 def test_cli_documents_list(runner: CliRunner):
     """Test documents list command."""
     result = runner.invoke(cli, ['documents', 'list'])
@@ -269,3 +280,16 @@ def test_cli_web_group_help(runner: CliRunner):
     result = runner.invoke(cli, ['web', '--help'])
     assert result.exit_code == 0
 
+
+
+def test_cli_project_to_file_stdout(runner: CliRunner, sample_project_structure):
+    """Test that '-o -' streams the document and keeps status on stderr."""
+    result = runner.invoke(
+        cli,
+        ['project', 'to-file', '--path', str(sample_project_structure), '--output', '-']
+    )
+
+    assert result.exit_code == 0
+    assert result.stdout.startswith("# test_project\n\n```bash\n")
+    assert "Starting project scan" not in result.stdout
+    assert "Starting project scan" in result.stderr
@@ -0,0 +1,140 @@
+"""
+Tests for exports read from zip and tar archives.
+"""
+
+import os
+import shutil
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from super_pocket.project.export.archives import (
+    ArchiveError,
+    ProjectArchive,
+    archive_stem,
+    is_archive,
+    open_archive,
+)
+from super_pocket.project.export.options import ExportOptions
+from super_pocket.project.export.reader import read_record
+
+FORMATS = {"zip": ".zip", "tar": ".tar", "gztar": ".tar.gz", "xztar": ".tar.xz"}
+
+
+@pytest.fixture
+def drop(temp_dir):
+    """A source tree under a single top-level directory, with an empty directory."""
+    top = temp_dir / "src-drop" / "app-1.0"
+    (top / "src").mkdir(parents=True)
+    (top / "empty").mkdir()
+    (top / "src" / "main.py").write_text("print('hi')\n", encoding="utf-8")
+    (top / "big.txt").write_text("line\n" * 100_000, encoding="utf-8")
+    return top
+
+
+def _archive(drop, temp_dir, archive_format):
+    base = temp_dir / archive_format / drop.name
+    return shutil.make_archive(str(base), archive_format, str(drop.parent), drop.name)
+
+
+def test_archive_names():
+    """Test that archive extensions are recognized and stripped."""
+    assert archive_stem("app-1.0.tar.gz") == "app-1.0"
+    assert archive_stem("APP.ZIP") == "APP"
+    assert archive_stem("notes.txt") == "notes.txt"
+
+
+@pytest.mark.parametrize("archive_format", FORMATS)
+def test_open_archive_lists_the_top_directory_as_the_project(drop, temp_dir, archive_format):
+    """Test that members are listed relative to the single top-level directory."""
+    path = _archive(drop, temp_dir, archive_format)
+
+    assert is_archive(path)
+    with open_archive(path) as archive:
+        records = {record.relative_path: record for record in archive.files}
+
+        assert archive.name == "app-1.0"
+        assert sorted(records) == ["big.txt", os.path.join("src", "main.py")]
+        assert "empty" in archive.directories
+        assert records["big.txt"].size == 500_000
+        assert read_record(records[os.path.join("src", "main.py")]).text == "print('hi')\n"
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "gztar"])
+def test_members_are_read_concurrently(drop, temp_dir, archive_format):
+    """Test that threads reading members of one archive get their own bytes."""
+    path = _archive(drop, temp_dir, archive_format)
+    with open_archive(path) as archive:
+        records = archive.files * 10
+
+        def read(record):
+            with record.source.open(record) as handle:
+                handle.seek(4)
+                return handle.read()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            contents = list(pool.map(read, records))
+
+    assert all(len(data) == record.size - 4 for data, record in zip(contents, records))
+
+
+def test_compressed_tar_copies_only_the_loaded_members(drop, temp_dir):
+    """Test that members left out of the index are never decompressed into the spool."""
+    (drop / ".gitignore").write_text("big.txt\n", encoding="utf-8")
+    path = _archive(drop, temp_dir, "gztar")
+
+    with open_archive(path) as archive:
+        index = ExportOptions(use_gitignore=True).scan_listing(
+            path, archive.files, archive.directories, name=archive.name
+        )
+        archive.load(index.iter_files())
+        records = {record.relative_path: record for record in index.iter_files()}
+
+        assert "big.txt" not in records
+        assert archive._data.seek(0, os.SEEK_END) < 1000
+        assert read_record(records[os.path.join("src", "main.py")]).text == "print('hi')\n"
+
+
+def test_compressed_tar_hardlinks_and_unloaded_members_are_readable(temp_dir):
+    """Test that hardlinks share their target's bytes and that opening loads missing members."""
+    (temp_dir / "a.txt").write_bytes(b"first\n")
+    path = temp_dir / "links.tar.xz"
+    with tarfile.open(path, "w:xz") as tar:
+        tar.add(temp_dir / "a.txt", arcname="a.txt")
+        link = tarfile.TarInfo("b.txt")
+        link.type = tarfile.LNKTYPE
+        link.linkname = "a.txt"
+        tar.addfile(link)
+
+    with open_archive(str(path)) as archive:
+        contents = {record.relative_path: read_record(record).text for record in archive.files}
+
+    assert contents == {"a.txt": "first\n", "b.txt": "first\n"}
+    assert ProjectArchive.__abstractmethods__ == frozenset({"open"})
+
+
+def test_archive_without_top_directory_is_named_after_the_file(temp_dir):
+    """Test that loose members keep their paths and that unsafe ones are skipped."""
+    path = temp_dir / "drop.tgz"
+    sources = {"a.txt": b"a\n", "docs/b.md": b"b\n", "../evil.txt": b"x\n"}
+    for name, data in sources.items():
+        (temp_dir / name.replace("../", "")).parent.mkdir(parents=True, exist_ok=True)
+        (temp_dir / name.replace("../", "")).write_bytes(data)
+    with tarfile.open(path, "w:gz") as tar:
+        for name in sources:
+            tar.add(temp_dir / name.replace("../", ""), arcname=name)
+
+    with open_archive(str(path)) as archive:
+        assert archive.name == "drop"
+        assert sorted(record.relative_path for record in archive.files) == ["a.txt", os.path.join("docs", "b.md")]
+
+
+def test_corrupt_archive_raises(temp_dir):
+    """Test that unreadable archives raise ArchiveError."""
+    for name in ("bad.zip", "bad.tar.gz"):
+        (temp_dir / name).write_bytes(b"\x1f\x8bnot an archive")
+        with pytest.raises(ArchiveError):
+            open_archive(str(temp_dir / name))
+    assert not zipfile.is_zipfile(temp_dir / "bad.zip")
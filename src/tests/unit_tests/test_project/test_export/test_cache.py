@@ -0,0 +1,79 @@
+"""
+Tests for the incremental export cache.
+"""
+
+import json
+import os
+
+from super_pocket.project.export.cache import ExportCache, default_cache_path
+from super_pocket.project.export.scanner import scan_project
+
+
+def _records(project):
+    return {r.relative_path: r for r in scan_project(str(project)).iter_files()}
+
+
+def test_default_cache_path():
+    """Test that the sidecar sits next to the export."""
+    assert default_cache_path("out/project-1-file.md") == "out/project-1-file.md.cache.json"
+
+
+def test_cache_round_trip(sample_project_structure, temp_dir):
+    """Test that stored entries are served back for unchanged files."""
+    path = str(temp_dir / "cache.json")
+    records = _records(sample_project_structure)
+
+    cache = ExportCache(path, "sig")
+    cache.store(records["README.md"], "abc", block="README block")
+    cache.save()
+
+    reloaded = ExportCache.load(path, "sig")
+    entry = reloaded.lookup(records["README.md"])
+
+    assert entry is not None
+    assert entry.block == "README block"
+    assert reloaded.hits == 1
+
+
+def test_cache_misses_when_file_changes(sample_project_structure, temp_dir):
+    """Test that a changed size or mtime invalidates the entry."""
+    path = str(temp_dir / "cache.json")
+    cache = ExportCache(path, "sig")
+    cache.store(_records(sample_project_structure)["README.md"], "abc", block="old")
+    cache.save()
+
+    (sample_project_structure / "README.md").write_text("# Changed Project", encoding="utf-8")
+    reloaded = ExportCache.load(path, "sig")
+
+    assert reloaded.lookup(_records(sample_project_structure)["README.md"]) is None
+    assert reloaded.misses == 1
+
+
+def test_cache_ignores_other_signature_and_corrupt_files(sample_project_structure, temp_dir):
+    """Test that incompatible or unreadable caches start empty."""
+    path = temp_dir / "cache.json"
+    record = _records(sample_project_structure)["README.md"]
+    cache = ExportCache(str(path), "sig")
+    cache.store(record, "abc", block="block")
+    cache.save()
+
+    assert ExportCache.load(str(path), "other").lookup(record) is None
+
+    path.write_text("{not json", encoding="utf-8")
+    assert ExportCache.load(str(path), "sig").lookup(record) is None
+
+
+def test_cache_drops_files_not_seen_in_current_run(sample_project_structure, temp_dir):
+    """Test that deleted files disappear from the saved cache."""
+    path = temp_dir / "cache.json"
+    records = _records(sample_project_structure)
+    cache = ExportCache(str(path), "sig")
+    cache.store(records["README.md"], "a", block="readme")
+    cache.store(records[os.path.join("src", "main.py")], "b", block="main")
+    cache.save()
+
+    reloaded = ExportCache.load(str(path), "sig")
+    reloaded.lookup(records["README.md"])
+    reloaded.save()
+
+    assert list(json.loads(path.read_text(encoding="utf-8"))["files"]) == ["README.md"]
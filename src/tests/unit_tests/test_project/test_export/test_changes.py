@@ -0,0 +1,62 @@
+"""
+Tests for git change detection.
+"""
+
+import os
+import shutil
+
+import pytest
+
+from super_pocket.project.export.changes import (
+    GitChangesError,
+    _parse_name_status,
+    changed_files,
+)
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+@pytest.fixture
+def git_project(temp_dir, git):
+    """A repository with one commit, then a modified, an added and a staged file."""
+    project = temp_dir / "repo"
+    (project / "src").mkdir(parents=True)
+    (project / "src" / "main.py").write_text("print('v1')\n", encoding="utf-8")
+    (project / "README.md").write_text("# Repo\n", encoding="utf-8")
+    git(project, "init", "-q")
+    git(project, "add", ".")
+    git(project, "commit", "-q", "-m", "initial")
+
+    (project / "src" / "main.py").write_text("print('v2')\n", encoding="utf-8")
+    (project / "src" / "new.py").write_text("x = 1\n", encoding="utf-8")
+    git(project, "add", "src/new.py")
+    return project
+
+
+def test_parse_name_status_handles_renames():
+    """Test that renamed files are reported under their new path."""
+    output = "M\0a.py\0R100\0old.py\0dir/new.py\0D\0gone.py\0"
+
+    assert _parse_name_status(output) == {
+        "a.py": "M",
+        os.path.join("dir", "new.py"): "R",
+        "gone.py": "D",
+    }
+
+
+@requires_git
+def test_changed_files_since_and_staged(git_project):
+    """Test working-tree and staged change listings."""
+    main = os.path.join("src", "main.py")
+    new = os.path.join("src", "new.py")
+
+    assert changed_files(str(git_project), since="HEAD") == {main: "M", new: "A"}
+    assert changed_files(str(git_project), staged=True) == {new: "A"}
+    assert changed_files(str(git_project / "src"), since="HEAD") == {"main.py": "M", "new.py": "A"}
+
+
+@requires_git
+def test_changed_files_rejects_unknown_ref(git_project):
+    """Test that git failures surface as GitChangesError."""
+    with pytest.raises(GitChangesError):
+        changed_files(str(git_project), since="no-such-ref")
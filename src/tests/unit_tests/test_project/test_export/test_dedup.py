@@ -0,0 +1,32 @@
+"""
+Tests for content-hash deduplication.
+"""
+
+from super_pocket.project.export.dedup import Deduplicator, hash_file
+from super_pocket.project.export.reader import hash_bytes
+from super_pocket.project.export.scanner import scan_project
+
+
+def test_hash_file_matches_hash_bytes(temp_dir):
+    """Test that streamed hashing agrees with in-memory hashing."""
+    (temp_dir / "a.txt").write_bytes(b"x" * 1000)
+    record = next(scan_project(str(temp_dir)).iter_files())
+
+    assert hash_file(record, chunk_size=7) == hash_bytes(b"x" * 1000)
+
+
+def test_deduplicator_only_considers_shared_sizes(temp_dir):
+    """Test candidate selection and first-seen references."""
+    (temp_dir / "a.txt").write_text("same", encoding="utf-8")
+    (temp_dir / "b.txt").write_text("same", encoding="utf-8")
+    (temp_dir / "c.txt").write_text("unique content", encoding="utf-8")
+    a, b, c = scan_project(str(temp_dir)).iter_files()
+    dedup = Deduplicator(scan_project(str(temp_dir)))
+    digest = hash_bytes(b"same")
+
+    assert not dedup.is_candidate(c)
+    assert dedup.original_of(a, digest) is None
+    dedup.remember(a, digest)
+    dedup.remember(b, digest)
+    assert dedup.original_of(b, digest) == "a.txt"
+    assert dedup.original_of(b, None) is None
@@ -0,0 +1,62 @@
+"""
+Tests for export rendering and writers.
+"""
+
+import io
+
+from super_pocket.project.export.document import (
+    render_file_block,
+    render_reference_block,
+    write_index,
+    write_shards,
+)
+from super_pocket.project.export.options import ExportOptions
+from super_pocket.project.export.scanner import scan_project
+
+
+def test_render_blocks_record_language_and_encoding():
+    """Test the fenced block of a file and the reference block of a duplicate."""
+    assert render_file_block("src/app.py", "x = 1\n") == "---\n\n**`src/app.py`**:\n```python\nx = 1\n\n```\n\n"
+    block = render_file_block("notes.txt", "été\n", encoding="latin-1")
+    assert "<!-- encoding: latin-1 -->\n```plaintext\n" in block
+    assert render_reference_block("b.py", "a.py") == "---\n\n**`b.py`**: identical to `a.py`\n\n"
+
+
+def test_write_index_writes_document_and_skips_binary_files(temp_dir):
+    """Test a whole export into a file-like object, with its summary."""
+    (temp_dir / "main.py").write_text("print('hi')\n", encoding='utf-8')
+    (temp_dir / "copy.py").write_text("print('hi')\n", encoding='utf-8')
+    (temp_dir / "image.bin").write_bytes(b"\x00\x01\x02" * 100)
+    index = scan_project(str(temp_dir))
+    buffer = io.StringIO()
+
+    summary = write_index(buffer, index, ExportOptions(dedup=True))
+
+    document = buffer.getvalue()
+    assert document.startswith(f"# {index.name}\n\n```bash\n{index.name}/\n")
+    assert "**`copy.py`**:\n```python\nprint('hi')\n" in document
+    assert "**`main.py`**: identical to `copy.py`" in document
+    assert "image.bin`**" not in document
+    assert summary.files_written == 1 and summary.duplicates == 1 and summary.binary_skipped == 1
+
+
+def test_write_shards_keeps_every_shard_within_budget(temp_dir):
+    """Test that numbered shards never exceed the budget and hold every file once."""
+    project = temp_dir / "project"
+    project.mkdir()
+    for i in range(8):
+        (project / f"module_{i}.py").write_text(f"VALUE = {i}\n" * 20, encoding='utf-8')
+    index = scan_project(str(project))
+    output_file = str(temp_dir / "export.md")
+
+    summary = write_shards(output_file, index, 1000, ExportOptions())
+
+    assert len(summary.shards) > 1
+    combined = ""
+    for path in summary.shards:
+        with open(path, encoding='utf-8') as shard:
+            content = shard.read()
+        assert len(content.encode('utf-8')) <= 1000
+        combined += content
+    for i in range(8):
+        assert combined.count(f"**`module_{i}.py`**:") == 1
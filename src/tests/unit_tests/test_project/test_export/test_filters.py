@@ -0,0 +1,43 @@
+"""
+Tests for the stat-only file filters.
+"""
+
+import pytest
+
+from super_pocket.project.export.filters import FileFilter, parse_size, parse_time
+
+
+def test_parse_size_units():
+    """Test plain and suffixed sizes."""
+    assert parse_size("500") == 500
+    assert parse_size("64k") == 64 * 1024
+    assert parse_size("1.5MB") == 1536 * 1024
+    assert parse_size(42) == 42
+    with pytest.raises(ValueError):
+        parse_size("big")
+
+
+def test_parse_time_ages_and_dates():
+    """Test relative ages and ISO dates."""
+    assert parse_time("2d", now=1_000_000) == (1_000_000 - 2 * 86400) * 10 ** 9
+    assert parse_time("30m", now=3600) == 1800 * 10 ** 9
+    assert parse_time("2024-05-01T00:00:00+00:00") == 1714521600 * 10 ** 9
+    with pytest.raises(ValueError):
+        parse_time("last tuesday")
+
+
+def test_file_filter_accepts():
+    """Test each condition of the filter."""
+    file_filter = FileFilter.from_options(include_ext=" PY,.md ", max_size="1k")
+
+    assert file_filter.extensions == frozenset({".py", ".md"})
+    assert file_filter.accepts("main.py", 1024, 0)
+    assert file_filter.accepts("README.MD", 10, 0)
+    assert not file_filter.accepts("main.py", 1025, 0)
+    assert not file_filter.accepts("main.js", 10, 0)
+
+    window = FileFilter(newer_than_ns=100, older_than_ns=200)
+    assert window.accepts("a", 0, 100)
+    assert not window.accepts("a", 0, 99)
+    assert not window.accepts("a", 0, 200)
+    assert not FileFilter.from_options()
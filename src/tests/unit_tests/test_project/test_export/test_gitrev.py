@@ -0,0 +1,112 @@
+"""
+Tests for exports read from git objects.
+"""
+
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from super_pocket.project.export.gitrev import GitRevision, GitRevisionError
+from super_pocket.project.export.reader import read_record
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+@pytest.fixture
+def git_project(temp_dir, git):
+    """A repository with one commit holding a subproject and a symlink, then local edits."""
+    project = temp_dir / "repo"
+    (project / "app" / "src").mkdir(parents=True)
+    (project / "app" / "src" / "main.py").write_text("print('v1')\n", encoding="utf-8")
+    (project / "app" / "big.txt").write_text("line\n" * 300_000, encoding="utf-8")
+    (project / "README.md").write_text("# Repo\n", encoding="utf-8")
+    os.symlink("README.md", project / "link.md")
+    git(project, "init", "-q")
+    git(project, "add", ".")
+    git(project, "commit", "-q", "-m", "initial")
+
+    (project / "app" / "src" / "main.py").write_text("print('v2')\n", encoding="utf-8")
+    (project / "app" / "new.py").write_text("x = 1\n", encoding="utf-8")
+    return project
+
+
+def test_list_files_reads_the_commit_not_the_working_tree(git_project):
+    """Test that files and contents come from the commit, relative to the project."""
+    with GitRevision(str(git_project / "app"), "HEAD") as revision:
+        records = revision.list_files()
+        main = next(record for record in records if record.name == "main.py")
+
+        assert sorted(record.relative_path for record in records) == ["big.txt", os.path.join("src", "main.py")]
+        assert main.size == len("print('v1')\n")
+        assert main.mtime_ns == records[0].mtime_ns > 0
+        assert read_record(main).text == "print('v1')\n"
+
+
+def test_list_files_skips_symlinks(git_project):
+    """Test that symbolic links, whose blobs hold a target path, are left out."""
+    with GitRevision(str(git_project), "HEAD") as revision:
+        names = {record.name for record in revision.list_files()}
+
+    assert "link.md" not in names and "README.md" in names
+
+
+def test_blobs_are_read_through_one_process_from_many_threads(git_project):
+    """Test that concurrent reads share the persistent process without mixing blobs."""
+    with GitRevision(str(git_project / "app"), "HEAD") as revision:
+        records = revision.list_files() * 20
+
+        def read(record):
+            with record.source.open(record) as handle:
+                return handle.read()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            contents = list(pool.map(read, records))
+
+    assert {len(data) for data in contents} == {len("print('v1')\n"), 1_500_000}
+    assert all(len(data) == record.size for data, record in zip(contents, records))
+
+
+class RecordingPipe:
+    """Wraps the stdin of ``git cat-file`` to remember the blobs requested."""
+
+    def __init__(self, pipe):
+        self.pipe = pipe
+        self.requests = []
+
+    def write(self, data):
+        self.requests.append(data.strip().decode())
+        return self.pipe.write(data)
+
+    def flush(self):
+        self.pipe.flush()
+
+    def close(self):
+        self.pipe.close()
+
+
+def test_blobs_are_fetched_once_and_rejected_blobs_are_skipped(git_project, git):
+    """Test that a sniffed then streamed blob is requested once, and a binary one is not spooled."""
+    from super_pocket.project.export.reader import iter_record_chunks
+
+    (git_project / "app" / "payload.txt").write_bytes(b"\x80\x00\x01\x02\x03" * 800_000)
+    git(git_project, "add", ".")
+    git(git_project, "commit", "-q", "-m", "binary")
+    with GitRevision(str(git_project / "app"), "HEAD") as revision:
+        pipe = revision.blobs._process.stdin = RecordingPipe(revision.blobs._process.stdin)
+        records = {record.name: record for record in revision.list_files()}
+
+        assert read_record(records["payload.txt"]).binary
+        assert revision.blobs._parked.filled < 100_000
+        assert read_record(records["big.txt"]).streamed
+        assert sum(len(chunk) for chunk in iter_record_chunks(records["big.txt"])) == 1_500_000
+        assert read_record(records["main.py"]).text == "print('v2')\n"
+
+    assert pipe.requests == [records[name].path for name in ("payload.txt", "big.txt", "main.py")]
+
+
+def test_unknown_revision_raises(git_project):
+    """Test that an unknown ref is reported with git's message."""
+    with pytest.raises(GitRevisionError, match="nope"):
+        GitRevision(str(git_project), "nope")
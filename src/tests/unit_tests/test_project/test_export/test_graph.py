@@ -0,0 +1,98 @@
+"""
+Tests for import-graph ranking.
+"""
+
+from super_pocket.project.export import graph as graph_module
+from super_pocket.project.export.graph import (
+    ImportGraphCache,
+    build_import_graph,
+    module_name,
+    parse_imports,
+    rank_files,
+    resolve_imports,
+    select_within_budget,
+)
+from super_pocket.project.export.scanner import scan_project
+
+
+def _write_package(root):
+    """Create a src-layout package where core is imported by every other module."""
+    package = root / "src" / "app"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "core.py").write_text("import json\n\nVALUE = 1\n")
+    (package / "api.py").write_text("from .core import VALUE\nfrom app import util\n")
+    (package / "util.py").write_text("from app.core import VALUE\n")
+    (package / "cli.py").write_text("from . import api, util\n")
+    (package / "json.py").write_text("# shadows the standard library name\n")
+    (root / "README.md").write_text("# App\n")
+
+
+def test_module_name():
+    """Test dotted names of modules and packages."""
+    assert module_name("src/app/core.py") == "src.app.core"
+    assert module_name("src/app/__init__.py") == "src.app"
+    assert module_name("README.md") is None
+
+
+def test_parse_imports_resolves_relative_imports():
+    """Test absolute, relative and package-relative imports."""
+    source = "import os.path\nfrom .core import VALUE\nfrom .. import shared\nfrom x import *\n"
+
+    assert parse_imports(source, "app.sub.api") == [
+        "os.path", "app.sub.core.VALUE", "app.sub.core", "app.shared", "app", "x"
+    ]
+    assert parse_imports("from . import api", "app", is_package=True) == ["app.api", "app"]
+    assert parse_imports("def broken(:", "app") == []
+
+
+def test_resolve_imports_matches_suffixes_but_not_stdlib():
+    """Test src layouts and standard library names shadowed by local files."""
+    modules = {"src/app/core.py": "src.app.core", "src/app/json.py": "src.app.json"}
+    imports = {"src/app/core.py": ["json"], "src/app/json.py": ["app.core"]}
+
+    assert resolve_imports(modules, imports) == {
+        "src/app/core.py": set(),
+        "src/app/json.py": {"src/app/core.py"},
+    }
+
+
+def test_rank_files_puts_the_most_imported_module_first(temp_dir):
+    """Test that the module everything depends on ranks first, other files last."""
+    _write_package(temp_dir)
+    index = scan_project(str(temp_dir))
+
+    ranked = [record.relative_path.replace("\\", "/") for record in rank_files(index, build_import_graph(index))]
+
+    assert ranked[0] == "src/app/core.py"
+    assert ranked.index("src/app/util.py") < ranked.index("src/app/cli.py")
+    assert ranked[-1] == "README.md" or ranked.index("README.md") > ranked.index("src/app/api.py")
+
+
+def test_build_import_graph_reuses_cached_imports(temp_dir, monkeypatch):
+    """Test the sidecar cache and the process pool."""
+    _write_package(temp_dir)
+    index = scan_project(str(temp_dir))
+    path = str(temp_dir / "graph.json")
+    monkeypatch.setattr(graph_module, "POOL_MIN_FILES", 1)
+
+    cache = ImportGraphCache.load(path)
+    first = build_import_graph(index, cache, jobs=2)
+    cache.save()
+    cache = ImportGraphCache.load(path)
+    second = build_import_graph(index, cache, jobs=2)
+
+    assert first == second
+    assert cache.hits == 6 and cache.misses == 0
+
+
+def test_select_within_budget_skips_files_that_do_not_fit(temp_dir):
+    """Test that lower ranked files may fill the room a large file left."""
+    for name, size in (("a.txt", 50), ("b.txt", 80), ("c.txt", 30)):
+        (temp_dir / name).write_text("x" * size)
+    ranked = list(scan_project(str(temp_dir)))
+
+    kept, omitted = select_within_budget(ranked, 90, lambda record: record.size)
+
+    assert [record.name for record in kept] == ["a.txt", "c.txt"]
+    assert [record.name for record in omitted] == ["b.txt"]
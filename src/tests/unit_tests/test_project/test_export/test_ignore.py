@@ -0,0 +1,104 @@
+"""
+Tests for the gitignore-style exclusion matcher.
+"""
+
+import os
+
+import pytest
+
+from super_pocket.project.export.ignore import IgnoreMatcher, compile_rule
+from super_pocket.project.export.scanner import scan_project
+
+
+@pytest.mark.parametrize("pattern, path, is_dir, expected", [
+    ("node_modules", "node_modules", True, True),
+    ("node_modules", "web/node_modules", True, True),
+    ("*.log", "logs/debug.log", False, True),
+    ("/build", "build", True, True),
+    ("/build", "src/build", True, False),
+    ("build/", "build", False, False),
+    ("build/**/*.map", "build/js/app.map", False, True),
+    ("build/**/*.map", "build/app.map", False, True),
+    ("build/**/*.map", "src/build/app.map", False, False),
+    ("**/cache", "a/b/cache", True, True),
+    ("docs/*.md", "docs/sub/index.md", False, False),
+    ("file?.txt", "file1.txt", False, True),
+    ("[!a]*.py", "main.py", False, True),
+    ("[!a]*.py", "app.py", False, False),
+])
+def test_compile_rule_matches(pattern, path, is_dir, expected):
+    """Test gitignore pattern semantics."""
+    assert compile_rule(pattern).matches(path, is_dir) is expected
+
+
+def test_compile_rule_skips_comments_and_blanks():
+    """Test that comments and blank lines produce no rule."""
+    assert compile_rule("# comment") is None
+    assert compile_rule("   ") is None
+    assert compile_rule("\\#literal").matches("#literal", False)
+
+
+def test_matcher_negation_last_match_wins():
+    """Test that a later negation re-includes a path."""
+    matcher = IgnoreMatcher.from_patterns(["*.log", "!keep.log"])
+
+    assert matcher.is_ignored("debug.log")
+    assert not matcher.is_ignored(os.path.join("logs", "keep.log"))
+
+
+def test_scan_honors_nested_ignore_files(temp_dir):
+    """Test .gitignore and .pocketignore files at several depths."""
+    (temp_dir / ".gitignore").write_text("*.tmp\nbuild/\n", encoding="utf-8")
+    (temp_dir / "pkg").mkdir()
+    (temp_dir / "pkg" / ".gitignore").write_text("!important.tmp\n/local.txt\n", encoding="utf-8")
+    (temp_dir / ".pocketignore").write_text("secrets/\n", encoding="utf-8")
+    for relative in ("a.tmp", "main.py", "pkg/important.tmp", "pkg/other.tmp",
+                     "pkg/local.txt", "pkg/sub/local.txt", "secrets/key.pem",
+                     "build/out.js"):
+        path = temp_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x", encoding="utf-8")
+
+    index = scan_project(str(temp_dir), [".gitignore", ".pocketignore"], use_ignore_files=True)
+    paths = {r.relative_path.replace(os.sep, "/") for r in index.iter_files()}
+
+    assert paths == {"main.py", "pkg/important.tmp", "pkg/sub/local.txt"}
+
+
+def test_scan_never_enters_ignored_directories(temp_dir, monkeypatch):
+    """Test that ignored subtrees are pruned rather than filtered."""
+    (temp_dir / "node_modules" / "pkg").mkdir(parents=True)
+    (temp_dir / "main.py").write_text("x", encoding="utf-8")
+
+    scanned = []
+    original = os.scandir
+
+    def tracking_scandir(path):
+        scanned.append(os.path.basename(path))
+        return original(path)
+
+    monkeypatch.setattr(os, "scandir", tracking_scandir)
+    scan_project(str(temp_dir), ["node_modules"])
+
+    assert "node_modules" not in scanned
+
+
+def test_scan_opens_only_the_ignore_files_listed(temp_dir, monkeypatch):
+    """Test that directories without ignore files cost no open attempt."""
+    (temp_dir / "pkg" / "sub").mkdir(parents=True)
+    (temp_dir / "pkg" / ".pocketignore").write_text("*.tmp\n", encoding="utf-8")
+    (temp_dir / "pkg" / "sub" / "a.tmp").write_text("x", encoding="utf-8")
+    (temp_dir / "main.py").write_text("x", encoding="utf-8")
+
+    opened = []
+    original = open
+
+    def tracking_open(path, *args, **kwargs):
+        opened.append(os.path.relpath(path, temp_dir))
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    index = scan_project(str(temp_dir), [".pocketignore"], use_ignore_files=True)
+
+    assert opened == [os.path.join("pkg", ".pocketignore")]
+    assert [record.name for record in index.iter_files()] == ["main.py"]
@@ -0,0 +1,90 @@
+"""
+Tests for language-aware minification.
+"""
+
+import ast
+
+from super_pocket.project.export.minify import JAVASCRIPT, LITERAL, SQL, lex, minify
+
+PYTHON = '''#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Docstring  with  spaces\x20\x20\x20
+
+and a blank line."""
+import os  # trailing comment
+
+
+def f(x):\x20\x20\x20
+    # explanation
+    s = "# not a comment  "
+    t = f"{x}  # still a string"
+    return s + t + \'\'\'
+
+    kept blank lines above  \'\'\'
+'''
+
+
+def test_minify_python_keeps_literals_and_syntax_tree():
+    """Test that Python comments and blank lines go and strings stay intact."""
+    result = minify(PYTHON, "python")
+
+    assert result.startswith("#!/usr/bin/env python3\n# -*- coding: utf-8 -*-\n")
+    assert '"""Docstring  with  spaces   \n\nand a blank line."""' in result
+    assert "# trailing comment" not in result and "# explanation" not in result
+    assert '"# not a comment  "' in result
+    assert 'f"{x}  # still a string"' in result
+    assert "\'\'\'\n\n    kept blank lines above  \'\'\'" in result
+    assert "def f(x):\n    s =" in result
+    assert ast.dump(ast.parse(result)) == ast.dump(ast.parse(PYTHON))
+
+
+def test_minify_python_returns_none_when_not_tokenizable():
+    """Test that invalid Python is left untouched."""
+    assert minify('s = """unterminated\n', "python") is None
+    assert minify("x = 1\n", "plaintext") is None
+
+
+def test_minify_javascript_templates_and_regexes():
+    """Test that template literals, substitutions and regexes are not mistaken for comments."""
+    source = (
+        "/*! license */\n"
+        "const url = 'http://example.com'; // site\n"
+        "const re = /\\/\\/\"/g;\n"
+        "const t = `a // b ${ {k: 1}['k'] /* c */ } ${`x // y`}`;\n"
+        "\n\n"
+        "const q = a / b; // division\n"
+    )
+
+    result = minify(source, "javascript")
+
+    assert result == (
+        "/*! license */\n"
+        "const url = 'http://example.com';\n"
+        "const re = /\\/\\/\"/g;\n"
+        "const t = `a // b ${ {k: 1}['k']   } ${`x // y`}`;\n"
+        "const q = a / b;\n"
+    )
+
+
+def test_minify_css_and_sql():
+    """Test CSS url() arguments, SQL doubled quotes and dollar quoting."""
+    assert minify("a { background: url(http://x/y.png); } // c\n", "scss") == "a { background: url(http://x/y.png); }\n"
+    assert minify("/* c */\np { color: red; }\n", "css") == "p { color: red; }\n"
+    assert minify("SELECT 'it''s -- no', $$ -- body $$ FROM t; -- end\n", "sql") == (
+        "SELECT 'it''s -- no', $$ -- body $$ FROM t;\n"
+    )
+
+
+def test_minify_keeps_text_when_a_literal_is_ambiguous():
+    """Test that a backslash before a SQL quote and a regex after ')' are left alone."""
+    assert minify("SELECT 'a\\'b -- c' FROM t; -- end\n", "sql") is None
+    assert minify("if (x) /foo'bar/.test(s); var q = 'it // s';\n", "javascript") is None
+    assert minify("var r = (a) / b; // half\n", "javascript") == "var r = (a) / b;\n"
+
+
+def test_lex_pieces_cover_source_exactly():
+    """Test that lexing loses nothing and finds every literal."""
+    for source, syntax in (("x = `a${b}c` + 'd'; // e\n", JAVASCRIPT), ("SELECT \"col\" FROM t -- c\n", SQL)):
+        pieces = lex(source, syntax)
+        assert "".join(text for _, text in pieces) == source
+        assert any(kind == LITERAL for kind, _ in pieces)
@@ -0,0 +1,53 @@
+"""
+Tests for the byte-offset sidecar index.
+"""
+
+import io
+
+import pytest
+
+from super_pocket.project.export.offsets import (
+    OffsetIndexWriter,
+    TrackingWriter,
+    default_index_path,
+    load_index,
+    read_file,
+)
+
+
+def test_tracking_writer_counts_utf8_bytes():
+    """Test that positions are byte offsets, not character counts."""
+    writer = TrackingWriter(io.StringIO())
+    writer.write("é")
+    writer.write("abc")
+
+    assert writer.tell() == 5
+
+
+def test_index_round_trip_and_mmap_slicing(temp_dir):
+    """Test writing entries, loading them and slicing the document."""
+    document = temp_dir / "doc.md"
+    document.write_bytes("# Title\nhéllo\nworld\n".encode("utf-8"))
+    index_path = default_index_path(str(document))
+
+    with OffsetIndexWriter(index_path, str(document)) as offsets:
+        offsets.add("a/one.txt", 8, "héllo".encode("utf-8"))
+        offsets.add("two.txt", 15, length=5, sha256=None)
+        offsets.alias("copy.txt", "a/one.txt")
+
+    index = load_index(index_path)
+    assert index["a/one.txt"].length == 6
+    assert read_file(str(document), "a/one.txt", verify=True) == "héllo"
+    assert read_file(str(document), "copy.txt", index) == "héllo"
+    assert read_file(str(document), "two.txt", index) == "world"
+    with pytest.raises(KeyError):
+        read_file(str(document), "missing.txt", index)
+
+
+def test_load_index_rejects_other_files(temp_dir):
+    """Test that a file without the index header is refused."""
+    path = temp_dir / "not-an-index.jsonl"
+    path.write_text('["a", 1, 2, "h"]\n', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        load_index(str(path))
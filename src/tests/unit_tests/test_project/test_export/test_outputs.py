@@ -0,0 +1,50 @@
+"""
+Tests for export output destinations.
+"""
+
+import gzip
+import lzma
+import zipfile
+
+import pytest
+
+from super_pocket.project.export.outputs import (
+    compression_of,
+    open_output,
+    split_compression,
+    zip_member_name,
+)
+from super_pocket.project.export.shards import shard_path
+
+
+def test_compression_helpers():
+    """Test how output names select compression."""
+    assert compression_of("export.md") is None
+    assert compression_of("export.md.GZ") == "gz"
+    assert split_compression("export.md.xz") == ("export.md", ".xz")
+    assert zip_member_name("out/export.md.zip") == "export.md"
+    assert zip_member_name("export.zip") == "export.md"
+    assert shard_path("export.md.gz", 2) == "export-002.md.gz"
+
+
+@pytest.mark.parametrize("name, reader", [
+    ("export.md.gz", lambda path: gzip.open(path, "rt", encoding="utf-8").read()),
+    ("export.md.xz", lambda path: lzma.open(path, "rt", encoding="utf-8").read()),
+    ("export.md.zip", lambda path: zipfile.ZipFile(path).read("export.md").decode("utf-8")),
+    ("export.md", lambda path: open(path, encoding="utf-8").read()),
+])
+def test_open_output_round_trip(temp_dir, name, reader):
+    """Test that every destination stores the written text."""
+    path = str(temp_dir / name)
+    with open_output(path) as stream:
+        stream.write("# title\n")
+        stream.write("héllo\n")
+
+    assert reader(path) == "# title\nhéllo\n"
+
+
+def test_compressed_outputs_are_not_rewindable(temp_dir):
+    """Test that compressed streams never promise seeking backwards."""
+    for name in ("a.md.gz", "a.md.xz", "a.md.zip"):
+        with open_output(str(temp_dir / name)) as stream:
+            assert not stream.seekable()
@@ -0,0 +1,125 @@
+"""
+Tests for parallel, order-preserving file reading.
+"""
+
+import pytest
+
+from super_pocket.project.export.reader import (
+    iter_contents,
+    iter_record_chunks,
+    read_record,
+)
+from super_pocket.project.export.scanner import scan_project
+
+
+def test_read_record_decodes_utf8(sample_project_structure):
+    """Test reading a text file."""
+    record = next(scan_project(str(sample_project_structure)).iter_files())
+
+    result = read_record(record)
+
+    assert result.text == "# Test Project"
+    assert result.error is None
+
+
+def test_read_record_flags_binary_extension_without_opening(temp_dir, monkeypatch):
+    """Test that known binary extensions are skipped before any read."""
+    (temp_dir / "model.ckpt").write_bytes(b"weights")
+    record = next(scan_project(str(temp_dir)).iter_files())
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("binary file was opened")
+
+    monkeypatch.setattr("builtins.open", fail_open)
+    result = read_record(record)
+
+    assert result.binary
+    assert result.text is None
+
+
+def test_read_record_flags_undecodable_content_as_binary(temp_dir):
+    """Test that control data past the sniff window is binary."""
+    (temp_dir / "data.txt").write_bytes(b"a" * 10000 + bytes(range(0x80, 0xa0)) * 50)
+    record = next(scan_project(str(temp_dir)).iter_files())
+
+    result = read_record(record)
+
+    assert result.binary
+    assert result.error is None
+
+
+def test_read_record_falls_back_to_legacy_encoding_past_sniff_window(temp_dir):
+    """Test that text that stops being UTF-8 past the sniff window is decoded as CP1252."""
+    (temp_dir / "legacy.txt").write_bytes(b"a" * 10000 + "\r\nCafé “quoted” €\r\n".encode("cp1252"))
+    record = next(scan_project(str(temp_dir)).iter_files())
+
+    result = read_record(record)
+
+    assert result.text == "a" * 10000 + "\nCafé “quoted” €\n"
+    assert result.encoding == "cp1252"
+
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-16-le", "utf-16-be", "utf-8-sig", "utf-32"])
+def test_read_record_and_streaming_decode_sniffed_encodings(temp_dir, encoding):
+    """Test that BOM and UTF-16 sniffing decode files read whole and streamed alike."""
+    text = "def héllo():\r\n    return '☃'\r\n" * 50
+    (temp_dir / "module.py").write_bytes(text.encode(encoding))
+    record = next(scan_project(str(temp_dir)).iter_files())
+
+    result = read_record(record)
+    streamed = "".join(iter_record_chunks(record, chunk_size=7))
+
+    assert result.text == streamed == text.replace("\r\n", "\n")
+    assert result.encoding == encoding
+
+
+def test_iter_contents_parallel_preserves_order(temp_dir):
+    """Test that threaded reads are yielded in index order."""
+    for i in range(200):
+        (temp_dir / f"file_{i:03d}.txt").write_text(f"content {i}", encoding="utf-8")
+    records = list(scan_project(str(temp_dir)).iter_files())
+
+    sequential = [r.text for r in iter_contents(records, jobs=1)]
+    parallel = [r.text for r in iter_contents(records, jobs=8, prefetch=5)]
+
+    assert parallel == sequential
+    assert parallel[0] == "content 0"
+    assert parallel[-1] == "content 199"
+
+
+def test_iter_text_chunks_handles_split_characters_and_line_endings():
+    """Test incremental decoding across chunk boundaries."""
+    import io
+
+    from super_pocket.project.export.reader import iter_text_chunks
+
+    data = "é\r\nline\rend\r\n".encode("utf-8")
+    chunks = list(iter_text_chunks(io.BytesIO(data), chunk_size=1))
+
+    assert "".join(chunks) == "é\nline\nend\n"
+
+
+def test_read_record_flags_large_files_for_streaming(temp_dir):
+    """Test that files above the threshold are not loaded by the reader."""
+    from super_pocket.project.export.reader import STREAM_THRESHOLD, iter_record_chunks
+
+    (temp_dir / "big.log").write_text("x" * (STREAM_THRESHOLD + 1), encoding="utf-8")
+    record = next(scan_project(str(temp_dir)).iter_files())
+
+    result = read_record(record)
+
+    assert result.streamed
+    assert result.text is None
+    assert sum(len(chunk) for chunk in iter_record_chunks(record)) == STREAM_THRESHOLD + 1
+
+
+def test_iter_record_chunks_falls_back_to_legacy_encoding_past_sniff_window(temp_dir):
+    """Test that a streamed file switches to CP1252 where it stops being UTF-8."""
+    from super_pocket.project.export.reader import STREAM_THRESHOLD, iter_record_chunks
+
+    (temp_dir / "big.log").write_bytes(b"line\n" * (STREAM_THRESHOLD // 5) + "café €\n".encode("cp1252"))
+    record = next(scan_project(str(temp_dir)).iter_files())
+
+    text = "".join(iter_record_chunks(record, chunk_size=1000))
+
+    assert text == "line\n" * (STREAM_THRESHOLD // 5) + "café €\n"
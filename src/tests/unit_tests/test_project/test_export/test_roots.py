@@ -0,0 +1,43 @@
+"""
+Tests for multi-root export helpers.
+"""
+
+import os
+
+import pytest
+
+from super_pocket.project.export.roots import expand_roots, group_roots, root_outputs
+
+
+def test_expand_roots_globs_and_paths(temp_dir):
+    """Test that globs keep sorted directories only and duplicates are dropped."""
+    for name in ("web", "api"):
+        (temp_dir / "packages" / name).mkdir(parents=True)
+    (temp_dir / "packages" / "README.md").write_text("readme")
+    (temp_dir / "tools").mkdir()
+
+    roots = expand_roots([str(temp_dir / "packages" / "*"), str(temp_dir / "tools"), str(temp_dir / "packages" / "api")])
+
+    assert roots == [
+        str(temp_dir / "packages" / "api"),
+        str(temp_dir / "packages" / "web"),
+        str(temp_dir / "tools"),
+    ]
+
+
+def test_expand_roots_rejects_missing_roots(temp_dir):
+    """Test errors for a missing path and for a glob without matches."""
+    with pytest.raises(ValueError):
+        expand_roots([str(temp_dir / "missing")])
+    with pytest.raises(ValueError):
+        expand_roots([str(temp_dir / "missing-*")])
+
+
+def test_group_roots_and_outputs(temp_dir):
+    """Test grouping by parent and naming each export."""
+    roots = [str(temp_dir / "packages" / "api"), str(temp_dir / "tools"), str(temp_dir / "packages" / "web")]
+
+    assert group_roots(roots) == {str(temp_dir / "packages"): ["api", "web"], str(temp_dir): ["tools"]}
+    assert root_outputs(roots, "out", ".jsonl")[roots[1]] == os.path.join("out", "tools-1-file.jsonl")
+    with pytest.raises(ValueError):
+        root_outputs([str(temp_dir / "a" / "core"), str(temp_dir / "b" / "core")], "out")
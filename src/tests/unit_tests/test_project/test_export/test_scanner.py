@@ -0,0 +1,151 @@
+"""
+Tests for the single-pass project scanner.
+"""
+
+import os
+
+from super_pocket.project.export.filters import FileFilter
+from super_pocket.project.export.scanner import index_listing, scan_project, scan_roots
+
+
+def test_scan_project_indexes_files_in_export_order(sample_project_structure):
+    """Test that files are listed directory by directory, files first."""
+    index = scan_project(str(sample_project_structure))
+
+    paths = [record.relative_path for record in index.iter_files()]
+    assert paths == [
+        "README.md",
+        os.path.join("src", "main.py"),
+        os.path.join("src", "utils.py"),
+        os.path.join("tests", "test_main.py"),
+    ]
+    assert index.name == "test_project"
+    assert index.file_count == 4
+
+
+def test_scan_project_collects_stat_data(sample_project_structure):
+    """Test that size and mtime come from the scan itself."""
+    index = scan_project(str(sample_project_structure))
+    readme = next(r for r in index.iter_files() if r.name == "README.md")
+
+    stat = (sample_project_structure / "README.md").stat()
+    assert readme.size == stat.st_size
+    assert readme.mtime_ns == stat.st_mtime_ns
+
+
+def test_scan_project_prunes_excluded_directories(sample_project_structure):
+    """Test that excluded names are neither indexed nor entered."""
+    index = scan_project(str(sample_project_structure), {"tests", "README.md"})
+
+    names = [record.name for record in index.iter_files()]
+    assert names == ["main.py", "utils.py"]
+    assert [d.name for d in index.tree.directories] == ["src"]
+
+
+def test_iter_tree_lines(sample_project_structure):
+    """Test the ASCII tree rendered from the index."""
+    (sample_project_structure / "src" / "pkg").mkdir()
+    (sample_project_structure / "src" / "pkg" / "core.py").write_text("", encoding="utf-8")
+
+    lines = list(scan_project(str(sample_project_structure)).iter_tree_lines())
+
+    assert lines == [
+        "└── README.md",
+        "├── src/",
+        "│   ├── main.py",
+        "│   └── utils.py",
+        "│   ├── pkg/",
+        "│   │   └── core.py",
+        "├── tests/",
+        "│   └── test_main.py",
+    ]
+
+
+def test_scan_project_skips_symlinked_directories(sample_project_structure):
+    """Test that directory symlinks are not followed."""
+    os.symlink(sample_project_structure / "src", sample_project_structure / "link")
+
+    index = scan_project(str(sample_project_structure))
+
+    assert "link" not in [d.name for d in index.tree.directories]
+
+
+def test_scan_project_filters_files_without_opening_them(sample_project_structure, monkeypatch):
+    """Test stat-only filtering and the pruning of emptied directories."""
+    old = sample_project_structure / "src" / "utils.py"
+    os.utime(old, ns=(0, 0))
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("a file was opened during the scan")
+
+    monkeypatch.setattr("builtins.open", fail_open)
+    index = scan_project(
+        str(sample_project_structure),
+        file_filter=FileFilter.from_options(include_ext="py", newer_than="2000-01-01")
+    )
+
+    paths = [record.relative_path for record in index.iter_files()]
+    assert paths == [os.path.join("src", "main.py"), os.path.join("tests", "test_main.py")]
+    assert [d.name for d in index.tree.directories] == ["src", "tests"]
+
+    index = scan_project(str(sample_project_structure), file_filter=FileFilter.from_options(include_ext="md"))
+    assert index.tree.directories == []
+
+
+def test_scan_roots_matches_separate_scans(temp_dir):
+    """Test that a shared scan indexes each sibling like its own scan, plus the parent's ignore rules."""
+    for name in ("api", "web"):
+        (temp_dir / name / "src").mkdir(parents=True)
+        (temp_dir / name / "src" / "app.py").write_text("app\n")
+        (temp_dir / name / "build").mkdir()
+        (temp_dir / name / "build" / "out.js").write_text("out\n")
+    (temp_dir / "web" / "app.log").write_text("log\n")
+    (temp_dir / ".gitignore").write_text("*.log\n")
+
+    shared = scan_roots(str(temp_dir), ["api", "web"], ["/build"], use_ignore_files=True)
+    separate = [scan_project(str(temp_dir / name), ["/build"], use_ignore_files=True) for name in ("api", "web")]
+
+    assert [index.name for index in shared] == ["api", "web"]
+    assert [index.root for index in shared] == [str(temp_dir / "api"), str(temp_dir / "web")]
+    assert [r.relative_path for r in shared[0]] == [r.relative_path for r in separate[0]]
+    assert [r.relative_path for r in shared[1]] == [os.path.join("src", "app.py")]
+    assert [r.relative_path for r in separate[1]] == ["app.log", os.path.join("src", "app.py")]
+    assert shared[0].tree.relative_path == "" and shared[0].tree.directories[0].relative_path == "src"
+
+
+def test_scan_roots_lists_each_directory_once(temp_dir, monkeypatch):
+    """Test that the parent is listed once and a repeated root reuses its scan."""
+    for name in ("api", "web", "docs"):
+        (temp_dir / name).mkdir()
+        (temp_dir / name / "main.py").write_text("x\n")
+    listed = []
+    original = os.scandir
+
+    def tracking_scandir(path):
+        listed.append(os.path.relpath(path, temp_dir))
+        return original(path)
+
+    monkeypatch.setattr(os, "scandir", tracking_scandir)
+    indexes = scan_roots(str(temp_dir), ["api", "web", "api", "missing"], use_ignore_files=True)
+
+    assert sorted(listed) == [".", "api", "web"]
+    assert indexes[0] is indexes[2]
+    assert [index.file_count for index in indexes] == [1, 1, 1, 0]
+
+
+def test_index_listing_matches_scan_project(sample_project_structure):
+    """Test that a listed project is indexed and ordered like the same files on disk."""
+    (sample_project_structure / "src" / "app.log").write_text("log\n")
+    (sample_project_structure / "build").mkdir()
+    (sample_project_structure / "build" / "out.js").write_text("out\n")
+    (sample_project_structure / "empty").mkdir()
+    (sample_project_structure / ".gitignore").write_text("*.log\n")
+    root = str(sample_project_structure)
+    listing = list(scan_project(root).iter_files())
+
+    listed = index_listing(root, reversed(listing), ["empty"], ["/build"], use_ignore_files=True)
+    scanned = scan_project(root, ["/build"], use_ignore_files=True)
+
+    assert list(listed.iter_tree_lines()) == list(scanned.iter_tree_lines())
+    assert [r.relative_path for r in listed] == [r.relative_path for r in scanned]
+    assert listed.skipped == scanned.skipped == {"excluded": 2}
@@ -0,0 +1,72 @@
+"""
+Tests for budget-based sharding.
+"""
+
+from super_pocket.project.export.scanner import scan_project
+from super_pocket.project.export.shards import (
+    estimate_tokens,
+    existing_shards,
+    plan_shards,
+    remove_stale_shards,
+    shard_path,
+    tokens_to_bytes,
+)
+
+
+def test_estimate_tokens_and_conversion():
+    """Test the approximate token counter."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+    assert tokens_to_bytes(10) == 40
+
+
+def test_shard_path_and_existing_shards(temp_dir):
+    """Test shard naming and discovery."""
+    output = str(temp_dir / "project-1-file.md")
+    assert shard_path(output, 3) == str(temp_dir / "project-1-file-003.md")
+
+    (temp_dir / "project-1-file-001.md").write_text("", encoding="utf-8")
+    (temp_dir / "project-1-file-notes.md").write_text("", encoding="utf-8")
+    assert existing_shards(output) == [str(temp_dir / "project-1-file-001.md")]
+
+
+def test_remove_stale_shards_keeps_new_shards_and_other_files(temp_dir):
+    """Test that only shards numbered above the new count are deleted."""
+    output = str(temp_dir / "out.md")
+    names = ["out-001.md", "out-002.md", "out-003.md", "out-004.md", "out-0005.md", "out-003x.md", "out-003.md.gz"]
+    for name in names:
+        (temp_dir / name).write_text("", encoding="utf-8")
+
+    removed = remove_stale_shards(output, 2)
+
+    assert removed == [str(temp_dir / "out-003.md"), str(temp_dir / "out-004.md")]
+    assert sorted(path.name for path in temp_dir.iterdir()) == [
+        "out-0005.md", "out-001.md", "out-002.md", "out-003.md.gz", "out-003x.md"
+    ]
+
+
+def test_plan_shards_packs_greedily_in_order(temp_dir):
+    """Test that files fill each shard before a new one starts."""
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (temp_dir / name).write_text("x" * 100, encoding="utf-8")
+    index = scan_project(str(temp_dir))
+
+    plan = plan_shards(index, budget=300, header_size=20, block_overhead=lambda r: 10)
+
+    assert [[r.name for r in shard.records] for shard in plan] == [["a.txt", "b.txt"], ["c.txt"]]
+    assert all(shard.size <= 300 for shard in plan)
+    assert not any(shard.oversized for shard in plan)
+
+
+def test_plan_shards_isolates_oversized_files(temp_dir):
+    """Test that a file larger than the budget gets its own shard."""
+    (temp_dir / "a.txt").write_text("x" * 10, encoding="utf-8")
+    (temp_dir / "b.txt").write_text("x" * 1000, encoding="utf-8")
+    (temp_dir / "c.txt").write_text("x" * 10, encoding="utf-8")
+    index = scan_project(str(temp_dir))
+
+    plan = plan_shards(index, budget=200, header_size=20, block_overhead=lambda r: 10)
+
+    assert [[r.name for r in shard.records] for shard in plan] == [["a.txt"], ["b.txt"], ["c.txt"]]
+    assert [shard.oversized for shard in plan] == [False, True, False]
@@ -0,0 +1,112 @@
+"""
+Tests for Python skeleton extraction.
+"""
+
+from super_pocket.project.export import skeleton
+from super_pocket.project.export.reader import iter_contents
+from super_pocket.project.export.scanner import scan_project
+from super_pocket.project.export.skeleton import (
+    SkeletonOptions,
+    iter_skeletons,
+    skeletonize,
+)
+
+SOURCE = '''"""Module docstring."""
+import os
+from typing import Any
+
+CONSTANT = compute()
+
+
+@dataclass(frozen=True)
+class Point(Base, metaclass=Meta):
+    """A point."""
+    x: int = 0
+
+    @property
+    def norm(self) -> float:
+        """Euclidean norm."""
+        return (self.x ** 2) ** 0.5
+
+    class Inner:
+        pass
+
+
+async def fetch(url: str, *, retries: int = 3) -> Any:
+    for _ in range(retries):
+        pass
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+def test_skeletonize_keeps_structure_and_drops_bodies():
+    """Test that only docstrings, imports, decorators and signatures remain."""
+    result = skeletonize(SOURCE)
+
+    assert result.startswith('"""Module docstring."""\nimport os\nfrom typing import Any\n')
+    assert "@dataclass(frozen=True)\nclass Point(Base, metaclass=Meta):\n    \"\"\"A point.\"\"\"" in result
+    assert "    @property\n    def norm(self) -> float:\n        \"\"\"Euclidean norm.\"\"\"\n        ...\n" in result
+    assert "    class Inner:\n        ...\n" in result
+    assert "async def fetch(url: str, *, retries: int=3) -> Any:\n    ...\n" in result
+    assert "    \"\"\"A point.\"\"\"\n    x: int = 0\n" in result
+    for dropped in ("CONSTANT", "return", "range", "__main__"):
+        assert dropped not in result
+
+
+def test_skeletonize_keeps_class_fields_and_guarded_imports():
+    """Test that dataclass fields, class attributes and imports under try/if survive."""
+    source = (
+        "try:\n    import ujson as json\nexcept ImportError:\n    import json\n    FAST = False\n"
+        "if TYPE_CHECKING:\n    from app.models import User\n"
+        "if DEBUG:\n    configure()\n"
+        "@dataclass\nclass Config:\n    name: str\n    tags: list[str] = field(default_factory=list)\n"
+        "    VERSION = 2\n    self.cache: dict = {}\n    registry[name] = 1\n"
+    )
+
+    assert skeletonize(source) == (
+        "try:\n    import ujson as json\nexcept ImportError:\n    import json\n"
+        "if TYPE_CHECKING:\n    from app.models import User\n\n"
+        "@dataclass\nclass Config:\n    name: str\n    tags: list[str] = field(default_factory=list)\n"
+        "    VERSION = 2\n"
+    )
+
+
+def test_skeletonize_returns_none_for_invalid_source():
+    """Test that unparsable files are left to the caller."""
+    assert skeletonize("def broken(:\n") is None
+    assert skeletonize("") == ""
+
+
+def test_skeleton_options_match_python_files_not_kept_in_full():
+    """Test the keep-full patterns and the extension check."""
+    options = SkeletonOptions(keep_full=("src/core/**", "setup.py"))
+
+    assert options.applies_to("src/app.py")
+    assert options.applies_to("stubs/app.pyi")
+    assert not options.applies_to("src/core/engine.py")
+    assert not options.applies_to("setup.py")
+    assert not options.applies_to("README.md")
+    assert "src/core/**" in options.signature
+
+
+def test_iter_skeletons_pool_preserves_order(temp_dir, monkeypatch):
+    """Test that the process pool path yields every result in order."""
+    monkeypatch.setattr(skeleton, "POOL_MIN_FILES", 1)
+    for i in range(40):
+        (temp_dir / f"mod_{i:02d}.py").write_text(f"import os\n\ndef f{i}():\n    return {i}\n", encoding='utf-8')
+    (temp_dir / "notes.txt").write_text("def not_python(): pass\n", encoding='utf-8')
+    (temp_dir / "broken.py").write_text("def broken(:\n", encoding='utf-8')
+    records = list(scan_project(str(temp_dir)).iter_files())
+
+    results = list(iter_skeletons(iter_contents(records), SkeletonOptions(jobs=2), expected=len(records)))
+
+    assert [result.record for result in results] == records
+    by_name = {result.record.name: result for result in results}
+    assert by_name["mod_07.py"].skeleton
+    assert by_name["mod_07.py"].text == "import os\n\ndef f7():\n    ...\n"
+    assert not by_name["notes.txt"].skeleton
+    assert not by_name["broken.py"].skeleton
+    assert by_name["broken.py"].text == "def broken(:\n"
@@ -0,0 +1,51 @@
+"""
+Tests for binary and encoding sniffing.
+"""
+
+from super_pocket.project.export.sniff import (
+    detect_encoding,
+    has_binary_extension,
+    legacy_encoding,
+    looks_binary,
+)
+
+
+def test_has_binary_extension():
+    """Test the extension table."""
+    assert has_binary_extension("weights.safetensors")
+    assert has_binary_extension("path/to/IMAGE.PNG")
+    assert not has_binary_extension("main.py")
+    assert not has_binary_extension("Dockerfile")
+
+
+def test_looks_binary_magic_numbers_and_nul_bytes():
+    """Test detection from the leading byte window."""
+    assert looks_binary(b"\x89PNG\r\n\x1a\n....")
+    assert looks_binary(b"SQLite format 3\x00rest")
+    assert looks_binary(b"text with a \x00 inside")
+    assert looks_binary(b"\x81\x8d\x8f\x90\x9d\x01 invalid utf-8")
+
+
+def test_looks_binary_accepts_text_and_truncated_sequences():
+    """Test that text, including a multi-byte character cut by the window, is not binary."""
+    assert not looks_binary(b"def main():\n    pass\n")
+    assert not looks_binary("café ☃".encode("utf-8")[:-1])
+    assert not looks_binary(b"")
+
+
+def test_detect_encoding_boms_utf16_pattern_and_legacy_fallback():
+    """Test that BOMs win, BOM-less UTF-16 is found from NULs and legacy text falls back."""
+    assert detect_encoding(b"\xef\xbb\xbfx = 1\n") == "utf-8-sig"
+    assert detect_encoding("x = 1\n".encode("utf-16")) == "utf-16"
+    assert detect_encoding("x = 1\n".encode("utf-32")) == "utf-32"
+    assert detect_encoding("x = 'é'\n".encode("utf-16-le")) == "utf-16-le"
+    assert detect_encoding("x = 'é'\n".encode("utf-16-be")) == "utf-16-be"
+    assert detect_encoding("x = “é” €\n".encode("cp1252")) == "cp1252"
+    assert detect_encoding(b"caf\xe9 \x81\n" + b"plain text\n" * 10) == "latin-1"
+    assert detect_encoding(b"def main():\n") == "utf-8"
+
+
+def test_legacy_encoding_rejects_control_data():
+    """Test that bytes full of control characters are not taken for legacy text."""
+    assert legacy_encoding(bytes(range(0x80, 0xa0)) * 4) is None
+    assert legacy_encoding(b"\x01\x02\x03\x04 abc") is None
@@ -0,0 +1,96 @@
+"""
+Tests for export statistics and progress reporting.
+"""
+
+import io
+import time
+
+from rich.console import Console
+
+from super_pocket.project.export.filters import FileFilter
+from super_pocket.project.export.scanner import scan_project
+from super_pocket.project.export.stats import (
+    PhaseTimer,
+    progress_bar,
+    stats_lines,
+    timed,
+)
+from super_pocket.project.export.summary import ExportSummary
+
+
+def test_phase_timer_split():
+    """Test that part of a phase can be attributed to another one."""
+    timer = PhaseTimer()
+    with timer.phase("write"):
+        time.sleep(0.01)
+    total = timer.total
+
+    timer.split("write", "read", 1.0)
+
+    assert timer.phases["read"] == total
+    assert timer.phases["write"] == 0
+    assert timer.total == total
+
+
+def test_timed_counts_time_spent_waiting():
+    """Test that only the time spent producing items is counted."""
+    def slow():
+        for i in range(3):
+            time.sleep(0.01)
+            yield i
+
+    summary = ExportSummary()
+    items = []
+    for item in timed(slow(), summary):
+        items.append(item)
+        time.sleep(0.02)
+
+    assert items == [0, 1, 2]
+    assert 0.03 <= summary.read_seconds < 0.06
+
+
+def test_stats_lines_report(sample_project_structure):
+    """Test the phases, skip reasons and largest files of the report."""
+    (sample_project_structure / "big.md").write_text("x" * 5000)
+    index = scan_project(
+        str(sample_project_structure),
+        ["tests"],
+        file_filter=FileFilter.from_options(include_ext="py,md")
+    )
+    timer = PhaseTimer({"scan": 0.25, "read": 0.5, "write": 0.25})
+    summary = ExportSummary(files_written=4, binary_skipped=1)
+
+    lines = stats_lines(timer, summary, index, top=2)
+
+    assert "||   Read and decode: 0.500 s (50%)" in lines
+    assert "||   Total: 1.000 s" in lines
+    assert "||   Throughput: 4 files/s, 0.0 MB/s" in lines
+    assert "||   Skipped: excluded 1, binary 1" in lines
+    assert lines[-2].endswith("big.md") and lines[-1].endswith("utils.py")
+
+
+def test_scan_counts_filtered_files(sample_project_structure):
+    """Test that files rejected by the filter are counted by the scan."""
+    index = scan_project(str(sample_project_structure), file_filter=FileFilter.from_options(include_ext="md"))
+
+    assert index.skipped["filtered"] == 3
+
+
+def test_progress_bar_only_on_terminals():
+    """Test that the bar is drawn on a terminal and never on redirected output."""
+    redirected = io.StringIO()
+    with progress_bar(Console(file=redirected), total=2) as advance:
+        advance(None)
+    assert redirected.getvalue() == ""
+
+    terminal = io.StringIO()
+    console = Console(file=terminal, force_terminal=True, width=80)
+    with progress_bar(console, total=2) as advance:
+        advance(None)
+        advance(None)
+    assert "2/2" in terminal.getvalue()
+
+    disabled = io.StringIO()
+    with progress_bar(Console(file=disabled, force_terminal=True), total=2, enabled=False) as advance:
+        advance(None)
+    assert disabled.getvalue() == ""
@@ -0,0 +1,107 @@
+"""
+Tests for head/tail truncation.
+"""
+
+import io
+
+from super_pocket.project.export.truncate import (
+    LINE_SCAN_BYTES,
+    SCAN_SIZE,
+    TruncationLimits,
+    read_excerpt,
+)
+
+
+class RecordingHandle(io.BytesIO):
+    """BytesIO remembering which byte ranges were read."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.ranges = []
+
+    def read(self, size=-1):
+        start = self.tell()
+        data = super().read(size)
+        self.ranges.append((start, start + len(data)))
+        return data
+
+
+def _lines(count):
+    return b"".join(f"line {i:05d}\n".encode() for i in range(count))
+
+
+def test_read_excerpt_returns_whole_file_when_it_fits():
+    """Test that files within both limits are not truncated nor read twice."""
+    data = _lines(10)
+    limits = TruncationLimits(max_bytes=len(data), max_lines=10)
+
+    excerpt = read_excerpt(io.BytesIO(data), len(data), limits)
+
+    assert excerpt.omitted_bytes == 0 and excerpt.head == data
+    assert read_excerpt(io.BytesIO(data), len(data), TruncationLimits(max_bytes=len(data))) is None
+    assert not TruncationLimits()
+
+
+def test_read_excerpt_by_lines_keeps_head_and_tail():
+    """Test line-based truncation and the rendered marker."""
+    data = _lines(100)
+    excerpt = read_excerpt(io.BytesIO(data), len(data), TruncationLimits(max_lines=4))
+
+    assert excerpt.head == _lines(2)
+    assert excerpt.tail == b"line 00098\nline 00099\n"
+    assert excerpt.omitted_bytes == 96 * 11
+    assert excerpt.omitted_lines == 96
+    text = excerpt.render()
+    assert text.startswith("line 00000\nline 00001\n[... truncated: 1,056 bytes (~96 lines) omitted ...]\n")
+    assert text.endswith("line 00099\n")
+
+
+def test_read_excerpt_by_bytes_never_reads_the_middle():
+    """Test that byte-based truncation only reads both ends, on line boundaries."""
+    data = _lines(10000)
+    handle = RecordingHandle(data)
+
+    excerpt = read_excerpt(handle, len(data), TruncationLimits(max_bytes=1000))
+
+    assert len(excerpt.head) + len(excerpt.tail) <= 1000
+    assert excerpt.head.endswith(b"\n") and excerpt.tail.startswith(b"line ")
+    assert all(end <= 500 or start >= len(data) - 500 for start, end in handle.ranges)
+    assert excerpt.omitted_bytes == len(data) - len(excerpt.head) - len(excerpt.tail)
+
+
+def test_read_excerpt_cuts_long_lines_on_character_boundaries():
+    """Test that a single long line is cut without splitting UTF-8 characters."""
+    data = "é".encode() * 1000
+    excerpt = read_excerpt(io.BytesIO(data), len(data), TruncationLimits(max_bytes=101))
+
+    assert excerpt.head.decode("utf-8") == "é" * 25
+    assert excerpt.tail.decode("utf-8") == "é" * 25
+
+
+def test_read_excerpt_by_lines_scans_long_lines_within_a_window():
+    """Test that a line limit alone keeps at most a window from either end of a long file."""
+    data = b"".join(bytes([97 + i]) * (LINE_SCAN_BYTES // 2 - 1) + b"\n" for i in range(20))
+    handle = RecordingHandle(data)
+
+    excerpt = read_excerpt(handle, len(data), TruncationLimits(max_lines=10))
+
+    assert all(end - start <= SCAN_SIZE for start, end in handle.ranges)
+    assert excerpt.head == data[:LINE_SCAN_BYTES]
+    assert excerpt.tail == b"t" * (LINE_SCAN_BYTES // 2 - 1) + b"\n"
+    assert excerpt.omitted_bytes == len(data) - len(excerpt.head) - len(excerpt.tail)
+
+
+def test_read_excerpt_by_lines_keeps_long_files_under_the_limit():
+    """Test that a file beyond both windows but within the line limit is not truncated."""
+    line = b"x" * 6000 + b"\n"
+    data = line * 500
+    assert len(data) > 2 * LINE_SCAN_BYTES
+    handle = RecordingHandle(data)
+
+    assert read_excerpt(handle, len(data), TruncationLimits(max_lines=2000)) is None
+    assert read_excerpt(io.BytesIO(data), len(data), TruncationLimits(max_lines=500)) is None
+    excerpt = read_excerpt(io.BytesIO(data), len(data), TruncationLimits(max_lines=499))
+    assert excerpt.omitted_bytes and excerpt.head.count(b"\n") < 250
+    assert all(end - start <= SCAN_SIZE for start, end in handle.ranges)
+    unterminated = data[:-1]
+    assert read_excerpt(io.BytesIO(unterminated), len(unterminated), TruncationLimits(max_lines=500)) is None
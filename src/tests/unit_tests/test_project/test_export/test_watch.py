@@ -0,0 +1,104 @@
+"""
+Tests for watched exports.
+"""
+
+import sys
+
+import pytest
+
+from super_pocket.project.export.scanner import scan_project
+from super_pocket.project.export.watch import (
+    Changes,
+    InotifyWatcher,
+    LiveExport,
+    PollingWatcher,
+    wait_for_changes,
+)
+
+
+def _live(project, output, rendered):
+    def write_header(md_file, index):
+        md_file.write("".join(f"{line}\n" for line in index.iter_tree_lines()))
+
+    def write_files(md_file, records, on_block):
+        for record in records:
+            on_block(record)
+            rendered.append(record.relative_path)
+            with open(record.path, encoding="utf-8") as handle:
+                md_file.write(f"== {record.relative_path}\n{handle.read()}")
+
+    return LiveExport(str(output), lambda: scan_project(str(project)), write_header, write_files)
+
+
+def test_live_export_rerenders_only_changed_files(temp_dir):
+    """Test that an update copies clean sections and re-renders dirty ones."""
+    project = temp_dir / "proj"
+    project.mkdir()
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (project / name).write_text(f"{name}\n", encoding="utf-8")
+    output = temp_dir / "out.md"
+    rendered = []
+    live = _live(project, output, rendered)
+    live.build()
+    rendered.clear()
+
+    (project / "b.txt").write_text("changed and longer\n", encoding="utf-8")
+    assert live.update(Changes(paths={"b.txt"})) == 1
+
+    assert rendered == ["b.txt"]
+    assert output.read_text(encoding="utf-8") == (
+        "├── a.txt\n├── b.txt\n└── c.txt\n"
+        "== a.txt\na.txt\n== b.txt\nchanged and longer\n== c.txt\nc.txt\n"
+    )
+    assert live.update(Changes(paths={"missing.txt"})) == 0
+
+
+def test_live_export_rescans_on_structural_changes(temp_dir):
+    """Test that added and removed files update the header and the blocks."""
+    project = temp_dir / "proj"
+    project.mkdir()
+    (project / "a.txt").write_text("a\n", encoding="utf-8")
+    (project / "b.txt").write_text("b\n", encoding="utf-8")
+    output = temp_dir / "out.md"
+    rendered = []
+    live = _live(project, output, rendered)
+    live.build()
+    rendered.clear()
+
+    (project / "b.txt").unlink()
+    (project / "c.txt").write_text("c\n", encoding="utf-8")
+    live.update(Changes(structural=True))
+
+    assert rendered == ["c.txt"]
+    assert output.read_text(encoding="utf-8") == "├── a.txt\n└── c.txt\n== a.txt\na\n== c.txt\nc\n"
+
+
+def test_polling_watcher_reports_modified_and_new_files(temp_dir):
+    """Test the stat-based fallback watcher."""
+    (temp_dir / "a.txt").write_text("a", encoding="utf-8")
+    watcher = PollingWatcher(scan_project(str(temp_dir)), interval=0.01)
+
+    assert not watcher.wait(0.02)
+    (temp_dir / "a.txt").write_text("modified", encoding="utf-8")
+    assert watcher.wait(0.5).paths == {"a.txt"}
+    (temp_dir / "b.txt").write_text("new", encoding="utf-8")
+    assert wait_for_changes(watcher, debounce=0.02).structural
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_watcher_reports_changes(temp_dir):
+    """Test that inotify events map to project paths."""
+    (temp_dir / "sub").mkdir()
+    (temp_dir / "sub" / "a.txt").write_text("a", encoding="utf-8")
+    (temp_dir / "out.md").write_text("", encoding="utf-8")
+    watcher = InotifyWatcher(scan_project(str(temp_dir)), ignore_paths=[str(temp_dir / "out.md")])
+    try:
+        (temp_dir / "out.md").write_text("ignored", encoding="utf-8")
+        (temp_dir / "sub" / "a.txt").write_text("modified", encoding="utf-8")
+        changes = wait_for_changes(watcher, debounce=0.05)
+        assert changes.paths == {"sub/a.txt"} and not changes.structural
+
+        (temp_dir / "sub" / "b.txt").write_text("new", encoding="utf-8")
+        assert wait_for_changes(watcher, debounce=0.05).structural
+    finally:
+        watcher.close()
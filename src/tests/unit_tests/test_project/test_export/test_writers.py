@@ -0,0 +1,93 @@
+"""
+Tests for the structured output writers.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from super_pocket.project.export.writers import (
+    WRITERS,
+    ExportEntry,
+    ExportWriter,
+    JsonlWriter,
+    SqliteWriter,
+    format_for,
+    open_writer,
+    register_writer,
+)
+
+
+def test_format_for_uses_registered_extensions():
+    """Test output format inference from file names."""
+    assert format_for("export.jsonl") == "jsonl"
+    assert format_for("export.jsonl.gz") == "jsonl"
+    assert format_for("export.sqlite") == "sqlite"
+    assert format_for("export.md") == "markdown"
+    assert format_for(None) == "markdown"
+
+
+def test_jsonl_writer_streams_chunks_into_one_record(temp_dir):
+    """Test that chunked contents are joined into a single JSON line."""
+    output = temp_dir / "out.jsonl"
+    with JsonlWriter(str(output), "proj") as writer:
+        writer.write_file(ExportEntry("src/a.py", "python", 9, "abc"), ["x = '", 'é"\n', "'"])
+        writer.write_file(ExportEntry("big.log", "plaintext", 99, None, truncated=True), ["head"])
+
+    first, second = (json.loads(line) for line in output.read_text(encoding="utf-8").splitlines())
+    assert first == {"path": "src/a.py", "language": "python", "size": 9, "sha256": "abc", "content": "x = 'é\"\n'"}
+    assert second["truncated"] is True
+
+
+def test_jsonl_writer_skips_files_failing_mid_stream(temp_dir):
+    """Test that nothing is written for a file whose chunks raise."""
+    def failing():
+        yield "partial"
+        raise ValueError("binary")
+
+    output = temp_dir / "out.jsonl"
+    with JsonlWriter(str(output), "proj") as writer:
+        with pytest.raises(ValueError):
+            writer.write_file(ExportEntry("a.bin", "plaintext", 1, None), failing())
+
+    assert output.read_text(encoding="utf-8") == ""
+
+
+def test_sqlite_writer_builds_full_text_index(temp_dir):
+    """Test the files table and the FTS5 search."""
+    output = temp_dir / "out.sqlite"
+    with SqliteWriter(str(output), "proj") as writer:
+        writer.write_file(ExportEntry("a.py", "python", 10, "h1"), ["def scan_project(): pass\n"])
+        writer.write_file(ExportEntry("b.md", "markdown", 5, "h2"), ["# Notes\n"])
+
+    connection = sqlite3.connect(output)
+    try:
+        rows = connection.execute("SELECT path, language, sha256 FROM files ORDER BY id").fetchall()
+        assert rows == [("a.py", "python", "h1"), ("b.md", "markdown", "h2")]
+        if writer.has_fts:
+            hits = connection.execute("SELECT path FROM files_fts WHERE files_fts MATCH 'scan_project'").fetchall()
+            assert hits == [("a.py",)]
+    finally:
+        connection.close()
+
+
+def test_open_writer_validates_format_and_destination(temp_dir):
+    """Test errors for unknown formats and unsupported destinations."""
+    with pytest.raises(ValueError):
+        open_writer("yaml", str(temp_dir / "out.yaml"), "proj")
+    with pytest.raises(ValueError):
+        open_writer("sqlite", "-", "proj")
+
+
+def test_register_writer_adds_a_format(temp_dir):
+    """Test that third-party writers can be registered."""
+    @register_writer
+    class PathsWriter(ExportWriter):
+        name = "paths"
+        extension = ".paths"
+
+    try:
+        assert format_for("export.paths") == "paths"
+    finally:
+        del WRITERS["paths"]
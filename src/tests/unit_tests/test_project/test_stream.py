@@ -0,0 +1,78 @@
+"""
+Tests for the streaming library API.
+"""
+
+import io
+import json
+import shutil
+
+import pytest
+
+from super_pocket.project.export.options import ExportOptions
+from super_pocket.project.stream import export_to, iter_markdown, iter_records
+from super_pocket.project.to_file import create_codebase_markdown, export_options
+
+
+def test_iter_markdown_matches_file_export(sample_project_structure, temp_dir):
+    """Test that the streamed chunks join into the document written to a file."""
+    output_file = temp_dir / "export.md"
+    create_codebase_markdown(str(sample_project_structure), str(output_file), export_options(""))
+
+    chunks = list(iter_markdown(str(sample_project_structure), ExportOptions(exclude=())))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == output_file.read_text(encoding='utf-8')
+
+
+def test_iter_markdown_reads_archives(sample_project_structure, temp_dir):
+    """Test that an archive path streams the same document as its directory."""
+    archive = shutil.make_archive(
+        str(temp_dir / "test_project"), "gztar", str(sample_project_structure.parent), sample_project_structure.name
+    )
+
+    streamed = "".join(iter_markdown(archive, ExportOptions(exclude=())))
+
+    assert streamed == "".join(iter_markdown(str(sample_project_structure), ExportOptions(exclude=())))
+
+
+def test_iter_markdown_is_silent_and_stops_early(temp_dir, capsys):
+    """Test that nothing is printed and that closing the generator stops the export."""
+    for i in range(200):
+        (temp_dir / f"file_{i:03d}.txt").write_text(f"content {i}\n", encoding='utf-8')
+    (temp_dir / "image.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+
+    chunks = iter_markdown(str(temp_dir))
+    first = next(chunks)
+    chunks.close()
+
+    assert first.startswith(f"# {temp_dir.name}\n")
+    assert capsys.readouterr().out == ""
+
+
+def test_iter_records_yields_metadata_and_content(sample_project_structure):
+    """Test per-file records."""
+    records = {record.entry.path: record for record in iter_records(str(sample_project_structure))}
+
+    assert records["src/main.py"].content == "print('Hello')"
+    assert records["src/main.py"].entry.language == "python"
+    assert len(records["README.md"].entry.sha256) == 64
+
+
+def test_export_to_text_and_binary_streams(sample_project_structure):
+    """Test writing Markdown and JSONL into file-like objects."""
+    text = io.StringIO()
+    binary = io.BytesIO()
+
+    summary = export_to(text, str(sample_project_structure))
+    export_to(binary, str(sample_project_structure))
+
+    assert summary.files_written == 4
+    assert binary.getvalue().decode('utf-8') == text.getvalue()
+
+    jsonl = io.BytesIO()
+    export_to(jsonl, str(sample_project_structure), output_format="jsonl")
+    paths = [json.loads(line)["path"] for line in jsonl.getvalue().decode('utf-8').splitlines()]
+    assert "src/main.py" in paths
+
+    with pytest.raises(ValueError):
+        export_to(io.BytesIO(), str(sample_project_structure), output_format="sqlite")